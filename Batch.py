@@ -0,0 +1,184 @@
+import os
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse, itertools, json, pickle, sys, time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pygame.math import Vector2 as vec2
+from Rigidbody import AABB
+from Collisions import Collisions
+from World import World
+import Scenes
+
+"""
+======================================================================================================
+SCENE FACTORIES
+======================================================================================================
+"""
+
+# Loads params["level"] and drops its usable objects like a player would, params can set:
+#   position     (x, y) of the drop, the middle of the playable zone if missing
+#   speed        downwards launch speed like level 2's speedObject, 200 px/s per unit
+#   mass         mass of the dropped objects
+#   restitution  restitution of the dropped objects
+def dropObjects(world: World, params: dict):
+    Scenes.loadLevel(world, params.get("level", 1), dropObjects=False)
+
+    x, y, width, height = world.playableZone
+    pos = vec2(params.get("position", (x + width / 2, y + height / 2)))
+    vel = vec2(0, 200 * params.get("speed", 0))
+
+    objects = list(world.usableObjects)
+    for body in (o.body for o in objects):
+        if "mass" in params: body.mass = params["mass"]
+        if "restitution" in params: body.restitution = params["restitution"]
+
+    # Every object goes above the previous one so they do not start overlapping
+    for k in range(len(objects)):
+        world.addUsableObjectAtPos(0, pos - vec2(0, 45 * k), vel)
+
+def levelCompleted(world: World) -> bool:
+    x, y, width, height = world.completionZone
+    zone = AABB(vec2(x, y), vec2(x + width, y + height))
+    return any(Collisions.intersectTwoAABBs(world.entityList[i].body.getAABB(), zone) for i in world.completionEntityIndexes)
+
+def parameterGrid(**axes) -> list[dict]:
+    names = list(axes)
+    return [dict(zip(names, values)) for values in itertools.product(*(axes[n] for n in names))]
+
+"""
+======================================================================================================
+BATCH RUNNER
+======================================================================================================
+"""
+
+class BatchRunner:
+    # sceneFactory(world, params) builds the scene of every simulation and measure(world, params), if given,
+    # returns a dict of extra results, both have to be module level functions to reach the worker processes
+    def __init__(self, sceneFactory=dropObjects, frames: int = 600, deltaTime: float = 1 / 60, subIterations: int = 4,
+                 workers: int = None, chunkSize: int = None, stopOnCompletion: bool = False, measure=None):
+        if not callable(sceneFactory): raise TypeError("sceneFactory argument must be callable")
+        if measure is not None and not callable(measure): raise TypeError("measure argument must be callable")
+        if int(frames) <= 0: raise ValueError("frames must be greater than zero")
+        if float(deltaTime) <= 0: raise ValueError("deltaTime must be greater than zero")
+        if int(subIterations) < 1 or int(subIterations) > 64: raise ValueError("subIterations must be between 1 and 64")
+        if workers is not None and int(workers) <= 0: raise ValueError("workers must be greater than zero")
+        if chunkSize is not None and int(chunkSize) <= 0: raise ValueError("chunkSize must be greater than zero")
+
+        self.sceneFactory = sceneFactory
+        self.measure = measure
+        self.frames = int(frames)
+        self.deltaTime = float(deltaTime)
+        self.subIterations = int(subIterations)
+        self.workers = (os.cpu_count() or 1) if workers is None else int(workers)
+        self.chunkSize = None if chunkSize is None else int(chunkSize)
+        self.stopOnCompletion = stopOnCompletion
+
+    def simulate(self, index: int, params: dict) -> dict:
+        world = World()
+        self.sceneFactory(world, params)
+
+        completedFrame = None
+        start = time.perf_counter()
+        for frame in range(self.frames):
+            world.update(self.deltaTime, self.subIterations)
+
+            if completedFrame is None and world.completionEntityIndexes and levelCompleted(world):
+                completedFrame = frame
+                if self.stopOnCompletion: break
+        seconds = time.perf_counter() - start
+
+        result = {
+            "index": index,
+            "params": params,
+            "completed": completedFrame is not None,
+            "completedFrame": completedFrame,
+            "frames": frame + 1,
+            "seconds": seconds,
+            "bodies": len(world.entityList),
+            "objects": [[world.entityList[i].body.position.x, world.entityList[i].body.position.y] for i in world.completionEntityIndexes],
+        }
+        if self.measure is not None: result.update(self.measure(world, params))
+        return result
+
+    def runChunk(self, chunk: list[tuple[int, dict]]) -> list[dict]:
+        return [self.simulate(index, params) for index, params in chunk]
+
+    # Yields the result of every parameter set as soon as its chunk finishes, "index" tells which one it was
+    def run(self, parameterSets: list[dict]):
+        jobs = list(enumerate(parameterSets))
+        if not jobs: return
+
+        if self.workers == 1:
+            for index, params in jobs: yield self.simulate(index, params)
+            return
+
+        try: pickle.dumps((self.sceneFactory, self.measure))
+        except Exception: raise TypeError("sceneFactory and measure must be module level functions to run in worker processes") from None
+
+        # A few chunks per worker keeps them all busy even when some simulations end early
+        chunkSize = self.chunkSize or max(1, len(jobs) // (self.workers * 4))
+        chunks = [jobs[i:i + chunkSize] for i in range(0, len(jobs), chunkSize)]
+
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(chunks))) as pool:
+            futures = [pool.submit(self.runChunk, chunk) for chunk in chunks]
+            for future in as_completed(futures):
+                yield from future.result()
+
+    def runAll(self, parameterSets: list[dict]) -> list[dict]:
+        return sorted(self.run(parameterSets), key=lambda r: r["index"])
+
+"""
+======================================================================================================
+COMMAND LINE
+======================================================================================================
+"""
+
+def parseArgs(argv: list[str]):
+    parser = argparse.ArgumentParser(description="Sweeps drop positions, speeds, masses and restitutions of a level across all cores")
+    parser.add_argument("--level", type=int, default=1)
+    parser.add_argument("--positions", type=int, default=5, help="drop positions spread along the playable zone")
+    parser.add_argument("--speeds", nargs="*", type=float, default=[0])
+    parser.add_argument("--masses", nargs="*", type=float)
+    parser.add_argument("--restitutions", nargs="*", type=float)
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--dt", type=float, default=1 / 60)
+    parser.add_argument("--substeps", type=int, default=4)
+    parser.add_argument("--workers", type=int, help="worker processes, one per core by default")
+    parser.add_argument("--chunk", type=int, help="simulations sent to a worker at once")
+    parser.add_argument("--stop", action="store_true", help="stop a simulation as soon as the level is completed")
+    parser.add_argument("--out", metavar="FILE", help="write one JSON line per simulation to FILE instead of stdout")
+    return parser.parse_args(argv)
+
+def main(argv: list[str] = None):
+    args = parseArgs(sys.argv[1:] if argv is None else argv)
+    if args.positions <= 0: raise ValueError("positions must be greater than zero")
+
+    world = World()
+    Scenes.loadLevel(world, args.level, dropObjects=False)
+    x, y, width, height = world.playableZone
+    positions = [(x + width * (k + 0.5) / args.positions, y + height / 2) for k in range(args.positions)]
+
+    axes = {"level": [args.level], "position": positions, "speed": args.speeds}
+    if args.masses: axes["mass"] = args.masses
+    if args.restitutions: axes["restitution"] = args.restitutions
+    parameterSets = parameterGrid(**axes)
+
+    runner = BatchRunner(dropObjects, args.frames, args.dt, args.substeps, args.workers, args.chunk, args.stop)
+
+    out = open(args.out, "w") if args.out else sys.stdout
+    start = time.perf_counter()
+    completed = 0
+    try:
+        for result in runner.run(parameterSets):
+            completed += result["completed"]
+            out.write(json.dumps(result) + "\n")
+            out.flush()
+    finally:
+        if args.out: out.close()
+
+    seconds = time.perf_counter() - start
+    print(str(len(parameterSets)) + " simulations in " + format(seconds, ".2f") + " s, " + str(completed) + " completed, "
+          + str(runner.workers) + " workers", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
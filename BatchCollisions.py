@@ -0,0 +1,91 @@
+import numpy as np
+from Profiler import EngineCounters
+
+"""
+======================================================================================================
+BATCHED COLLISION KERNELS
+======================================================================================================
+"""
+
+class BatchCollisions:
+    # Shape pair buckets, CIRCLE_POLYGON means bodyA is the circle
+    POLYGON_POLYGON = 0
+    POLYGON_CIRCLE = 1
+    CIRCLE_POLYGON = 2
+    CIRCLE_CIRCLE = 3
+
+    @staticmethod
+    def shapePairBuckets(circleA: np.ndarray, circleB: np.ndarray) -> np.ndarray:
+        return circleA.astype(np.int8) * 2 + circleB.astype(np.int8)
+
+    @staticmethod
+    def collideCircles(centersA: np.ndarray, radiiA: np.ndarray, centersB: np.ndarray, radiiB: np.ndarray):
+        AToB = centersB - centersA
+        dist = np.hypot(AToB[:, 0], AToB[:, 1])
+        depths = radiiA + radiiB - dist # How much are colliding, negative = not colliding
+
+        # Two circles at the same center get an arbitrary normal instead of a division by zero
+        normals = np.zeros_like(AToB)
+        normals[:, 0] = 1
+        np.divide(AToB, dist[:, None], out=normals, where=dist[:, None] > 0)
+
+        contacts = centersA + normals * radiiA[:, None]
+
+        return depths > 0, normals, depths, contacts
+
+    @staticmethod
+    def edgeAxes(vertices: np.ndarray, counts: np.ndarray):
+        # Unit normals of every edge, axes past the vertex count of a polygon are flagged as not valid
+        n, maxVerts = vertices.shape[0], vertices.shape[1]
+        index = np.arange(maxVerts)
+        nextIndex = (index[None, :] + 1) % counts[:, None]
+
+        edges = vertices[np.arange(n)[:, None], nextIndex] - vertices
+        axes = np.stack((-edges[:, :, 1], edges[:, :, 0]), axis=2)
+        length = np.hypot(axes[:, :, 0], axes[:, :, 1])
+        valid = (index[None, :] < counts[:, None]) & (length > 0)
+
+        np.divide(axes, length[:, :, None], out=axes, where=valid[:, :, None])
+        return axes, valid
+
+    @staticmethod
+    def intersectPolygons(centersA: np.ndarray, verticesA: np.ndarray, countsA: np.ndarray,
+                          centersB: np.ndarray, verticesB: np.ndarray, countsB: np.ndarray,
+                          axesA: tuple[np.ndarray, np.ndarray] = None, axesB: tuple[np.ndarray, np.ndarray] = None,
+                          counters: EngineCounters = None):
+        # SEPARATING AXIS THEOREM (SAT) for N pairs at once, vertices padded with copies of a real vertex
+        # axesA and axesB are (axes, valid) like BodyStore.worldAxes gives, without them they come from the edges
+        axesA, validA = BatchCollisions.edgeAxes(verticesA, countsA) if axesA is None else axesA
+        axesB, validB = BatchCollisions.edgeAxes(verticesB, countsB) if axesB is None else axesB
+        axes = np.concatenate((axesA, axesB), axis=1)
+        valid = np.concatenate((validA, validB), axis=1)
+
+        projA = np.matmul(verticesA, axes.transpose(0, 2, 1)) # [pair, vertex, axis]
+        projB = np.matmul(verticesB, axes.transpose(0, 2, 1))
+        minA, maxA = projA.min(axis=1), projA.max(axis=1)
+        minB, maxB = projB.min(axis=1), projB.max(axis=1)
+
+        separated = ((minA >= maxB) | (minB >= maxA)) & valid
+        coll = ~separated.any(axis=1)
+
+        # First separating axis of every rejected pair, numbered like the loop version with the padding left out
+        if counters is not None and not coll.all():
+            rejected = ~coll
+            first = separated[rejected].argmax(axis=1)
+            widthA = validA.shape[1]
+            first = np.where(first >= widthA, first - widthA + validA[rejected].sum(axis=1), first)
+            for index, count in zip(*np.unique(first, return_counts=True)): counters.rejectedOnAxis(int(index), int(count))
+
+        axisDepths = np.minimum(maxB - minA, maxA - minB)
+        axisDepths[~valid] = np.inf
+        best = axisDepths.argmin(axis=1) # First minimum, same axis order as the loop version
+
+        pairIndex = np.arange(len(best))
+        depths = axisDepths[pairIndex, best]
+        normals = axes[pairIndex, best]
+
+        # Normal must points out of the polygon center
+        flip = np.einsum("nk,nk->n", centersB - centersA, normals) < 0
+        normals[flip] *= -1
+
+        return coll, normals, depths
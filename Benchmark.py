@@ -0,0 +1,131 @@
+import os
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse, json, platform, sys, time, tracemalloc
+import numpy as np
+from World import World
+from Headless import HeadlessRunner
+import Scenes
+
+"""
+======================================================================================================
+BENCHMARK SUITE
+======================================================================================================
+"""
+
+class BenchmarkCase:
+    # level is a shipped level (1-7), otherwise scene is one of Scenes.generators built with count bodies
+    def __init__(self, scene: str = None, count: int = None, level: int = None, seed: int = 0):
+        if (scene is None) == (level is None): raise ValueError("a BenchmarkCase needs either a scene or a level")
+        if scene is not None and scene not in Scenes.generators: raise ValueError("unknown scene " + str(scene))
+        if scene is not None and (count is None or int(count) <= 0): raise ValueError("count must be greater than zero")
+        if level is not None and (int(level) < 1 or int(level) > 7): raise ValueError("level must be between 1 and 7")
+
+        self.scene = scene
+        self.count = None if count is None else int(count)
+        self.level = None if level is None else int(level)
+        self.seed = int(seed)
+
+    @property
+    def name(self):
+        if self.level is not None: return "level" + str(self.level)
+        return self.scene + "-" + str(self.count)
+
+    def build(self) -> World:
+        world = World()
+        if self.level is not None: Scenes.loadLevel(world, self.level)
+        else: Scenes.buildScene(world, self.scene, self.count, self.seed)
+        return world
+
+class BenchmarkSuite:
+    def __init__(self, cases: list[BenchmarkCase], frames: int = 120, deltaTime: float = 1 / 60,
+                 subIterations: int = 4, measureMemory: bool = True):
+        if int(frames) <= 0: raise ValueError("frames must be greater than zero")
+
+        self.cases = list(cases)
+        self.frames = int(frames)
+        self.deltaTime = float(deltaTime)
+        self.subIterations = int(subIterations)
+        self.measureMemory = measureMemory
+
+    def runCase(self, case: BenchmarkCase) -> dict:
+        world = case.build()
+        world.phaseTimes = {}
+        world.enableCounters()
+        report = HeadlessRunner(world, self.deltaTime, self.subIterations).run(self.frames)
+
+        steps = report["substeps"]
+        phases = {phase: seconds / steps for phase, seconds in report.pop("phaseSeconds").items()}
+
+        result = {"case": case.name, "scene": case.scene if case.level is None else "level",
+                  "count": case.count, "level": case.level, "seed": case.seed}
+        result.update(report)
+        result["secondsPerStep"] = {phase: phases[phase] for phase in sorted(phases, key=phases.get, reverse=True)}
+        result["counters"] = report.pop("counters")
+
+        # tracemalloc slows the engine down a lot, so the memory is taken from a second run of its own
+        if self.measureMemory:
+            tracemalloc.start()
+            try:
+                world = case.build()
+                HeadlessRunner(world, self.deltaTime, self.subIterations).run(self.frames)
+                result["peakMemory"] = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+        return result
+
+    def run(self, log=None) -> dict:
+        results = []
+        for case in self.cases:
+            result = self.runCase(case)
+            results.append(result)
+            if log is not None: log(case.name + ": " + format(result["stepsPerSecond"], ".1f") + " steps/s")
+
+        return {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "frames": self.frames,
+            "deltaTime": self.deltaTime,
+            "subIterations": self.subIterations,
+            "results": results,
+        }
+
+"""
+======================================================================================================
+COMMAND LINE
+======================================================================================================
+"""
+
+def parseArgs(argv: list[str]):
+    parser = argparse.ArgumentParser(description="Runs the procedural scenes and the shipped levels and reports their throughput as JSON")
+    parser.add_argument("--scenes", nargs="*", choices=sorted(Scenes.generators), default=sorted(Scenes.generators),
+                        help="procedural scenes to run")
+    parser.add_argument("--counts", nargs="*", type=int, default=[50, 100, 200], help="bodies of every procedural scene")
+    parser.add_argument("--levels", nargs="*", type=int, default=list(range(1, 8)), help="shipped levels to run")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--frames", type=int, default=120)
+    parser.add_argument("--dt", type=float, default=1 / 60)
+    parser.add_argument("--substeps", type=int, default=4)
+    parser.add_argument("--no-memory", action="store_true", help="skip the traced run that measures peak memory")
+    parser.add_argument("--out", metavar="FILE", help="write the report to FILE instead of stdout")
+    return parser.parse_args(argv)
+
+def main(argv: list[str] = None):
+    args = parseArgs(sys.argv[1:] if argv is None else argv)
+
+    cases = [BenchmarkCase(scene, count, seed=args.seed) for scene in args.scenes for count in args.counts]
+    cases += [BenchmarkCase(level=level) for level in args.levels]
+
+    suite = BenchmarkSuite(cases, args.frames, args.dt, args.substeps, not args.no_memory)
+    report = suite.run(lambda line: print(line, file=sys.stderr))
+
+    if args.out:
+        with open(args.out, "w") as f: json.dump(report, f, indent=1)
+    else:
+        print(json.dumps(report, indent=1))
+
+if __name__ == "__main__":
+    main()
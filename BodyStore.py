@@ -0,0 +1,186 @@
+from __future__ import annotations
+import math
+import numpy as np
+
+"""
+======================================================================================================
+BODY STORE CLASS
+======================================================================================================
+"""
+
+class BodyStore:
+    initialCapacity = 64
+    maxVertices = 5 # Pentagons
+
+    def __init__(self, capacity: int = initialCapacity):
+        if int(capacity) <= 0: raise ValueError("capacity must be greater than zero")
+
+        self.count = 0
+        self.bodies: list = [] # row -> Rigidbody
+        self.__allocate(int(capacity))
+
+    def __allocate(self, capacity: int):
+        # Every state variable is one contiguous array, row i belongs to self.bodies[i]
+        self.position = np.zeros((capacity, 2))
+        self.velocity = np.zeros((capacity, 2))
+        self.rotation = np.zeros(capacity)
+        self.angularVelocity = np.zeros(capacity)
+        self.force = np.zeros((capacity, 2))
+        self.mass = np.zeros(capacity)
+        self.invMass = np.zeros(capacity)
+        self.invInertia = np.zeros(capacity)
+        self.shapeType = np.zeros(capacity, dtype=np.int8)
+        self.radius = np.zeros(capacity) # Zero for polygons
+        self.localVertices = np.zeros((capacity, BodyStore.maxVertices, 2))
+        self.vertexCount = np.zeros(capacity, dtype=np.int8)
+        self.localAxes = np.zeros((capacity, BodyStore.maxVertices, 2)) # Unit edge normals, parallel edges only once
+        self.axisCount = np.zeros(capacity, dtype=np.int8)
+        self.transformVersion = np.zeros(capacity, dtype=np.int64)
+        self.awake = np.ones(capacity, dtype=bool)
+        self.sleepTime = np.zeros(capacity)
+        self.islandId = np.full(capacity, -1, dtype=np.int64) # Island a sleeping body went to sleep with
+        self.previousPosition = np.zeros((capacity, 2)) # Pose before the last fixed step, for drawing in between
+        self.previousRotation = np.zeros(capacity)
+
+    @property
+    def capacity(self): return len(self.rotation)
+
+    def arrays(self) -> dict[str, np.ndarray]:
+        return {"position": self.position, "velocity": self.velocity, "rotation": self.rotation,
+                "angularVelocity": self.angularVelocity, "force": self.force, "mass": self.mass, "invMass": self.invMass,
+                "invInertia": self.invInertia, "shapeType": self.shapeType, "radius": self.radius,
+                "localVertices": self.localVertices, "vertexCount": self.vertexCount, "localAxes": self.localAxes,
+                "axisCount": self.axisCount, "transformVersion": self.transformVersion,
+                "awake": self.awake, "sleepTime": self.sleepTime, "islandId": self.islandId,
+                "previousPosition": self.previousPosition, "previousRotation": self.previousRotation}
+
+    def __grow(self):
+        old = self.arrays()
+        self.__allocate(self.capacity * 2)
+
+        for name, array in self.arrays().items():
+            array[:self.count] = old[name][:self.count]
+
+    # BODIES ===========================================================================
+
+    def add(self, body) -> int:
+        if body.store is self: return body.row
+        if body.store is not None: raise ValueError("body already belongs to another BodyStore")
+
+        if self.count == self.capacity: self.__grow()
+
+        row = self.count
+        self.count += 1
+        self.bodies.append(body)
+        body.bindStore(self, row)
+        self.previousPosition[row] = self.position[row]
+        self.previousRotation[row] = self.rotation[row]
+        return row
+
+    def remove(self, body):
+        if body.store is not self: return
+
+        row = body.row
+        last = self.count - 1
+        body.unbindStore()
+
+        # The last row fills the hole so the arrays stay contiguous
+        if row != last:
+            for array in self.arrays().values(): array[row] = array[last]
+
+            moved = self.bodies[last]
+            self.bodies[row] = moved
+            moved.moveRow(row)
+
+        self.bodies.pop()
+        self.count -= 1
+
+    def clear(self):
+        for body in self.bodies: body.unbindStore()
+
+        self.bodies.clear()
+        self.count = 0
+
+    # Makes the store hold exactly the given bodies
+    def sync(self, bodies: list):
+        bound = 0
+        for body in bodies:
+            if body.store is self: bound += 1
+
+        if bound < self.count:
+            current = set(bodies)
+            for body in [b for b in self.bodies if b not in current]: self.remove(body)
+
+        if bound < len(bodies):
+            for body in bodies:
+                if body.store is not self: self.add(body)
+
+    # METHODS ===========================================================================
+
+    def rowsOf(self, bodies: list) -> np.ndarray:
+        return np.fromiter((b.row for b in bodies), dtype=np.intp, count=len(bodies))
+
+    def dynamicRows(self) -> np.ndarray:
+        return np.flatnonzero(self.invMass[:self.count] > 0)
+
+    # Dynamic bodies that are awake, the only ones that get forces and integration
+    def activeRows(self) -> np.ndarray:
+        n = self.count
+        return np.flatnonzero((self.invMass[:n] > 0) & self.awake[:n])
+
+    # World space vertices of the given rows, padded to maxVertices like localVertices
+    def worldVertices(self, rows: np.ndarray) -> np.ndarray:
+        angle = np.radians(self.rotation[rows])
+        cos, sin = np.cos(angle)[:, None], np.sin(angle)[:, None]
+        local = self.localVertices[rows]
+        pos = self.position[rows]
+
+        verts = np.empty_like(local)
+        verts[:, :, 0] = local[:, :, 0] * cos - local[:, :, 1] * sin + pos[:, None, 0]
+        verts[:, :, 1] = local[:, :, 0] * sin + local[:, :, 1] * cos + pos[:, None, 1]
+        return verts
+
+    # World space SAT axes of the given rows and which of them are real, padded like localAxes
+    def worldAxes(self, rows: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        angle = np.radians(self.rotation[rows])
+        cos, sin = np.cos(angle)[:, None], np.sin(angle)[:, None]
+        local = self.localAxes[rows]
+
+        axes = np.empty_like(local)
+        axes[:, :, 0] = local[:, :, 0] * cos - local[:, :, 1] * sin
+        axes[:, :, 1] = local[:, :, 0] * sin + local[:, :, 1] * cos
+        valid = np.arange(BodyStore.maxVertices)[None, :] < self.axisCount[rows, None]
+        return axes, valid
+
+    def savePose(self):
+        n = self.count
+        self.previousPosition[:n] = self.position[:n]
+        self.previousRotation[:n] = self.rotation[:n]
+
+    # Pose between the saved one (alpha 0) and the current one (alpha 1)
+    def interpolatedPose(self, alpha: float) -> tuple[np.ndarray, np.ndarray]:
+        n = self.count
+        alpha = min(max(float(alpha), 0.0), 1.0)
+        position = self.previousPosition[:n] + (self.position[:n] - self.previousPosition[:n]) * alpha
+        rotation = self.previousRotation[:n] + (self.rotation[:n] - self.previousRotation[:n]) * alpha
+        return position, rotation
+
+    def integrate(self, deltaTime: float, rows: np.ndarray = None):
+        if rows is None: rows = np.arange(self.count)
+        if len(rows) == 0: return
+
+        dt = float(deltaTime)
+        radianToDegree = 180 / math.pi
+
+        velocity = self.velocity[rows]
+        angularVelocity = self.angularVelocity[rows]
+
+        # Static bodies have zero inverse mass, so forces never move them
+        velocity += self.force[rows] * (self.invMass[rows, None] * dt)
+        self.velocity[rows] = velocity
+        self.position[rows] += velocity * dt
+        self.rotation[rows] += angularVelocity * (radianToDegree * dt)
+        self.force[rows] = 0
+
+        # Only bodies that actually moved need their vertices and AABB recomputed
+        self.transformVersion[rows] += (velocity != 0).any(axis=1) | (angularVelocity != 0)
@@ -0,0 +1,622 @@
+from __future__ import annotations
+import math
+from abc import ABC, abstractmethod
+from Rigidbody import Rigidbody, AABB
+from Collisions import Collisions
+
+"""
+======================================================================================================
+BROADPHASE BASE CLASS
+======================================================================================================
+"""
+
+class Broadphase(ABC):
+    aabbTests = 0 # Box overlap tests made by the last findPairs
+
+    # Every broadphase returns the (i, j) index pairs, i < j, of the bodies whose AABBs overlap
+    # and that are not both static or sleeping, sorted like the old all-pairs loop so the narrow phase stays the same
+    @abstractmethod
+    def findPairs(self, bodies: list[Rigidbody]) -> list[tuple[int, int]]:
+        pass
+
+    def clear(self):
+        pass
+
+class BruteForce(Broadphase):
+    def findPairs(self, bodies: list[Rigidbody]) -> list[tuple[int, int]]:
+        pairs = []
+        aabbs = [b.getAABB() for b in bodies]
+        tests = 0
+
+        for i in range(len(bodies)):
+            for j in range(i + 1, len(bodies)):
+                if bodies[i].isInert and bodies[j].isInert: continue
+                tests += 1
+                if not Collisions.intersectTwoAABBs(aabbs[i], aabbs[j]): continue
+
+                pairs.append((i, j))
+
+        self.aabbTests = tests
+        return pairs
+
+"""
+======================================================================================================
+SPATIAL HASH GRID
+======================================================================================================
+"""
+
+class SpatialHashGrid(Broadphase):
+    minCellSize = 4
+
+    def __init__(self, cellSize: float = None):
+        if cellSize is not None and float(cellSize) <= 0: raise ValueError("cellSize must be greater than zero")
+
+        self.__cellSize = None if cellSize is None else float(cellSize)
+        self.__autoCellSize = None
+        self.__autoBodyCount = -1
+
+    # GETTERS ===========================================================================
+
+    @property
+    def cellSize(self): return self.__cellSize
+
+    # SETTERS ===========================================================================
+
+    @cellSize.setter
+    def cellSize(self, newVal):
+        if newVal is not None and float(newVal) <= 0: raise ValueError("cellSize must be greater than zero")
+        self.__cellSize = None if newVal is None else float(newVal)
+
+    # METHODS ===========================================================================
+
+    def clear(self):
+        self.__autoCellSize = None
+        self.__autoBodyCount = -1
+
+    @staticmethod
+    def medianBodySize(aabbs: list[AABB]) -> float:
+        if not aabbs: return SpatialHashGrid.minCellSize
+
+        sizes = sorted(max(a.maxX - a.minX, a.maxY - a.minY) for a in aabbs)
+        mid = len(sizes) // 2
+        median = sizes[mid] if len(sizes) % 2 else (sizes[mid - 1] + sizes[mid]) / 2
+
+        return max(median, SpatialHashGrid.minCellSize)
+
+    def currentCellSize(self, aabbs: list[AABB]) -> float:
+        if self.__cellSize is not None: return self.__cellSize
+
+        # Only pick the size again when bodies are added or removed, sorting every substep is not worth it
+        if self.__autoBodyCount != len(aabbs):
+            self.__autoCellSize = SpatialHashGrid.medianBodySize(aabbs)
+            self.__autoBodyCount = len(aabbs)
+
+        return self.__autoCellSize
+
+    def findPairs(self, bodies: list[Rigidbody]) -> list[tuple[int, int]]:
+        aabbs = [b.getAABB() for b in bodies]
+        invCell = 1 / self.currentCellSize(aabbs)
+
+        # Every cell keeps its moving and resting (static or sleeping) bodies apart so resting pairs are never visited
+        dynamicCells: dict[tuple[int, int], list[int]] = {}
+        staticCells: dict[tuple[int, int], list[int]] = {}
+
+        for i in range(len(bodies)):
+            box = aabbs[i]
+            cells = staticCells if bodies[i].isInert else dynamicCells
+
+            minX, maxX = math.floor(box.minX * invCell), math.floor(box.maxX * invCell)
+            minY, maxY = math.floor(box.minY * invCell), math.floor(box.maxY * invCell)
+
+            for cx in range(minX, maxX + 1):
+                for cy in range(minY, maxY + 1):
+                    cell = cells.get((cx, cy))
+                    if cell is None: cells[(cx, cy)] = [i]
+                    else: cell.append(i)
+
+        tested = set()
+        pairs = []
+
+        for key, dynamics in dynamicCells.items():
+            statics = staticCells.get(key, ())
+
+            for a in range(len(dynamics)):
+                i = dynamics[a]
+
+                for b in range(a + 1, len(dynamics)):
+                    pair = (i, dynamics[b]) # Indexes are appended in order, so i < j already
+                    if pair in tested: continue
+                    tested.add(pair)
+
+                    if Collisions.intersectTwoAABBs(aabbs[i], aabbs[pair[1]]): pairs.append(pair)
+
+                for j in statics:
+                    pair = (i, j) if i < j else (j, i)
+                    if pair in tested: continue
+                    tested.add(pair)
+
+                    if Collisions.intersectTwoAABBs(aabbs[i], aabbs[j]): pairs.append(pair)
+
+        self.aabbTests = len(tested) # Every pair is tested once
+        pairs.sort()
+        return pairs
+
+"""
+======================================================================================================
+SWEEP AND PRUNE
+======================================================================================================
+"""
+
+class SweepAndPrune(Broadphase):
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.__proxies: dict[Rigidbody, int] = {} # body -> proxy id
+        self.__bodies: list[Rigidbody] = []       # proxy id -> body
+        self.__aabbs: list[AABB] = []             # proxy id -> AABB of this step
+        self.__freeIds: list[int] = []
+
+        # Endpoints on the x axis, kept sorted between steps. Tag = proxyId * 2 + isMax
+        self.__values: list[float] = []
+        self.__tags: list[int] = []
+
+        # Proxy pairs (a < b) whose x intervals overlap
+        self.__overlaps: set[tuple[int, int]] = set()
+
+    # METHODS ===========================================================================
+
+    def findPairs(self, bodies: list[Rigidbody]) -> list[tuple[int, int]]:
+        self.__syncBodies(bodies)
+
+        aabbs = self.__aabbs
+        indexOf = [-1] * len(self.__bodies)
+
+        for i in range(len(bodies)):
+            pid = self.__proxies[bodies[i]]
+            indexOf[pid] = i
+            aabbs[pid] = bodies[i].getAABB()
+
+        values, tags = self.__values, self.__tags
+        for k in range(len(tags)):
+            box = aabbs[tags[k] >> 1]
+            values[k] = box.maxX if tags[k] & 1 else box.minX
+
+        self.__insertionSort(1)
+
+        pairs = []
+        tests = 0
+        for a, b in self.__overlaps:
+            bodyA, bodyB = self.__bodies[a], self.__bodies[b]
+            if bodyA.isInert and bodyB.isInert: continue
+
+            tests += 1
+            boxA, boxB = aabbs[a], aabbs[b]
+            if boxA.maxY < boxB.minY or boxB.maxY < boxA.minY: continue
+
+            i, j = indexOf[a], indexOf[b]
+            pairs.append((i, j) if i < j else (j, i))
+
+        self.aabbTests = tests
+        pairs.sort()
+        return pairs
+
+    def __syncBodies(self, bodies: list[Rigidbody]):
+        proxies = self.__proxies
+        known = 0
+
+        for body in bodies:
+            if body in proxies: known += 1
+
+        if known < len(proxies):
+            current = set(bodies)
+            self.__removeProxies([pid for body, pid in proxies.items() if body not in current])
+
+        if known < len(bodies):
+            for body in bodies:
+                if body not in proxies: self.__addProxy(body)
+
+    def __addProxy(self, body: Rigidbody):
+        if self.__freeIds: 
+            pid = self.__freeIds.pop()
+        else:
+            pid = len(self.__bodies)
+            self.__bodies.append(None)
+            self.__aabbs.append(None)
+
+        box = body.getAABB()
+        self.__proxies[body] = pid
+        self.__bodies[pid] = body
+        self.__aabbs[pid] = box
+
+        # Both endpoints start at the end of the list and are sorted into place, the swaps
+        # made on the way in create the overlaps with the bodies already in the list
+        self.__values.append(box.minX)
+        self.__tags.append(pid * 2)
+        self.__insertionSort(len(self.__tags) - 1)
+
+        self.__values.append(box.maxX)
+        self.__tags.append(pid * 2 + 1)
+        self.__insertionSort(len(self.__tags) - 1)
+
+    def __removeProxies(self, pids: list[int]):
+        removed = set(pids)
+
+        keep = [k for k in range(len(self.__tags)) if (self.__tags[k] >> 1) not in removed]
+        self.__values = [self.__values[k] for k in keep]
+        self.__tags = [self.__tags[k] for k in keep]
+        self.__overlaps = {p for p in self.__overlaps if p[0] not in removed and p[1] not in removed}
+
+        for pid in pids:
+            del self.__proxies[self.__bodies[pid]]
+            self.__bodies[pid] = None
+            self.__aabbs[pid] = None
+            self.__freeIds.append(pid)
+
+    def __insertionSort(self, start: int):
+        values, tags, overlaps = self.__values, self.__tags, self.__overlaps
+
+        for k in range(start, len(tags)):
+            value, tag = values[k], tags[k]
+            isMax = tag & 1
+            j = k - 1
+
+            # On equal values a min goes before a max so touching AABBs count as overlapping
+            while j >= 0 and (values[j] > value or (values[j] == value and not isMax and tags[j] & 1)):
+                other = tags[j]
+
+                if (other ^ tag) & 1 and (other >> 1) != (tag >> 1):
+                    a, b = tag >> 1, other >> 1
+                    pair = (a, b) if a < b else (b, a)
+
+                    # A min passing a max to the left means the intervals start overlapping,
+                    # a max passing a min to the left means they stop
+                    if isMax: overlaps.discard(pair)
+                    else: overlaps.add(pair)
+
+                values[j + 1], tags[j + 1] = values[j], other
+                j -= 1
+
+            values[j + 1], tags[j + 1] = value, tag
+
+"""
+======================================================================================================
+DYNAMIC AABB TREE (BVH)
+======================================================================================================
+"""
+
+class TreeNode:
+    def __init__(self):
+        self.minX, self.minY, self.maxX, self.maxY = 0.0, 0.0, 0.0, 0.0
+        self.parent: TreeNode = None
+        self.left: TreeNode = None
+        self.right: TreeNode = None
+        self.height = 0
+
+        # Only used by leaves
+        self.body: Rigidbody = None
+        self.tree: AABBTree = None
+        self.index = -1
+        self.version = -1 # transformVersion of the body when the leaf box was fitted
+        self.candidates: set[TreeNode] = set()
+
+    def isLeaf(self): return self.left is None
+
+    def setUnion(self, a: TreeNode, b: TreeNode):
+        self.minX, self.minY = min(a.minX, b.minX), min(a.minY, b.minY)
+        self.maxX, self.maxY = max(a.maxX, b.maxX), max(a.maxY, b.maxY)
+
+class AABBTree:
+    def __init__(self, margin: float = 0):
+        if float(margin) < 0: raise ValueError("margin must be greater or equal than zero")
+
+        self.margin = float(margin)
+        self.root: TreeNode = None
+
+    def clear(self):
+        self.root = None
+
+    def insert(self, body: Rigidbody) -> TreeNode:
+        leaf = TreeNode()
+        leaf.body = body
+        leaf.tree = self
+        self.__fatten(leaf, body.getAABB())
+        self.__insertLeaf(leaf)
+        return leaf
+
+    def remove(self, leaf: TreeNode):
+        self.__removeLeaf(leaf)
+
+    # Returns True if the leaf had to be reinserted because the body left its fat AABB
+    def move(self, leaf: TreeNode, box: AABB) -> bool:
+        if leaf.minX <= box.minX and leaf.minY <= box.minY and box.maxX <= leaf.maxX and box.maxY <= leaf.maxY: 
+            return False
+
+        self.reinsert(leaf, box)
+        return True
+
+    def reinsert(self, leaf: TreeNode, box: AABB):
+        self.__removeLeaf(leaf)
+        self.__fatten(leaf, box)
+        self.__insertLeaf(leaf)
+
+    # Collects the leaves overlapping the box of the given node (usually a leaf of this or another tree),
+    # returns how many nodes were tested
+    def query(self, box: TreeNode, result: list[TreeNode]) -> int:
+        if self.root is None: return 0
+
+        minX, minY, maxX, maxY = box.minX, box.minY, box.maxX, box.maxY
+        stack = [self.root]
+        tests = 0
+
+        while stack:
+            node = stack.pop()
+            tests += 1
+            if node.maxX < minX or maxX < node.minX or node.maxY < minY or maxY < node.minY: continue
+
+            if node.left is None: result.append(node)
+            else:
+                stack.append(node.left)
+                stack.append(node.right)
+
+        return tests
+
+    def __fatten(self, leaf: TreeNode, box: AABB):
+        m = self.margin
+        leaf.version = leaf.body.transformVersion
+        leaf.minX, leaf.minY = box.minX - m, box.minY - m
+        leaf.maxX, leaf.maxY = box.maxX + m, box.maxY + m
+
+    @staticmethod
+    def perimeter(minX: float, minY: float, maxX: float, maxY: float) -> float:
+        return 2 * ((maxX - minX) + (maxY - minY))
+
+    def __insertLeaf(self, leaf: TreeNode):
+        if self.root is None:
+            self.root = leaf
+            leaf.parent = None
+            return
+
+        # Descend choosing the child whose enlarged perimeter costs the least (surface area heuristic)
+        node = self.root
+        while not node.isLeaf():
+            area = AABBTree.perimeter(node.minX, node.minY, node.maxX, node.maxY)
+            combined = AABBTree.perimeter(min(node.minX, leaf.minX), min(node.minY, leaf.minY), 
+                                          max(node.maxX, leaf.maxX), max(node.maxY, leaf.maxY))
+
+            cost = 2 * combined
+            inheritance = 2 * (combined - area)
+
+            costs = []
+            for child in (node.left, node.right):
+                enlarged = AABBTree.perimeter(min(child.minX, leaf.minX), min(child.minY, leaf.minY), 
+                                              max(child.maxX, leaf.maxX), max(child.maxY, leaf.maxY))
+                if child.isLeaf(): costs.append(enlarged + inheritance)
+                else: costs.append(enlarged - AABBTree.perimeter(child.minX, child.minY, child.maxX, child.maxY) + inheritance)
+
+            if cost < costs[0] and cost < costs[1]: break
+
+            node = node.left if costs[0] < costs[1] else node.right
+
+        sibling = node
+        oldParent = sibling.parent
+
+        newParent = TreeNode()
+        newParent.parent = oldParent
+        newParent.setUnion(leaf, sibling)
+        newParent.height = sibling.height + 1
+        newParent.left, newParent.right = sibling, leaf
+        sibling.parent = newParent
+        leaf.parent = newParent
+
+        if oldParent is None: self.root = newParent
+        elif oldParent.left is sibling: oldParent.left = newParent
+        else: oldParent.right = newParent
+
+        self.__refit(leaf.parent)
+
+    def __removeLeaf(self, leaf: TreeNode):
+        if leaf is self.root:
+            self.root = None
+            return
+
+        parent = leaf.parent
+        grandParent = parent.parent
+        sibling = parent.right if parent.left is leaf else parent.left
+
+        if grandParent is None:
+            self.root = sibling
+            sibling.parent = None
+        else:
+            if grandParent.left is parent: grandParent.left = sibling
+            else: grandParent.right = sibling
+            sibling.parent = grandParent
+
+            self.__refit(grandParent)
+
+        leaf.parent = None
+
+    def __refit(self, node: TreeNode):
+        while node is not None:
+            node = self.__balance(node)
+
+            node.height = 1 + max(node.left.height, node.right.height)
+            node.setUnion(node.left, node.right)
+
+            node = node.parent
+
+    def __replaceChild(self, oldChild: TreeNode, newChild: TreeNode):
+        parent = newChild.parent
+        if parent is None: self.root = newChild
+        elif parent.left is oldChild: parent.left = newChild
+        else: parent.right = newChild
+
+    # Rotates the taller grandchild up when the subtree at a is unbalanced, returns the new subtree root
+    def __balance(self, a: TreeNode) -> TreeNode:
+        if a.isLeaf() or a.height < 2: return a
+
+        b, c = a.left, a.right
+        balance = c.height - b.height
+
+        if balance > 1:
+            f, g = c.left, c.right
+
+            c.left = a
+            c.parent = a.parent
+            a.parent = c
+            self.__replaceChild(a, c)
+
+            if f.height > g.height:
+                c.right, a.right = f, g
+                g.parent = a
+                a.setUnion(b, g)
+                c.setUnion(a, f)
+                a.height = 1 + max(b.height, g.height)
+                c.height = 1 + max(a.height, f.height)
+            else:
+                c.right, a.right = g, f
+                f.parent = a
+                a.setUnion(b, f)
+                c.setUnion(a, g)
+                a.height = 1 + max(b.height, f.height)
+                c.height = 1 + max(a.height, g.height)
+
+            return c
+
+        if balance < -1:
+            d, e = b.left, b.right
+
+            b.left = a
+            b.parent = a.parent
+            a.parent = b
+            self.__replaceChild(a, b)
+
+            if d.height > e.height:
+                b.right, a.left = d, e
+                e.parent = a
+                a.setUnion(c, e)
+                b.setUnion(a, d)
+                a.height = 1 + max(c.height, e.height)
+                b.height = 1 + max(a.height, d.height)
+            else:
+                b.right, a.left = e, d
+                d.parent = a
+                a.setUnion(c, d)
+                b.setUnion(a, e)
+                a.height = 1 + max(c.height, d.height)
+                b.height = 1 + max(a.height, e.height)
+
+            return b
+
+        return a
+
+class DynamicAABBTree(Broadphase):
+    defaultMargin = 4 # pixels
+
+    def __init__(self, margin: float = defaultMargin):
+        # Moving bodies are stored with fattened AABBs so small motions do not touch the tree,
+        # static bodies go in their own tight tree that is only filled once per scene
+        self.dynamicTree = AABBTree(margin)
+        self.staticTree = AABBTree(0)
+        self.__leaves: dict[Rigidbody, TreeNode] = {}
+
+    def clear(self):
+        self.dynamicTree.clear()
+        self.staticTree.clear()
+        self.__leaves.clear()
+
+    def findPairs(self, bodies: list[Rigidbody]) -> list[tuple[int, int]]:
+        moved = self.__syncBodies(bodies)
+
+        leaves = self.__leaves
+        dynamicLeaves = []
+
+        for i in range(len(bodies)):
+            leaf = leaves[bodies[i]]
+            leaf.index = i
+
+            if leaf.tree is self.dynamicTree:
+                if self.dynamicTree.move(leaf, bodies[i].getAABB()): moved.append(leaf)
+                dynamicLeaves.append(leaf)
+            # Static and sleeping bodies only move through their setters, their tight boxes follow them here
+            elif leaf.version != bodies[i].transformVersion:
+                self.staticTree.reinsert(leaf, bodies[i].getAABB())
+                moved.append(leaf)
+
+        # Candidates are the leaves whose fat AABBs overlap, they only change when a leaf is reinserted
+        found = []
+        tests = 0
+        for leaf in moved:
+            if leaf.tree is None: continue
+            self.__dropCandidates(leaf)
+
+            found.clear()
+            tests += self.dynamicTree.query(leaf, found)
+            if leaf.tree is self.dynamicTree: tests += self.staticTree.query(leaf, found)
+
+            for other in found:
+                if other is leaf: continue
+                leaf.candidates.add(other)
+                other.candidates.add(leaf)
+
+        pairs = []
+        for leaf in dynamicLeaves:
+            i = leaf.index
+            box = leaf.body.getAABB()
+
+            for other in leaf.candidates:
+                j = other.index
+                if j <= i and other.tree is self.dynamicTree: continue # Dynamic pairs are found from both sides, keep only one
+                tests += 1
+                if not Collisions.intersectTwoAABBs(box, other.body.getAABB()): continue
+
+                pairs.append((i, j) if i < j else (j, i))
+
+        self.aabbTests = tests
+        pairs.sort()
+        return pairs
+
+    @staticmethod
+    def __dropCandidates(leaf: TreeNode):
+        for other in leaf.candidates: other.candidates.discard(leaf)
+        leaf.candidates.clear()
+
+    # Returns the new leaves, they still need their candidates
+    def __syncBodies(self, bodies: list[Rigidbody]) -> list[TreeNode]:
+        leaves = self.__leaves
+        added = []
+        known = 0
+
+        for body in bodies:
+            leaf = leaves.get(body)
+            if leaf is None: continue
+            
+            known += 1
+
+            # A body that changed between static and dynamic changes tree
+            if leaf.tree is not self.__treeOf(body):
+                self.__removeLeaf(leaf)
+                leaves[body] = self.__treeOf(body).insert(body)
+                added.append(leaves[body])
+
+        if known < len(leaves):
+            current = set(bodies)
+            for body in [b for b in leaves if b not in current]:
+                self.__removeLeaf(leaves.pop(body))
+
+        if known < len(bodies):
+            for body in bodies:
+                if body not in leaves: 
+                    leaves[body] = self.__treeOf(body).insert(body)
+                    added.append(leaves[body])
+
+        return added
+
+    def __removeLeaf(self, leaf: TreeNode):
+        self.__dropCandidates(leaf)
+        leaf.tree.remove(leaf)
+        leaf.tree = None
+
+    def __treeOf(self, body: Rigidbody) -> AABBTree:
+        # Sleeping bodies rest in the static tree until they wake up
+        return self.staticTree if body.isInert else self.dynamicTree
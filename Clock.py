@@ -0,0 +1,46 @@
+from World import World
+
+"""
+======================================================================================================
+SIMULATION CLOCK
+======================================================================================================
+"""
+
+class SimulationClock:
+    def __init__(self, stepTime: float = 1 / 60, maxFrameTime: float = 0.25):
+        if float(stepTime) <= 0: raise ValueError("stepTime must be greater than zero")
+        if float(maxFrameTime) < float(stepTime): raise ValueError("maxFrameTime must be greater or equal than stepTime")
+
+        self.stepTime = float(stepTime)         # seconds simulated by every World.update
+        self.maxFrameTime = float(maxFrameTime) # a longer frame is cut, so a slow frame cannot ask for more and more steps
+        self.__accumulator = 0.0
+        self.__steps = 0
+
+    # GETTERS ===========================================================================
+
+    @property
+    def accumulator(self): return self.__accumulator
+    @property
+    def steps(self): return self.__steps # Fixed steps run since the clock was made
+    # How far the renderer is between the last two simulated states, 0 is the previous one and 1 the last one
+    @property
+    def alpha(self): return self.__accumulator / self.stepTime
+
+    # METHODS ===========================================================================
+
+    # Runs as many fixed steps as fit in the time accumulated so far, returns how many ran
+    def advance(self, world: World, frameTime: float, subIterations: int = 1) -> int:
+        self.__accumulator += min(max(float(frameTime), 0.0), self.maxFrameTime)
+
+        steps = 0
+        while self.__accumulator >= self.stepTime:
+            world.bodyStore.savePose()
+            world.update(self.stepTime, subIterations)
+            self.__accumulator -= self.stepTime
+            steps += 1
+
+        self.__steps += steps
+        return steps
+
+    def reset(self):
+        self.__accumulator = 0.0
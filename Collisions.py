@@ -1,45 +1,102 @@
 from pygame.math import Vector2 as vec2
 from Rigidbody import Rigidbody, ShapeType, AABB
+from Profiler import EngineCounters
 import math
 
+class ContactPoint:
+    def __init__(self, position: vec2 = None, feature: int = 0):
+        self.position = vec2()
+        self.reset(position, feature)
+
+        # Filled by Collisions.prepareContacts
+        self.rnA = 0.0 # ra x normal
+        self.rnB = 0.0
+        self.rtA = 0.0 # ra x tangent
+        self.rtB = 0.0
+        self.normalMass = 0.0
+        self.tangentMass = 0.0
+        self.velocityBias = 0.0
+
+    # Copies the position so a pooled point keeps its own vec2
+    def reset(self, position: vec2, feature: int = 0):
+        if position is not None: self.position.update(position)
+        self.feature = feature # Which vertex/edge made this contact, matches the point across steps
+
+        # Accumulated impulses, seeded from the previous step when warm starting
+        self.normalImpulse = 0.0
+        self.tangentImpulse = 0.0
+
 class CollisionManifold:
     def __init__(self, bodyA: Rigidbody, bodyB: Rigidbody, normal: vec2, depth: float, 
-                 contact1: vec2, contact2: vec2, contactCount: int):
+                 contact1: vec2, contact2: vec2, contactCount: int, feature1: int = 0, feature2: int = 1):
+        # A manifold has room for two points, reset reuses them instead of making new ones
+        self.__pointSlots = (ContactPoint(), ContactPoint())
+        self.points: list[ContactPoint] = []
+        self.normal = vec2()
+
+        # Filled by Collisions.prepareContacts
+        self.tangent = vec2()
+        self.staticFriction = 0.0
+        self.dynamicFriction = 0.0
+        self.invMassA = self.invMassB = 0.0
+        self.invInertiaA = self.invInertiaB = 0.0
+        self.useBlock = False # Solve both points together with the 2x2 normal mass matrix k11, k12, k22
+        self.k11 = self.k12 = self.k22 = 0.0
+
+        self.reset(bodyA, bodyB, normal, depth, contact1, contact2, contactCount, feature1, feature2)
+
+    def reset(self, bodyA: Rigidbody, bodyB: Rigidbody, normal: vec2, depth: float, 
+              contact1: vec2, contact2: vec2, contactCount: int, feature1: int = 0, feature2: int = 1):
         self.bodyA = bodyA
         self.bodyB = bodyB
-        self.normal = normal
+        self.normal.update(normal)
         self.depth = depth
-        self.contact1 = contact1
-        self.contact2 = contact2
         self.contactCount = contactCount
 
+        slots = self.__pointSlots
+        self.points.clear()
+        slots[0].reset(contact1, feature1)
+        self.points.append(slots[0])
+        self.contact1 = slots[0].position
+        self.contact2 = None
+        if contactCount == 2: 
+            slots[1].reset(contact2, feature2)
+            self.points.append(slots[1])
+            self.contact2 = slots[1].position
+
 class Collisions:
 
     @staticmethod
     def intersectTwoAABBs(a: AABB, b: AABB):
-        if a.max.x < b.min.x or b.max.x < a.min.x or a.max.y < b.min.y or b.max.y < a.min.y: return False  
+        if a.maxX < b.minX or b.maxX < a.minX or a.maxY < b.minY or b.maxY < a.minY: return False  
         return True
 
     @staticmethod
     def intersectTwoCircles(centerA: vec2, radiusA: float, centerB: vec2, radiusB: float):
         AToB = centerB - centerA
-        depthIntersection = radiusA + radiusB - AToB.length() # How much are colliding, negative = not colliding
-        
-        return depthIntersection > 0, AToB.normalize(), depthIntersection
+        dist = AToB.length()
+        depthIntersection = radiusA + radiusB - dist # How much are colliding, negative = not colliding
+
+        # Two circles at the same center get the same arbitrary normal as BatchCollisions.collideCircles
+        normal = AToB.normalize() if dist > 0 else vec2(1, 0)
+        return depthIntersection > 0, normal, depthIntersection
     
     @staticmethod
-    def intersectCirclePolygon(centerCircle: vec2, radiusCircle: float, centerPoly: vec2, verticesPoly: list[vec2]):
+    def intersectCirclePolygon(centerCircle: vec2, radiusCircle: float, centerPoly: vec2, verticesPoly: list[vec2], 
+                               axesPoly: list[vec2] = None, counters: EngineCounters = None):
         normal = vec2()
         minDepth = float('inf')
 
-        # SEPARATING AXIS THEOREM (SAT)
-        for i in range(len(verticesPoly)):
-            edge = verticesPoly[(i+1) % len(verticesPoly)] - verticesPoly[i]
-            axis = vec2(-edge.y, edge.x).normalize()
+        # Edge normals, Rigidbody.getAxes already has them
+        if axesPoly is None: axesPoly = Collisions.edgeAxes(verticesPoly)
 
+        # SEPARATING AXIS THEOREM (SAT)
+        for k, axis in enumerate(axesPoly):
             minA,  maxA = Collisions.projectVertices(verticesPoly, axis)
             minB,  maxB = Collisions.projectCircle(centerCircle, radiusCircle, axis)
-            if minA >= maxB or minB >= maxA: return False, None, None
+            if minA >= maxB or minB >= maxA: 
+                if counters is not None: counters.rejectedOnAxis(k)
+                return False, None, None
 
             axisDepth = min(maxB - minA, maxA - minB)
 
@@ -49,7 +106,9 @@ class Collisions:
 
         minA, maxA = Collisions.projectVertices(verticesPoly, axis)
         minB, maxB = Collisions.projectCircle(centerCircle, radiusCircle, axis)
-        if minA >= maxB or minB >= maxA: return False, None, None
+        if minA >= maxB or minB >= maxA: 
+            if counters is not None: counters.rejectedOnAxis(len(axesPoly)) # The closest vertex axis goes last
+            return False, None, None
 
         axisDepth = min(maxB - minA, maxA - minB)
 
@@ -61,32 +120,35 @@ class Collisions:
 
 
     @staticmethod
-    def intersectTwoPolygons(centerPolyA: vec2, verticesPolyA: list[vec2], centerPolyB: vec2, verticesPolyB: list[vec2]):
+    def intersectTwoPolygons(centerPolyA: vec2, verticesPolyA: list[vec2], centerPolyB: vec2, verticesPolyB: list[vec2],
+                             axesPolyA: list[vec2] = None, axesPolyB: list[vec2] = None, counters: EngineCounters = None):
         normal = vec2()
         minDepth = float('inf')
 
-        # SEPARATING AXIS THEOREM (SAT)
-        for i in range(len(verticesPolyA)):
-            edge = verticesPolyA[(i+1) % len(verticesPolyA)] - verticesPolyA[i]
-            axis = vec2(-edge.y, edge.x).normalize()
+        # Edge normals, Rigidbody.getAxes already has them
+        if axesPolyA is None: axesPolyA = Collisions.edgeAxes(verticesPolyA)
+        if axesPolyB is None: axesPolyB = Collisions.edgeAxes(verticesPolyB)
 
+        # SEPARATING AXIS THEOREM (SAT)
+        for k, axis in enumerate(axesPolyA):
             minA,  maxA = Collisions.projectVertices(verticesPolyA, axis)
             minB,  maxB = Collisions.projectVertices(verticesPolyB, axis)
 
-            if minA >= maxB or minB >= maxA: return False, None, None
+            if minA >= maxB or minB >= maxA: 
+                if counters is not None: counters.rejectedOnAxis(k)
+                return False, None, None
 
             axisDepth = min(maxB - minA, maxA - minB)
 
             if axisDepth < minDepth: minDepth, normal = axisDepth, axis
         
-        for i in range(len(verticesPolyB)):
-            edge = verticesPolyB[(i+1) % len(verticesPolyB)] - verticesPolyB[i]
-            axis = vec2(-edge.y, edge.x).normalize()
-
+        for k, axis in enumerate(axesPolyB):
             minA,  maxA = Collisions.projectVertices(verticesPolyA, axis)
             minB,  maxB = Collisions.projectVertices(verticesPolyB, axis)
 
-            if minA >= maxB or minB >= maxA: return False, None, None
+            if minA >= maxB or minB >= maxA: 
+                if counters is not None: counters.rejectedOnAxis(len(axesPolyA) + k)
+                return False, None, None
             
             axisDepth = min(maxB - minA, maxA - minB)
             if axisDepth < minDepth: minDepth, normal = axisDepth, axis
@@ -95,6 +157,14 @@ class Collisions:
         
         return True, normal, minDepth
 
+    @staticmethod
+    def edgeAxes(vertices: list[vec2]) -> list[vec2]:
+        axes = []
+        for i in range(len(vertices)):
+            edge = vertices[(i+1) % len(vertices)] - vertices[i]
+            axes.append(vec2(-edge.y, edge.x).normalize())
+        return axes
+
     @staticmethod
     def findClosestPointOfPolygon(center: vec2, vertices: list[vec2]):
         minDist = float('inf')
@@ -110,8 +180,14 @@ class Collisions:
     
     @staticmethod
     def findContactPoints(bodyA: Rigidbody, bodyB: Rigidbody):
+        cp1, cp2, contactCount, _, _ = Collisions.findContactPointsWithFeatures(bodyA, bodyB)
+        return cp1, cp2, contactCount
+
+    @staticmethod
+    def findContactPointsWithFeatures(bodyA: Rigidbody, bodyB: Rigidbody):
         cp2 = None
         contactCount = 0
+        feature1, feature2 = 0, 1
 
         if bodyA.shape.shapeType == ShapeType.CIRCLE: 
             if bodyB.shape.shapeType == ShapeType.CIRCLE:
@@ -120,61 +196,60 @@ class Collisions:
                 contactCount = 1 
             else:
                 # BODYA CIRCLE and BODYB POLYGON
-                cp1 = Collisions.findContactPointCirclePolygon(bodyA.position, bodyA.shape.radius, bodyB.position, bodyB.getVertices())
+                cp1, feature1 = Collisions.findContactPointCirclePolygonWithFeature(bodyA.position, bodyA.shape.radius, bodyB.position, bodyB.getVertices())
                 contactCount = 1      
         elif bodyB.shape.shapeType == ShapeType.CIRCLE:
             # BODYA POLYGON and BODYB CIRCLE
-            cp1 = Collisions.findContactPointCirclePolygon(bodyB.position, bodyB.shape.radius, bodyA.position, bodyA.getVertices())
+            cp1, feature1 = Collisions.findContactPointCirclePolygonWithFeature(bodyB.position, bodyB.shape.radius, bodyA.position, bodyA.getVertices())
             contactCount = 1
         else:
             # BOTH POLYGONS
-            cp1, cp2, contactCount = Collisions.findContactPointsTwoPolygons(bodyA.getVertices(), bodyB.getVertices())      
+            cp1, cp2, contactCount, feature1, feature2 = Collisions.findContactPointsTwoPolygonsWithFeatures(bodyA.getVertices(), bodyB.getVertices())      
 
-        return cp1, cp2, contactCount
+        return cp1, cp2, contactCount, feature1, feature2
     
     @staticmethod
     def findContactPointsTwoPolygons(verticesA: list[vec2], verticesB: list[vec2]):
-        minDistSq = float('inf')
-        contact2 = None
-
-        for i in range(len(verticesA)):
-            for j in range(len(verticesB)):
-                v1 = verticesB[j]
-                v2 = verticesB[(j+1) % len(verticesB)]
-
-                cp, distSq = Collisions.pointSegmentDistance(verticesA[i], v1, v2)
-
-                if Collisions.nearlyEqual(distSq, minDistSq):
-                    if not Collisions.closeEnough(cp, contact1):
-                        contact2 = cp
-                        contactCount = 2
-                elif distSq < minDistSq:
-                    minDistSq = distSq
-                    contact1 = cp
-                    contactCount = 1
-        
-        for i in range(len(verticesB)):
-            for j in range(len(verticesA)):
-                v1 = verticesA[j]
-                v2 = verticesA[(j+1) % len(verticesA)]
-
-                cp, distSq = Collisions.pointSegmentDistance(verticesB[i], v1, v2)
-
-                if Collisions.nearlyEqual(distSq, minDistSq):
-                    if not Collisions.closeEnough(cp, contact1):
-                        contact2 = cp
-                        contactCount = 2
-                elif distSq < minDistSq:
-                    minDistSq = distSq
-                    contact1 = cp
-                    contactCount = 1
-
+        contact1, contact2, contactCount, _, _ = Collisions.findContactPointsTwoPolygonsWithFeatures(verticesA, verticesB)
         return contact1, contact2, contactCount
 
+    @staticmethod
+    def findContactPointsTwoPolygonsWithFeatures(verticesA: list[vec2], verticesB: list[vec2]):
+        minDistSq = float('inf')
+        contact2 = None
+        feature1, feature2 = 0, 1
+
+        # Feature of a contact = which polygon gives the vertex (side), the vertex and the edge of the other one
+        for side, verts, others in ((0, verticesA, verticesB), (1, verticesB, verticesA)):
+            for i in range(len(verts)):
+                for j in range(len(others)):
+                    v1 = others[j]
+                    v2 = others[(j+1) % len(others)]
+
+                    cp, distSq = Collisions.pointSegmentDistance(verts[i], v1, v2)
+
+                    if Collisions.nearlyEqual(distSq, minDistSq):
+                        if not Collisions.closeEnough(cp, contact1):
+                            contact2 = cp
+                            feature2 = side * 64 + i * 8 + j
+                            contactCount = 2
+                    elif distSq < minDistSq:
+                        minDistSq = distSq
+                        contact1 = cp
+                        feature1 = side * 64 + i * 8 + j
+                        contactCount = 1
+
+        return contact1, contact2, contactCount, feature1, feature2
 
     @staticmethod
     def findContactPointCirclePolygon(centerCircle: vec2, radiusCircle: float, centerPoly: vec2, verticesPoly: list[vec2]):
+        contact, _ = Collisions.findContactPointCirclePolygonWithFeature(centerCircle, radiusCircle, centerPoly, verticesPoly)
+        return contact
+
+    @staticmethod
+    def findContactPointCirclePolygonWithFeature(centerCircle: vec2, radiusCircle: float, centerPoly: vec2, verticesPoly: list[vec2]):
         minDistSq = float('inf')
+        edge = 0
         
         for i in range(len(verticesPoly)):
             va = verticesPoly[i]
@@ -185,13 +260,14 @@ class Collisions:
             if distSq < minDistSq:
                 minDistSq = distSq
                 retContact = contact
+                edge = i
 
-        return retContact
+        return retContact, edge
 
     @staticmethod
     def findContactPointTwoCircles(centerA: vec2, radiusA: float, centerB: vec2):
         ab = centerB - centerA
-        dir = ab.normalize()
+        dir = ab.normalize() if ab.length_squared() > 0 else vec2(1, 0)
         return centerA + dir * radiusA
 
     @staticmethod
@@ -241,14 +317,15 @@ class Collisions:
                 coll, normal, depth = Collisions.intersectTwoCircles(bodyA.position, bodyA.shape.radius, bodyB.position, bodyB.shape.radius)
             else:
                 # BODYA CIRCLE and BODYB POLYGON
-                coll, normal, depth = Collisions.intersectCirclePolygon(bodyA.position, bodyA.shape.radius, bodyB.position, bodyB.getVertices())
+                coll, normal, depth = Collisions.intersectCirclePolygon(bodyA.position, bodyA.shape.radius, bodyB.position, bodyB.getVertices(), bodyB.getAxes())
         elif bodyB.shape.shapeType == ShapeType.CIRCLE:
             # BODYA POLYGON and BODYB CIRCLE
-            coll, normal, depth = Collisions.intersectCirclePolygon(bodyB.position, bodyB.shape.radius, bodyA.position, bodyA.getVertices())
+            coll, normal, depth = Collisions.intersectCirclePolygon(bodyB.position, bodyB.shape.radius, bodyA.position, bodyA.getVertices(), bodyA.getAxes())
             if coll: normal *= -1
         else:
             # BOTH POLYGONS
-            coll, normal, depth = Collisions.intersectTwoPolygons(bodyA.position, bodyA.getVertices(), bodyB.position, bodyB.getVertices())         
+            coll, normal, depth = Collisions.intersectTwoPolygons(bodyA.position, bodyA.getVertices(), bodyB.position, bodyB.getVertices(),
+                                                                  bodyA.getAxes(), bodyB.getAxes())         
         
         return coll, normal, depth
     
@@ -438,6 +515,196 @@ class Collisions:
             bodyB.angularVelocity += rbList[i].cross(frictionImpulse) * invInertiaB
 
 
+    """
+    ======================================================================================================
+    SEQUENTIAL IMPULSES WITH ACCUMULATED IMPULSES
+    ======================================================================================================
+    """
+
+    # Restitution is only applied above this approach speed so resting contacts do not keep bouncing
+    restitutionThreshold = 20 # pixels per second, 1 meter per second
+    maxBlockCondition = 1000
+
+    @staticmethod
+    def prepareContacts(contact: CollisionManifold):
+        bodyA = contact.bodyA
+        bodyB = contact.bodyB
+        nx, ny = contact.normal
+        tx, ty = ny, -nx
+        contact.tangent.update(tx, ty)
+
+        rest = (bodyA.restitution + bodyB.restitution) / 2
+        contact.staticFriction = (bodyA.staticFriction + bodyB.staticFriction) / 2
+        contact.dynamicFriction = (bodyA.dynamicFriction + bodyB.dynamicFriction) / 2
+
+        # Being static is like having infinite mass
+        invMassA = contact.invMassA = bodyA.invMass
+        invMassB = contact.invMassB = bodyB.invMass
+        invInertiaA = contact.invInertiaA = bodyA.invInertia
+        invInertiaB = contact.invInertiaB = bodyB.invInertia
+
+        pax, pay = bodyA.position
+        pbx, pby = bodyB.position
+        vax, vay = bodyA.velocity
+        vbx, vby = bodyB.velocity
+        angVelA, angVelB = bodyA.angularVelocity, bodyB.angularVelocity
+        velDiffN = (vbx - vax) * nx + (vby - vay) * ny
+
+        for point in contact.points:
+            cx, cy = point.position
+            rax, ray = cx - pax, cy - pay
+            rbx, rby = cx - pbx, cy - pby
+
+            # ra x n is the same as raPerp . n, the impulses only need these four numbers
+            point.rnA, point.rnB = rax * ny - ray * nx, rbx * ny - rby * nx
+            point.rtA, point.rtB = rax * ty - ray * tx, rbx * ty - rby * tx
+
+            kNormal = invMassA + invMassB + (point.rnA ** 2) * invInertiaA + (point.rnB ** 2) * invInertiaB
+            kTangent = invMassA + invMassB + (point.rtA ** 2) * invInertiaA + (point.rtB ** 2) * invInertiaB
+            point.normalMass = 1 / kNormal if kNormal > 0 else 0.0
+            point.tangentMass = 1 / kTangent if kTangent > 0 else 0.0
+
+            # The bounce target is taken from the velocity before any impulse of this step
+            contactVelMag = velDiffN + angVelB * point.rnB - angVelA * point.rnA
+            point.velocityBias = -rest * contactVelMag if contactVelMag < -Collisions.restitutionThreshold else 0.0
+
+        # Two points are solved together, one after the other makes a resting box start to tilt
+        contact.useBlock = False
+        if len(contact.points) == 2:
+            p1, p2 = contact.points
+            k11 = invMassA + invMassB + invInertiaA * p1.rnA * p1.rnA + invInertiaB * p1.rnB * p1.rnB
+            k22 = invMassA + invMassB + invInertiaA * p2.rnA * p2.rnA + invInertiaB * p2.rnB * p2.rnB
+            k12 = invMassA + invMassB + invInertiaA * p1.rnA * p2.rnA + invInertiaB * p1.rnB * p2.rnB
+
+            # Almost the same point twice makes the matrix singular
+            det = k11 * k22 - k12 * k12
+            if k11 * k11 < Collisions.maxBlockCondition * det: 
+                contact.useBlock = True
+                contact.k11, contact.k12, contact.k22 = k11, k12, k22
+
+    @staticmethod
+    def warmStartContacts(contact: CollisionManifold):
+        bodyA = contact.bodyA
+        bodyB = contact.bodyB
+        nx, ny = contact.normal
+        tx, ty = contact.tangent
+        invMassA, invMassB = contact.invMassA, contact.invMassB
+        invInertiaA, invInertiaB = contact.invInertiaA, contact.invInertiaB
+
+        vax, vay = bodyA.velocity
+        vbx, vby = bodyB.velocity
+        angVelA, angVelB = bodyA.angularVelocity, bodyB.angularVelocity
+
+        for point in contact.points:
+            jn, jt = point.normalImpulse, point.tangentImpulse
+            px, py = nx * jn + tx * jt, ny * jn + ty * jt
+
+            vax -= px * invMassA
+            vay -= py * invMassA
+            angVelA -= (point.rnA * jn + point.rtA * jt) * invInertiaA
+            vbx += px * invMassB
+            vby += py * invMassB
+            angVelB += (point.rnB * jn + point.rtB * jt) * invInertiaB
+
+        Collisions.__writeVelocities(contact, vax, vay, angVelA, vbx, vby, angVelB)
+
+    @staticmethod
+    def solveContacts(contact: CollisionManifold, counters: EngineCounters = None):
+        bodyA = contact.bodyA
+        bodyB = contact.bodyB
+        nx, ny = contact.normal
+        tx, ty = contact.tangent
+        invMassA, invMassB = contact.invMassA, contact.invMassB
+        invInertiaA, invInertiaB = contact.invInertiaA, contact.invInertiaB
+
+        # Velocities are kept in locals while solving, the bodies are written once at the end
+        vax, vay = bodyA.velocity
+        vbx, vby = bodyB.velocity
+        angVelA, angVelB = bodyA.angularVelocity, bodyB.angularVelocity
+
+        if contact.useBlock:
+            # Finds the two total impulses x >= 0 that leave both points with vn >= 0 and vn == 0 where x > 0,
+            # trying in order: both pushing, only the first, only the second, none
+            p1, p2 = contact.points
+            k11, k12, k22 = contact.k11, contact.k12, contact.k22
+            a1, a2 = p1.normalImpulse, p2.normalImpulse
+
+            dvx, dvy = vbx - vax, vby - vay
+            vn1 = dvx * nx + dvy * ny + angVelB * p1.rnB - angVelA * p1.rnA
+            vn2 = dvx * nx + dvy * ny + angVelB * p2.rnB - angVelA * p2.rnA
+
+            # Velocities the points would have without any accumulated impulse
+            b1 = vn1 - p1.velocityBias - (k11 * a1 + k12 * a2)
+            b2 = vn2 - p2.velocityBias - (k12 * a1 + k22 * a2)
+
+            det = k11 * k22 - k12 * k12
+            x1 = -(k22 * b1 - k12 * b2) / det
+            x2 = -(k11 * b2 - k12 * b1) / det
+
+            if x1 < 0 or x2 < 0:
+                x1, x2 = -b1 / k11, 0.0
+                if x1 < 0 or k12 * x1 + b2 < 0:
+                    x1, x2 = 0.0, -b2 / k22
+                    if x2 < 0 or k12 * x2 + b1 < 0:
+                        x1, x2 = (0.0, 0.0) if b1 >= 0 and b2 >= 0 else (a1, a2)
+
+            d1, d2 = x1 - a1, x2 - a2
+            p1.normalImpulse, p2.normalImpulse = x1, x2
+
+            j = d1 + d2
+            vax -= nx * j * invMassA
+            vay -= ny * j * invMassA
+            angVelA -= (p1.rnA * d1 + p2.rnA * d2) * invInertiaA
+            vbx += nx * j * invMassB
+            vby += ny * j * invMassB
+            angVelB += (p1.rnB * d1 + p2.rnB * d2) * invInertiaB
+        else:
+            for point in contact.points:
+                contactVelMag = (vbx - vax) * nx + (vby - vay) * ny + angVelB * point.rnB - angVelA * point.rnA
+
+                # The total impulse can only push, a negative increment only gives back what was pushed before
+                j = -point.normalMass * (contactVelMag - point.velocityBias)
+                newImpulse = max(point.normalImpulse + j, 0.0)
+                j = newImpulse - point.normalImpulse
+                point.normalImpulse = newImpulse
+
+                vax -= nx * j * invMassA
+                vay -= ny * j * invMassA
+                angVelA -= point.rnA * j * invInertiaA
+                vbx += nx * j * invMassB
+                vby += ny * j * invMassB
+                angVelB += point.rnB * j * invInertiaB
+
+        for point in contact.points:
+            tangentVelMag = (vbx - vax) * tx + (vby - vay) * ty + angVelB * point.rtB - angVelA * point.rtA
+            jt = -point.tangentMass * tangentVelMag
+
+            # Friction cone: sticks while under the static limit, otherwise slides with the dynamic one
+            newImpulse = point.tangentImpulse + jt
+            if abs(newImpulse) > point.normalImpulse * contact.staticFriction:
+                maxFriction = point.normalImpulse * contact.dynamicFriction
+                newImpulse = max(-maxFriction, min(newImpulse, maxFriction))
+                if counters is not None: counters.dynamicFriction += 1
+            elif counters is not None: counters.staticFriction += 1
+
+            jt = newImpulse - point.tangentImpulse
+            point.tangentImpulse = newImpulse
+
+            vax -= tx * jt * invMassA
+            vay -= ty * jt * invMassA
+            angVelA -= point.rtA * jt * invInertiaA
+            vbx += tx * jt * invMassB
+            vby += ty * jt * invMassB
+            angVelB += point.rtB * jt * invInertiaB
+
+        Collisions.__writeVelocities(contact, vax, vay, angVelA, vbx, vby, angVelB)
+
+    # Static bodies are left untouched, their velocity setters would wake them up
+    @staticmethod
+    def __writeVelocities(contact: CollisionManifold, vax: float, vay: float, angVelA: float, vbx: float, vby: float, angVelB: float):
+        if contact.invMassA: contact.bodyA.setMotion(vax, vay, angVelA)
+        if contact.invMassB: contact.bodyB.setMotion(vbx, vby, angVelB)
+
     @staticmethod
     def nearlyEqual(a: float, b: float):
         return abs(a - b) < 0.05
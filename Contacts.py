@@ -0,0 +1,119 @@
+from pygame.math import Vector2 as vec2
+from Rigidbody import Rigidbody
+from Collisions import CollisionManifold
+
+"""
+======================================================================================================
+MANIFOLD POOL
+======================================================================================================
+"""
+
+class ManifoldPool:
+    def __init__(self):
+        self.__manifolds: list[CollisionManifold] = []
+        self.active: list[CollisionManifold] = [] # Manifolds handed out since the last releaseAll
+        self.allocations = 0 # Manifolds ever created, only grows when a step has more contacts than any before
+
+    @property
+    def capacity(self): return len(self.__manifolds)
+
+    def acquire(self, bodyA: Rigidbody, bodyB: Rigidbody, normal: vec2, depth: float, 
+                contact1: vec2, contact2: vec2, contactCount: int, feature1: int = 0, feature2: int = 1) -> CollisionManifold:
+        used = len(self.active)
+        if used < len(self.__manifolds):
+            manifold = self.__manifolds[used]
+            manifold.reset(bodyA, bodyB, normal, depth, contact1, contact2, contactCount, feature1, feature2)
+        else:
+            manifold = CollisionManifold(bodyA, bodyB, normal, depth, contact1, contact2, contactCount, feature1, feature2)
+            self.__manifolds.append(manifold)
+            self.allocations += 1
+
+        self.active.append(manifold)
+        return manifold
+
+    # Every manifold goes back to the pool, the list keeps its size so the next step does not grow it again
+    def releaseAll(self):
+        self.active.clear()
+
+    def clear(self):
+        self.active.clear()
+        self.__manifolds.clear()
+
+"""
+======================================================================================================
+CONTACT CACHE
+======================================================================================================
+"""
+
+class ContactCache:
+    def __init__(self):
+        self.enabled = True # Without warm starting every solve starts from zero impulse
+        self.__impulses: dict[tuple[Rigidbody, Rigidbody], dict[int, tuple[float, float]]] = {}
+        self.__touched: dict[tuple[Rigidbody, Rigidbody], dict[int, tuple[float, float]]] = {}
+        self.__spare: list[dict[int, tuple[float, float]]] = [] # Feature dicts of forgotten pairs, reused by store
+        self.allocations = 0 # Feature dicts ever created
+
+    @property
+    def pairCount(self): return len(self.__impulses)
+
+    # Seeds the contact points with the impulses their features accumulated the last step
+    def warmStart(self, manifold: CollisionManifold) -> bool:
+        if not self.enabled: return False
+
+        cached = self.__impulses.get((manifold.bodyA, manifold.bodyB))
+        if cached is None: return False
+
+        matched = False
+        for point in manifold.points:
+            impulses = cached.get(point.feature)
+            if impulses is None: continue
+
+            point.normalImpulse, point.tangentImpulse = impulses
+            matched = True
+
+        return matched
+
+    def store(self, manifold: CollisionManifold):
+        if not self.enabled: return
+
+        key = (manifold.bodyA, manifold.bodyB)
+        features = self.__touched.get(key)
+        if features is None:
+            if self.__spare: 
+                features = self.__spare.pop()
+            else:
+                features = {}
+                self.allocations += 1
+            self.__touched[key] = features
+
+        features.clear()
+        for p in manifold.points: features[p.feature] = (p.normalImpulse, p.tangentImpulse)
+
+    # Pairs that did not touch during the step are forgotten, both dicts swap places instead of making a new one
+    def endStep(self):
+        self.__spare.extend(self.__impulses.values())
+        self.__impulses.clear()
+        self.__impulses, self.__touched = self.__touched, self.__impulses
+
+    # Every cached impulse as (bodyA, bodyB, feature, normalImpulse, tangentImpulse)
+    def entries(self):
+        for (bodyA, bodyB), features in self.__impulses.items():
+            for feature, (normalImpulse, tangentImpulse) in features.items():
+                yield bodyA, bodyB, feature, normalImpulse, tangentImpulse
+
+    # Replaces the cached impulses with the given entries, like the ones entries gives
+    def load(self, entries):
+        self.clear()
+        for bodyA, bodyB, feature, normalImpulse, tangentImpulse in entries:
+            features = self.__impulses.get((bodyA, bodyB))
+            if features is None:
+                features = self.__spare.pop() if self.__spare else {}
+                features.clear()
+                self.__impulses[(bodyA, bodyB)] = features
+            features[feature] = (normalImpulse, tangentImpulse)
+
+    def clear(self):
+        self.__spare.extend(self.__impulses.values())
+        self.__spare.extend(self.__touched.values())
+        self.__impulses.clear()
+        self.__touched.clear()
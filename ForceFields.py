@@ -0,0 +1,63 @@
+from abc import ABC, abstractmethod
+import numpy as np
+from pygame.math import Vector2 as vec2
+from BodyStore import BodyStore
+
+"""
+======================================================================================================
+FORCE FIELD CLASSES
+======================================================================================================
+"""
+
+class ForceField(ABC):
+    # rows are the store rows of the dynamic bodies, the field adds its force to all of them at once
+    @abstractmethod
+    def apply(self, store: BodyStore, rows: np.ndarray, deltaTime: float):
+        pass
+
+class Wind(ForceField):
+    def __init__(self, velocity: vec2, coefficient: float = 0.05):
+        if float(coefficient) < 0: raise ValueError("coefficient must be greater or equal than zero")
+
+        self.velocity = vec2(velocity)
+        self.coefficient = float(coefficient)
+
+    def apply(self, store: BodyStore, rows: np.ndarray, deltaTime: float):
+        # Drag towards the wind velocity, bodies already moving with the wind feel nothing
+        relative = np.array((self.velocity.x, self.velocity.y)) - store.velocity[rows]
+        store.force[rows] += self.coefficient * relative
+
+class RadialAttractor(ForceField):
+    minDistance = 5 # pixels, avoids the force blowing up at the center
+
+    def __init__(self, center: vec2, strength: float, radius: float = None):
+        if radius is not None and float(radius) <= 0: raise ValueError("radius must be greater than zero")
+
+        self.center = vec2(center)
+        self.strength = float(strength) # Negative strength pushes bodies away
+        self.radius = None if radius is None else float(radius)
+
+    def apply(self, store: BodyStore, rows: np.ndarray, deltaTime: float):
+        toCenter = np.array((self.center.x, self.center.y)) - store.position[rows]
+        dist = np.maximum(np.hypot(toCenter[:, 0], toCenter[:, 1]), self.minDistance)
+
+        # Inverse square falloff, scaled by mass so every body gets the same acceleration
+        magnitude = self.strength * store.mass[rows] / dist ** 2
+        if self.radius is not None: magnitude[dist > self.radius] = 0
+
+        store.force[rows] += toCenter * (magnitude / dist)[:, None]
+
+class RegionGravity(ForceField):
+    def __init__(self, zone: list, gravity: vec2):
+        if len(zone) != 4: raise TypeError("zone argument must be a length 4 list [x, y, width, height]")
+
+        self.zone = list(zone)
+        self.gravity = vec2(gravity)
+
+    def apply(self, store: BodyStore, rows: np.ndarray, deltaTime: float):
+        x, y, width, height = self.zone
+        pos = store.position[rows]
+        inside = (pos[:, 0] >= x) & (pos[:, 0] <= x + width) & (pos[:, 1] >= y) & (pos[:, 1] <= y + height)
+
+        rows = rows[inside]
+        store.force[rows] += np.outer(store.mass[rows], (self.gravity.x, self.gravity.y))
@@ -0,0 +1,152 @@
+import os
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse, json, sys, time
+from World import World
+from Profiler import EngineCounters
+from Replay import ReplayRecorder
+import Scenes
+
+"""
+======================================================================================================
+HEADLESS RUNNER
+======================================================================================================
+"""
+
+class HeadlessRunner:
+    def __init__(self, world: World, deltaTime: float = 1 / 60, subIterations: int = 4):
+        if float(deltaTime) <= 0: raise ValueError("deltaTime must be greater than zero")
+        if int(subIterations) < 1 or int(subIterations) > 64: raise ValueError("subIterations must be between 1 and 64")
+
+        self.world = world
+        self.deltaTime = float(deltaTime)
+        self.subIterations = int(subIterations)
+
+    # Steps the world a fixed number of frames at a fixed dt, without any display or frame pacing
+    def run(self, frames: int) -> dict:
+        if int(frames) < 0: raise ValueError("frames must be greater or equal than zero")
+
+        world = self.world
+        pairs = 0
+        contacts = 0
+        allocations = 0
+        phaseSeconds = {} if world.phaseTimes is not None else None
+        counters = EngineCounters() if world.counters is not None else None
+
+        start = time.perf_counter()
+        for _ in range(int(frames)):
+            world.update(self.deltaTime, self.subIterations)
+            pairs += len(world.contactPairs)
+            contacts += world.contactCount
+            allocations += world.allocationCount
+            if phaseSeconds is not None:
+                for phase, seconds in world.phaseTimes.items(): phaseSeconds[phase] = phaseSeconds.get(phase, 0.0) + seconds
+            if counters is not None: counters.merge(world.counters)
+        seconds = time.perf_counter() - start
+
+        frames = int(frames)
+        report = {
+            "frames": frames,
+            "substeps": frames * self.subIterations,
+            "seconds": seconds,
+            "framesPerSecond": frames / seconds if seconds > 0 else 0.0,
+            "stepsPerSecond": frames * self.subIterations / seconds if seconds > 0 else 0.0,
+            "bodies": len(world.entityList),
+            "dynamicBodies": sum(1 for e in world.entityList if not e.body.isStatic),
+            "pairsPerFrame": pairs / frames if frames else 0.0,
+            "contactsPerFrame": contacts / frames if frames else 0.0,
+            "allocationsPerFrame": allocations / frames if frames else 0.0,
+        }
+        # Only when the world was timing its phases or counting
+        if phaseSeconds is not None: report["phaseSeconds"] = phaseSeconds
+        if counters is not None: report["counters"] = counters.asDict()
+        return report
+
+def worldState(world: World) -> dict:
+    bodies = []
+    for e in world.entityList:
+        b = e.body
+        bodies.append({
+            "shape": b.shape.shapeType.name,
+            "isStatic": b.isStatic,
+            "position": [b.position.x, b.position.y],
+            "velocity": [b.velocity.x, b.velocity.y],
+            "rotation": b.rotation,
+            "angularVelocity": b.angularVelocity,
+        })
+
+    return {"level": world.currentLevel, "bodies": bodies}
+
+"""
+======================================================================================================
+COMMAND LINE
+======================================================================================================
+"""
+
+def parseArgs(argv: list[str]):
+    parser = argparse.ArgumentParser(description="Steps a World without a display and reports its throughput")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--scene", type=int, default=1, help="shipped level to load (1-7)")
+    source.add_argument("--generate", choices=sorted(Scenes.generators), help="procedural scene to build instead of a level")
+    parser.add_argument("--count", type=int, default=200, help="bodies in a generated scene")
+    parser.add_argument("--seed", type=int, default=0, help="random seed of a generated scene")
+    parser.add_argument("--no-drop", action="store_true", help="do not drop the usable objects of a level")
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--dt", type=float, default=1 / 60)
+    parser.add_argument("--substeps", type=int, default=4)
+    parser.add_argument("--iterations", type=int, help="velocity iterations of the contact solver")
+    parser.add_argument("--profile", action="store_true", help="time every phase of the update and report min/mean/p95 per frame")
+    parser.add_argument("--counters", action="store_true", help="count pairs, SAT rejections, contacts and friction branches")
+    parser.add_argument("--dump", metavar="FILE", help="write the final world state as JSON")
+    parser.add_argument("--record", metavar="FILE", help="record a replay of the run to FILE, play it with Replay.py")
+    parser.add_argument("--keyframes", type=int, default=60, help="frames between the keyframes of the replay")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    return parser.parse_args(argv)
+
+def main(argv: list[str] = None):
+    args = parseArgs(sys.argv[1:] if argv is None else argv)
+
+    world = World()
+    if args.generate:
+        Scenes.buildScene(world, args.generate, args.count, args.seed)
+        name = args.generate
+    else:
+        Scenes.loadLevel(world, args.scene, not args.no_drop)
+        name = "level " + str(args.scene)
+
+    if args.iterations is not None: world.solver.velocityIterations = args.iterations
+    if args.profile: world.enableProfiling(max(args.frames, 1))
+    if args.counters: world.enableCounters()
+    recorder = ReplayRecorder(world, args.record, args.keyframes) if args.record else None
+
+    report = HeadlessRunner(world, args.dt, args.substeps).run(args.frames)
+    if recorder is not None:
+        recorder.close()
+        report["replayBytes"] = recorder.bytesWritten
+    report["scene"] = name
+    if args.profile: report["profile"] = world.profiler.stats()
+
+    if args.dump:
+        with open(args.dump, "w") as f: json.dump(worldState(world), f, indent=1)
+
+    if args.json: print(json.dumps(report))
+    else:
+        print(name + ": " + str(report["frames"]) + " frames in " + format(report["seconds"], ".3f") + " s")
+        print("  steps/s  " + format(report["stepsPerSecond"], ".1f") + "  (frames/s " + format(report["framesPerSecond"], ".1f") + ")")
+        print("  bodies   " + str(report["bodies"]) + "  (dynamic " + str(report["dynamicBodies"]) + ")")
+        print("  pairs    " + format(report["pairsPerFrame"], ".1f") + " per frame")
+        print("  contacts " + format(report["contactsPerFrame"], ".1f") + " per frame")
+        print("  allocs   " + format(report["allocationsPerFrame"], ".1f") + " per frame")
+        if recorder is not None: print("  replay   " + str(report["replayBytes"]) + " bytes in " + args.record)
+
+        if args.counters:
+            print("  counters (whole run)")
+            for name, value in report["counters"].items(): print("    " + name.ljust(16) + str(value))
+
+        if args.profile:
+            print("  phase          min    mean   p95  (ms per frame)")
+            for phase, s in report["profile"].items():
+                print("    " + phase.ljust(13) + format(s["min"] * 1000, "6.2f") + format(s["mean"] * 1000, "7.2f") + format(s["p95"] * 1000, "7.2f"))
+
+if __name__ == "__main__":
+    main()
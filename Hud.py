@@ -0,0 +1,144 @@
+from collections import OrderedDict
+from pygame import Surface, Rect, draw
+from pygame.font import Font
+
+"""
+======================================================================================================
+TEXT CACHE
+======================================================================================================
+"""
+
+class TextCache:
+    def __init__(self, capacity: int = 64):
+        if int(capacity) <= 0: raise ValueError("capacity must be greater than zero")
+
+        self.capacity = int(capacity)
+        self.hits = 0
+        self.misses = 0
+        self.__surfaces: OrderedDict[tuple, Surface] = OrderedDict()
+
+    def __len__(self): return len(self.__surfaces)
+
+    # The text is only rasterized the first time, the least recently used one goes when the cache is full
+    def render(self, font: Font, text: str, color: tuple, antialias: bool = False) -> Surface:
+        key = (font, text, tuple(color), antialias)
+        surface = self.__surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.__surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = self.__surfaces[key] = font.render(text, antialias, color)
+        if len(self.__surfaces) > self.capacity: self.__surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self.__surfaces.clear()
+
+"""
+======================================================================================================
+WIDGETS
+======================================================================================================
+"""
+
+class Label:
+    def __init__(self, text: str, pos: tuple[int, int], color: tuple = (0, 0, 0)):
+        self.text = text
+        self.pos = pos
+        self.color = color
+        self.visible = True
+
+    # Everything that changes how it looks, it is only drawn again when this changes
+    def look(self) -> tuple:
+        return (self.visible, self.text, self.color, self.pos)
+
+    def area(self, font: Font, cache: TextCache) -> Rect:
+        return cache.render(font, self.text, self.color).get_rect(topleft=self.pos)
+
+    def draw(self, surface: Surface, font: Font, cache: TextCache):
+        surface.blit(cache.render(font, self.text, self.color), self.pos)
+
+class Button:
+    def __init__(self, rect: Rect, text: str, textPos: tuple[int, int], color: tuple = (255, 255, 0),
+                 hoverColor: tuple = (255, 150, 0), pressedColor: tuple = None, textColor: tuple = (0, 0, 0)):
+        self.rect = Rect(rect)
+        self.text = text
+        self.textPos = textPos
+        self.color = color
+        self.hoverColor = hoverColor
+        self.pressedColor = hoverColor if pressedColor is None else pressedColor
+        self.textColor = textColor
+        self.visible = True
+        self.enabled = True   # A disabled button is drawn but never hovered or pressed
+        self.hovered = False
+        self.pressed = False  # Mouse held down over it
+
+    def update(self, mousePos: tuple[int, int], mouseDown: bool):
+        self.hovered = self.visible and self.enabled and self.rect.collidepoint(mousePos)
+        self.pressed = self.hovered and mouseDown
+
+    def currentColor(self) -> tuple:
+        if self.pressed: return self.pressedColor
+        if self.hovered: return self.hoverColor
+        return self.color
+
+    def look(self) -> tuple:
+        return (self.visible, tuple(self.rect), self.currentColor(), self.text, self.textColor, self.textPos)
+
+    def area(self, font: Font, cache: TextCache) -> Rect:
+        return self.rect.union(cache.render(font, self.text, self.textColor).get_rect(topleft=self.textPos))
+
+    def draw(self, surface: Surface, font: Font, cache: TextCache):
+        draw.rect(surface, self.currentColor(), self.rect)
+        surface.blit(cache.render(font, self.text, self.textColor), self.textPos)
+
+"""
+======================================================================================================
+HUD
+======================================================================================================
+"""
+
+class Hud:
+    # Widgets are kept between frames, the game only changes their text, visibility or enabled state
+    def __init__(self, font: Font, textCache: TextCache = None):
+        self.font = font
+        self.textCache = TextCache() if textCache is None else textCache
+        self.widgets: list[Label | Button] = []
+        self.__drawn: dict[int, tuple] = {} # id(widget) -> (look, area) of the last changedAreas
+        self.__bounds: Rect = None
+
+    def add(self, widget: Label | Button) -> Label | Button:
+        if not isinstance(widget, (Label, Button)): raise TypeError("widget argument must be a Label or Button type")
+        self.widgets.append(widget)
+        return widget
+
+    def update(self, mousePos: tuple[int, int], mouseDown: bool = False):
+        for widget in self.widgets:
+            if isinstance(widget, Button): widget.update(mousePos, mouseDown)
+
+    # Old and new areas of the widgets that look different since the last call
+    def changedAreas(self) -> list[Rect]:
+        areas = []
+        for widget in self.widgets:
+            look = widget.look()
+            last = self.__drawn.get(id(widget))
+            if last is not None and last[0] == look: continue
+
+            area = widget.area(self.font, self.textCache) if widget.visible else None
+            if last is not None and last[1] is not None: areas.append(last[1])
+            if area is not None: areas.append(area)
+            self.__drawn[id(widget)] = (look, area)
+
+        if areas:
+            visible = [a for _, a in self.__drawn.values() if a is not None]
+            self.__bounds = visible[0].unionall(visible[1:]) if visible else None
+        return areas
+
+    # Everything the visible widgets cover, as of the last changedAreas
+    def bounds(self) -> Rect:
+        return self.__bounds
+
+    def draw(self, surface: Surface):
+        for widget in self.widgets:
+            if widget.visible: widget.draw(surface, self.font, self.textCache)
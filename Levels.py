@@ -0,0 +1,164 @@
+from __future__ import annotations
+import hashlib, json, os, pickle
+import numpy as np
+from pygame.math import Vector2 as vec2
+from Rigidbody import Rigidbody, Shape, ShapeType, AABB, Entity
+from BodyStore import BodyStore
+
+"""
+======================================================================================================
+LEVEL DEFINITIONS
+======================================================================================================
+"""
+
+LEVELS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "levels.json")
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "__levelcache__")
+
+# Values a body of levels.json gets when it does not say otherwise
+bodyDefaults = {"position": [0, 0], "rotation": 0, "mass": 1, "restitution": 0.25, "static": False, "anchor": False, "color": [0, 0, 0]}
+
+def buildShape(spec: dict) -> Shape:
+    kind = spec.get("shape")
+    if kind == "circle": return Shape.newCircle(spec["radius"])
+
+    creators = {"box": Shape.newBox, "triangle": Shape.newTriangle, "pentagon": Shape.newPentagon}
+    if kind not in creators: raise ValueError("unknown shape " + str(kind) + ", use circle, box, triangle or pentagon")
+    width, height = spec["size"]
+    return creators[kind](width, height)
+
+def buildBody(spec: dict) -> Rigidbody:
+    body = Rigidbody(vec2(spec["position"]), spec["mass"], spec["restitution"], buildShape(spec), spec["static"])
+    if spec["rotation"]: body.rotation = float(spec["rotation"])
+    return body
+
+def buildEntity(spec: dict) -> Entity:
+    return Entity(buildBody(spec), tuple(spec["color"]))
+
+"""
+======================================================================================================
+COMPILED LEVEL
+======================================================================================================
+"""
+
+class CompiledLevel:
+    def __init__(self, spec: dict):
+        if "level" not in spec: raise ValueError("every level needs its level number")
+        if len(spec.get("completionZone", ())) != 4: raise TypeError("completionZone must be a length 4 list [x, y, width, height]")
+        if len(spec.get("playableZone", ())) != 4: raise TypeError("playableZone must be a length 4 list [x, y, width, height]")
+
+        self.level = int(spec["level"])
+        self.completionZone = list(spec["completionZone"])
+        self.playableZone = list(spec["playableZone"])
+        self.bodies = [dict(bodyDefaults, **b) for b in spec.get("bodies", [])]
+        self.usableObjects = [dict(bodyDefaults, **b) for b in spec.get("usableObjects", [])]
+        self.springs = [(int(a), int(b)) for a, b in spec.get("springs", [])]
+
+        for a, b in self.springs:
+            if not (0 <= a < len(self.bodies) and 0 <= b < len(self.bodies)): raise ValueError("spring joins a body the level does not have")
+
+        self.__compileStatics()
+
+    # STATIC COLLISION WORLD, the world space geometry of every static body computed once by the engine itself
+    def __compileStatics(self):
+        self.staticIndexes = [i for i, b in enumerate(self.bodies) if b["static"]]
+        count = len(self.staticIndexes)
+
+        self.vertices = np.zeros((count, BodyStore.maxVertices, 2))
+        self.vertexCount = np.zeros(count, dtype=np.int8)
+        self.axes = np.zeros((count, BodyStore.maxVertices, 2))
+        self.axisCount = np.zeros(count, dtype=np.int8)
+        self.aabbs = np.zeros((count, 4))
+
+        for k, i in enumerate(self.staticIndexes):
+            body = buildBody(self.bodies[i])
+            box = body.getAABB()
+            self.aabbs[k] = (box.minX, box.minY, box.maxX, box.maxY)
+            if body.shape.shapeType == ShapeType.CIRCLE: continue
+
+            verts, axes = body.getVertices(), body.getAxes()
+            self.vertexCount[k], self.axisCount[k] = len(verts), len(axes)
+            self.vertices[k, :len(verts)] = [(v.x, v.y) for v in verts]
+            self.axes[k, :len(axes)] = [(a.x, a.y) for a in axes]
+
+    # Static bodies come with their vertices, axes and AABB already there
+    def staticEntity(self, k: int) -> Entity:
+        entity = buildEntity(self.bodies[self.staticIndexes[k]])
+        body = entity.body
+
+        minX, minY, maxX, maxY = self.aabbs[k].tolist()
+        box = AABB.fromBounds(minX, minY, maxX, maxY)
+        if body.shape.shapeType == ShapeType.CIRCLE: body.primeTransform(None, [], box)
+        else:
+            vertices = [vec2(x, y) for x, y in self.vertices[k, :self.vertexCount[k]].tolist()]
+            axes = [vec2(x, y) for x, y in self.axes[k, :self.axisCount[k]].tolist()]
+            body.primeTransform(vertices, axes, box)
+
+        return entity
+
+    def staticEntities(self) -> dict[int, Entity]:
+        return {i: self.staticEntity(k) for k, i in enumerate(self.staticIndexes)}
+
+"""
+======================================================================================================
+LEVEL LIBRARY
+======================================================================================================
+"""
+
+class LevelLibrary:
+    cacheVersion = 1 # Bump when CompiledLevel changes so old cache files are ignored
+    __loaded: dict[str, LevelLibrary] = {}
+
+    def __init__(self, path: str = LEVELS_FILE, cacheDir: str = CACHE_DIR):
+        self.path = path
+        self.cacheDir = cacheDir
+
+        with open(path, "rb") as f: data = f.read()
+        key = hashlib.sha1(data + str(LevelLibrary.cacheVersion).encode()).hexdigest()[:16]
+
+        self.levels: dict[int, CompiledLevel] = self.__readCache(key)
+        if self.levels is None:
+            self.levels = LevelLibrary.compile(json.loads(data))
+            self.__writeCache(key)
+
+    # The library of each file is compiled once per process, and once per file version on disk
+    @staticmethod
+    def default(path: str = LEVELS_FILE) -> LevelLibrary:
+        library = LevelLibrary.__loaded.get(path)
+        if library is None: library = LevelLibrary.__loaded[path] = LevelLibrary(path)
+        return library
+
+    @staticmethod
+    def compile(definition: dict) -> dict[int, CompiledLevel]:
+        if definition.get("version") != 1: raise ValueError("unsupported levels file version " + str(definition.get("version")))
+
+        levels = {}
+        for spec in definition.get("levels", []):
+            level = CompiledLevel(spec)
+            if level.level in levels: raise ValueError("level " + str(level.level) + " is defined twice")
+            levels[level.level] = level
+        return levels
+
+    def level(self, number: int) -> CompiledLevel:
+        return self.levels.get(int(number))
+
+    def __cacheFile(self, key: str) -> str:
+        name = os.path.splitext(os.path.basename(self.path))[0]
+        return os.path.join(self.cacheDir, name + "-" + key + ".pickle")
+
+    def __readCache(self, key: str):
+        if self.cacheDir is None: return None
+        try:
+            with open(self.__cacheFile(key), "rb") as f: return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            return None
+
+    # A cache that cannot be written only means compiling again next time
+    def __writeCache(self, key: str):
+        if self.cacheDir is None: return
+        try:
+            os.makedirs(self.cacheDir, exist_ok=True)
+            temp = self.__cacheFile(key) + "." + str(os.getpid())
+            with open(temp, "wb") as f: pickle.dump(self.levels, f)
+            os.replace(temp, self.__cacheFile(key))
+        except OSError:
+            pass
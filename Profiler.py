@@ -0,0 +1,117 @@
+import math
+from collections import deque
+from pygame import Surface, font, draw
+
+"""
+======================================================================================================
+PHASE PROFILER
+======================================================================================================
+"""
+
+class PhaseProfiler:
+    phases = ("forces", "integrate", "broadphase", "narrowphase", "contactPoints", "solver", "sleep")
+
+    def __init__(self, window: int = 120):
+        if int(window) <= 0: raise ValueError("window must be greater than zero")
+
+        self.window = int(window) # Frames kept for the rolling stats
+        self.frames = 0
+        self.lastFrame: dict[str, float] = {}
+        self.__history: dict[str, deque] = {}
+        self.__font = None
+
+    # phaseTimes are the seconds each phase took during one World.update, total is the whole update
+    def record(self, phaseTimes: dict[str, float], total: float):
+        self.frames += 1
+        self.lastFrame = dict(phaseTimes)
+        self.lastFrame["total"] = total
+
+        for phase, seconds in self.lastFrame.items():
+            history = self.__history.get(phase)
+            if history is None:
+                history = self.__history[phase] = deque(maxlen=self.window)
+                # A phase that did not run in the older frames took no time in them
+                history.extend([0.0] * min(self.frames - 1, self.window - 1))
+            history.append(seconds)
+
+        for phase, history in self.__history.items():
+            if phase not in self.lastFrame: history.append(0.0)
+
+    def reset(self):
+        self.frames = 0
+        self.lastFrame = {}
+        self.__history.clear()
+
+    # GETTERS ===========================================================================
+
+    # Seconds per frame of every phase over the window, as {phase: {"last", "min", "mean", "p95"}}
+    def stats(self) -> dict[str, dict[str, float]]:
+        order = [p for p in self.phases if p in self.__history]
+        order += [p for p in self.__history if p not in self.phases and p != "total"]
+        if "total" in self.__history: order.append("total")
+
+        result = {}
+        for phase in order:
+            history = self.__history[phase]
+            values = sorted(history)
+            result[phase] = {
+                "last": history[-1],
+                "min": values[0],
+                "mean": sum(values) / len(values),
+                "p95": values[max(math.ceil(0.95 * len(values)) - 1, 0)],
+            }
+        return result
+
+    # METHODS ===========================================================================
+
+    # Returns the rect it covered
+    def draw(self, pantalla: Surface, pos: tuple[int, int] = (10, 75)):
+        if not font.get_init(): return None
+        if self.__font is None: self.__font = font.SysFont('Consolas, Courier New, monospace', 14)
+
+        lines = ["phase          mean   p95  (ms)"]
+        for phase, s in self.stats().items():
+            lines.append(phase.ljust(13) + format(s["mean"] * 1000, "6.2f") + format(s["p95"] * 1000, "6.2f"))
+
+        x, y = pos
+        lineHeight = self.__font.get_linesize()
+        area = draw.rect(pantalla, (255, 255, 255), (x - 4, y - 2, 230, lineHeight * len(lines) + 4))
+        for line in lines:
+            pantalla.blit(self.__font.render(line, False, (0, 0, 0)), (x, y))
+            y += lineHeight
+        return area
+
+"""
+======================================================================================================
+ENGINE COUNTERS
+======================================================================================================
+"""
+
+class EngineCounters:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.candidatePairs = 0   # Pairs the broadphase handed to the narrow phase
+        self.aabbTests = 0        # Box overlap tests made by the broadphase, tree nodes included
+        self.narrowTests = 0      # Pairs tested by the narrow phase
+        self.narrowHits = 0       # Pairs that were really colliding
+        self.satRejections: dict[int, int] = {} # Separating axis index -> pairs it rejected, axes of A go before the ones of B
+        self.oneContact = 0       # Manifolds with contactCount 1
+        self.twoContacts = 0      # Manifolds with contactCount 2
+        self.staticFriction = 0   # Friction impulses that stayed inside the static cone
+        self.dynamicFriction = 0  # Friction impulses clamped to the dynamic cone
+
+    def rejectedOnAxis(self, index: int, count: int = 1):
+        self.satRejections[index] = self.satRejections.get(index, 0) + count
+
+    def merge(self, other: "EngineCounters"):
+        for name, value in vars(other).items():
+            if name == "satRejections":
+                for index, count in value.items(): self.rejectedOnAxis(index, count)
+            else: setattr(self, name, getattr(self, name) + value)
+
+    def asDict(self) -> dict:
+        result = dict(vars(self))
+        result["satRejections"] = {str(i): result["satRejections"][i] for i in sorted(result["satRejections"])}
+        return result
@@ -0,0 +1,213 @@
+import math
+from pygame import Surface, Rect, draw
+from pygame.math import Vector2 as vec2
+from Rigidbody import Entity, ShapeType
+from World import World
+from Hud import Hud
+
+"""
+======================================================================================================
+SCENE RENDERER
+======================================================================================================
+"""
+
+class SceneRenderer:
+    margin = 4 # pixels around the circle of a body, for its 3 px outline
+    maxDirtyRects = 48 # Above this many the whole screen is drawn again, merging and clipping them costs more
+
+    # Draws a World keeping what does not move in a cached background, only the rects where something changed
+    # are drawn again and returned for pygame.display.update
+    def __init__(self, pantalla: Surface, hud: Hud = None, backgroundColor: tuple = (230, 230, 255)):
+        if not isinstance(pantalla, Surface): raise TypeError("pantalla argument must be a Surface type")
+        if hud is not None and not isinstance(hud, Hud): raise TypeError("hud argument must be a Hud type")
+
+        self.pantalla = pantalla
+        self.hud = hud # Drawn into the background, a widget is only drawn again when it looks different
+        self.backgroundColor = backgroundColor
+        self.screenRect = pantalla.get_rect()
+        self.scene = Surface(self.screenRect.size)      # Background colour, zones and static bodies
+        self.background = Surface(self.screenRect.size) # The scene with the HUD on top
+        self.rebuilds = 0 # Times the scene was drawn from scratch
+
+        self.__statics: list[Entity] = None # Static entities the scene was drawn with, None draws it again
+        self.__playableZone = None
+        self.__completionZone = None
+        self.__hudArea: Rect = None
+        self.__bodies: dict[int, tuple] = {}  # id(entity) -> (entity, pose, rect) as drawn last frame
+        self.__springs: dict[int, tuple] = {} # id(spring) -> (spring, ends, rect) as drawn last frame
+        self.__overlay: Rect = None # Profiler overlay of the last frame
+        self.__dirty: list[Rect] = []
+        self.__radius = {} # shape -> radius of the circle around it
+
+    # The scene is drawn again on the next frame, for changes to static bodies the renderer cannot see
+    def invalidate(self):
+        self.__statics = None
+
+    # Draws the frame and returns the rects of the screen that changed
+    def draw(self, world: World, alpha: float = 1.0) -> list[Rect]:
+        statics = [e for e in world.entityList if e.body.isStatic]
+        if statics != self.__statics or world.playableZone != self.__playableZone: self.__rebuild(world, statics)
+        elif world.completionZone != self.__completionZone: self.__moveCompletionZone(world)
+
+        if self.hud is not None:
+            for area in self.hud.changedAreas(): self.__repaint(area)
+            self.__hudArea = self.hud.bounds()
+
+        dirty, self.__dirty = self.__dirty, []
+        poseOf = self.__poses(world, alpha)
+
+        # BODIES, a body that moved leaves its old rect and takes the new one
+        bodies = {}
+        for e in world.entityList:
+            if e.body.isStatic: continue
+            pose = poseOf(e.body)
+            last = self.__bodies.get(id(e))
+            if last is not None and last[1] == pose: bodies[id(e)] = last
+            else:
+                rect = self.__bodyRect(e.body, pose)
+                if last is not None: dirty.append(last[2])
+                dirty.append(rect)
+                bodies[id(e)] = (e, pose, rect)
+        dirty += [last[2] for key, last in self.__bodies.items() if key not in bodies]
+        self.__bodies = bodies
+
+        springs = {}
+        for s in world.springList:
+            ends = (poseOf(s.bodyA)[:2], poseOf(s.bodyB)[:2])
+            last = self.__springs.get(id(s))
+            if last is not None and last[1] == ends: springs[id(s)] = last
+            else:
+                (xA, yA), (xB, yB) = ends
+                rect = Rect(math.floor(min(xA, xB)) - 2, math.floor(min(yA, yB)) - 2, abs(xA - xB) + 5, abs(yA - yB) + 5)
+                if last is not None: dirty.append(last[2])
+                dirty.append(rect)
+                springs[id(s)] = (s, ends, rect)
+        dirty += [last[2] for key, last in self.__springs.items() if key not in springs]
+        self.__springs = springs
+
+        showOverlay = world.showProfiler and world.profiler is not None
+        if self.__overlay is not None: dirty.append(self.__overlay)
+        self.__overlay = None
+
+        # DIRTY RECTS, each one is restored from the background and what overlaps it drawn again inside it
+        dirty = self.__merge(dirty) if len(dirty) <= SceneRenderer.maxDirtyRects else [self.screenRect.copy()]
+        bodyList = list(bodies.values())
+        bodyRects = [rect for _, _, rect in bodyList]
+        springList = list(springs.values())
+        springRects = [rect for _, _, rect in springList]
+        pantalla = self.pantalla
+
+        for region in dirty:
+            pantalla.set_clip(region)
+            pantalla.blit(self.background, region, region)
+
+            for i in region.collidelistall(bodyRects):
+                e, (x, y, rotation), _ = bodyList[i]
+                if alpha >= 1: e.draw(pantalla)
+                else: e.draw(pantalla, vec2(x, y), rotation)
+            for i in region.collidelistall(springRects):
+                s, (a, b), _ = springList[i]
+                s.draw(pantalla, a, b)
+
+            # The HUD goes over the bodies like before
+            if self.__hudArea is not None and region.colliderect(self.__hudArea): self.__drawHud(pantalla)
+        pantalla.set_clip(None)
+
+        if showOverlay:
+            self.__overlay = world.profiler.draw(pantalla)
+            if self.__overlay is not None: dirty.append(self.__overlay)
+
+        return dirty
+
+    # SCENE =============================================================================
+
+    def __rebuild(self, world: World, statics: list[Entity]):
+        self.__statics = statics
+        self.__playableZone = list(world.playableZone)
+        self.__completionZone = list(world.completionZone)
+        self.rebuilds += 1
+
+        self.__drawScene()
+        self.background.blit(self.scene, (0, 0))
+        self.__drawHud(self.background)
+
+        # Everything is drawn again, nothing of the last frame is left on the screen
+        self.__bodies.clear()
+        self.__springs.clear()
+        self.__overlay = None
+        self.__dirty = [self.screenRect.copy()]
+
+    # Levels 1 and 2 move their completion zone every frame, only its old and new rects are drawn again
+    def __moveCompletionZone(self, world: World):
+        region = Rect(self.__completionZone).union(Rect(world.completionZone)).inflate(2, 2)
+        self.__completionZone = list(world.completionZone)
+
+        self.scene.set_clip(region)
+        self.__drawScene()
+        self.scene.set_clip(None)
+        self.__repaint(region)
+
+    def __drawScene(self):
+        self.scene.fill(self.backgroundColor)
+        draw.rect(self.scene, (0, 150, 0), self.__completionZone)
+        draw.rect(self.scene, (255, 255, 120), self.__playableZone)
+        for e in self.__statics: e.draw(self.scene)
+
+    # Brings a region of the background up to date with the scene and the HUD, the screen gets it on the next frame
+    def __repaint(self, region: Rect):
+        region = region.clip(self.screenRect)
+        self.background.blit(self.scene, region, region)
+        self.background.set_clip(region)
+        self.__drawHud(self.background)
+        self.background.set_clip(None)
+        self.__dirty.append(region)
+
+    # HUD ===============================================================================
+
+    def __drawHud(self, surface: Surface):
+        if self.hud is not None: self.hud.draw(surface)
+
+    # BODIES ============================================================================
+
+    # Returns poseOf(body) -> (x, y, rotation) as the body is drawn, between its last two poses when alpha < 1
+    def __poses(self, world: World, alpha: float):
+        store = world.bodyStore
+        if alpha < 1: position, rotation = store.interpolatedPose(alpha)
+        else: position, rotation = store.position[:store.count], store.rotation[:store.count]
+        position, rotation = position.tolist(), rotation.tolist()
+
+        # Bodies added after the last update are not in the store yet
+        def poseOf(body) -> tuple[float, float, float]:
+            if body.store is not store:
+                p = body.position
+                return (p.x, p.y, body.rotation)
+            x, y = position[body.row]
+            return (x, y, rotation[body.row])
+
+        return poseOf
+
+    # Square around the circle that holds the body whatever its rotation
+    def __bodyRect(self, body, pose: tuple[float, float, float]) -> Rect:
+        shape = body.shape
+        radius = self.__radius.get(shape)
+        if radius is None:
+            if shape.shapeType == ShapeType.CIRCLE: radius = shape.radius
+            else: radius = max(v.length() for v in shape.localVertices())
+            self.__radius[shape] = radius
+
+        x, y, _ = pose
+        size = math.ceil(2 * radius) + 2 * SceneRenderer.margin + 1
+        return Rect(math.floor(x - radius) - SceneRenderer.margin, math.floor(y - radius) - SceneRenderer.margin, size, size)
+
+    def __merge(self, rects: list[Rect]) -> list[Rect]:
+        merged: list[Rect] = []
+        for rect in rects:
+            rect = rect.clip(self.screenRect)
+            if rect.width == 0 or rect.height == 0: continue
+
+            i = rect.collidelist(merged)
+            while i != -1:
+                rect.union_ip(merged.pop(i))
+                i = rect.collidelist(merged)
+            merged.append(rect)
+        return merged
@@ -0,0 +1,350 @@
+import os
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse, bisect, struct, sys
+import numpy as np
+from World import World
+from Snapshot import WorldSnapshot
+
+"""
+======================================================================================================
+REPLAY FORMAT
+======================================================================================================
+"""
+
+# A replay is a header followed by chunks, each one with its kind, the frame it belongs to and its length:
+#   KEYFRAME  a WorldSnapshot of the whole scene, every keyframeInterval frames and when an entity it does not have shows up
+#   DELTA     the entities present when they changed, the completion zone when it moved and the float32 pose of the bodies that moved
+#   INDEX     frame and file offset of every keyframe, written on close
+# A replay that was not closed has no index, the player finds its keyframes going over the chunks
+MAGIC = b"WRPL"
+VERSION = 1
+
+fileHeader = struct.Struct("<4sHI")   # magic, version, keyframeInterval
+chunkHeader = struct.Struct("<BIQ")   # kind, frame, payload length
+deltaHeader = struct.Struct("<BII")   # flags, present entities, moved bodies
+zoneFormat = struct.Struct("<4d")     # completionZone
+trailer = struct.Struct("<QI4s")      # index chunk offset, frames, magic
+
+KEYFRAME, DELTA, INDEX = 1, 2, 3
+PRESENT_CHANGED, ZONE_CHANGED = 1, 2
+
+"""
+======================================================================================================
+REPLAY RECORDER
+======================================================================================================
+"""
+
+class ReplayRecorder:
+    # Records world from its current state, frame 0, and one frame after every World.update until close
+    def __init__(self, world: World, file, keyframeInterval: int = 60):
+        if not isinstance(world, World): raise TypeError("world argument must be a World type")
+        if int(keyframeInterval) <= 0: raise ValueError("keyframeInterval must be greater than zero")
+
+        self.world = world
+        self.keyframeInterval = int(keyframeInterval)
+        self.frame = 0
+        self.keyframes: list[tuple[int, int]] = [] # (frame, file offset) of every keyframe written
+        self.bytesWritten = 0
+
+        self.__ownsFile = isinstance(file, (str, os.PathLike))
+        self.file = open(file, "wb") if self.__ownsFile else file
+
+        self.__entities = []  # Entities of the last keyframe, deltas refer to them by index
+        self.__indexOf: dict[int, int] = {}
+        self.__present = []   # entityList as it was recorded last
+        self.__position = None
+        self.__rotation = None
+        self.__zone = None
+
+        self.__write(fileHeader.pack(MAGIC, VERSION, self.keyframeInterval))
+        self.__writeKeyframe(self.__poses(None))
+        world.recorder = self
+
+    # Called by World.update, rows are the store rows of entityList when the world knows them
+    def record(self, rows: np.ndarray = None):
+        if self.file is None: return
+        self.frame += 1
+
+        world = self.world
+        entities = world.entityList
+        poses = self.__poses(rows)
+
+        flags = 0
+        parts = [b""]
+        if world.completionZone != self.__zone:
+            flags |= ZONE_CHANGED
+            self.__zone = list(world.completionZone)
+            parts.append(zoneFormat.pack(*self.__zone))
+
+        # Entities compare by identity, the list compare is one C loop
+        if entities != self.__present:
+            indexes = [self.__indexOf.get(id(e), -1) for e in entities]
+            if -1 in indexes or self.frame % self.keyframeInterval == 0: return self.__writeKeyframe(poses)
+
+            flags |= PRESENT_CHANGED
+            self.__present = list(entities)
+            parts.append(np.array(indexes, dtype="<i4").tobytes())
+        elif self.frame % self.keyframeInterval == 0: return self.__writeKeyframe(poses)
+
+        position, rotation = poses
+        if flags & PRESENT_CHANGED: moved = np.arange(len(entities), dtype="<u4")
+        else: moved = np.flatnonzero((position != self.__position).any(axis=1) | (rotation != self.__rotation)).astype("<u4")
+        self.__position, self.__rotation = position, rotation
+
+        pose = np.empty((len(moved), 3), dtype="<f4")
+        pose[:, :2] = position[moved]
+        pose[:, 2] = rotation[moved]
+        parts.append(moved.tobytes())
+        parts.append(pose.tobytes())
+
+        parts[0] = deltaHeader.pack(flags, len(entities) if flags & PRESENT_CHANGED else 0, len(moved))
+        self.__writeChunk(DELTA, b"".join(parts))
+
+    # Writes the keyframe index, the replay is complete after this
+    def close(self):
+        if self.file is None: return
+        if self.world.recorder is self: self.world.recorder = None
+
+        frames = np.array([f for f, _ in self.keyframes], dtype="<u4")
+        offsets = np.array([o for _, o in self.keyframes], dtype="<u8")
+        indexOffset = self.bytesWritten
+        self.__writeChunk(INDEX, frames.tobytes() + offsets.tobytes())
+        self.__write(trailer.pack(indexOffset, self.frame + 1, MAGIC))
+
+        if self.__ownsFile: self.file.close()
+        else: self.file.flush()
+        self.file = None
+
+    # Positions and rotations of entityList, one gather from the store when every body is in it
+    def __poses(self, rows: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        bodies = [e.body for e in self.world.entityList]
+        store = self.world.bodyStore
+
+        if rows is None or len(rows) != len(bodies):
+            if not all(b.store is store for b in bodies):
+                position = np.array([tuple(b.position) for b in bodies], dtype=float).reshape(-1, 2)
+                return position, np.array([b.rotation for b in bodies], dtype=float)
+            rows = store.rowsOf(bodies)
+
+        return store.position[rows], store.rotation[rows]
+
+    def __writeKeyframe(self, poses: tuple[np.ndarray, np.ndarray]):
+        world = self.world
+        snapshot = WorldSnapshot.capture(world)
+
+        self.keyframes.append((self.frame, self.bytesWritten))
+        self.__writeChunk(KEYFRAME, snapshot.toBytes())
+        self.file.flush() # Everything up to a keyframe can be played even if the recording never gets closed
+
+        self.__entities = snapshot.entities
+        self.__indexOf = {id(e): i for i, e in enumerate(snapshot.entities)}
+        self.__present = list(world.entityList)
+        self.__position, self.__rotation = poses
+        self.__zone = list(world.completionZone)
+
+    def __writeChunk(self, kind: int, payload: bytes):
+        self.__write(chunkHeader.pack(kind, self.frame, len(payload)))
+        self.__write(payload)
+
+    def __write(self, data: bytes):
+        self.file.write(data)
+        self.bytesWritten += len(data)
+
+"""
+======================================================================================================
+REPLAY PLAYER
+======================================================================================================
+"""
+
+class ReplayPlayer:
+    # Plays a replay into a world of its own that is never updated, showing a frame costs no physics
+    def __init__(self, file):
+        self.__ownsFile = isinstance(file, (str, os.PathLike))
+        self.file = open(file, "rb") if self.__ownsFile else file
+
+        header = self.file.read(fileHeader.size)
+        if len(header) < fileHeader.size: raise ValueError("data is too short to be a replay")
+        fileMagic, fileVersion, self.keyframeInterval = fileHeader.unpack(header)
+        if fileMagic != MAGIC: raise ValueError("data is not a replay")
+        if fileVersion != VERSION: raise ValueError("unsupported replay version " + str(fileVersion))
+
+        self.keyframeFrames, self.__keyframeOffsets, self.frameCount = self.__readIndex()
+        if not self.keyframeFrames: raise ValueError("replay has no keyframes")
+
+        self.world = World()
+        self.frame = -1
+        self.__entities = []
+        self.__bodies = []   # Bodies of world.entityList, the ones deltas move
+        self.__next = 0      # File offset of the chunk after the current frame
+        self.seek(0)
+
+    # GETTERS ===========================================================================
+
+    @property
+    def lastFrame(self) -> int: return self.frameCount - 1
+
+    # METHODS ===========================================================================
+
+    # Shows the given frame, from the keyframe before it unless it only has to go forward from the current one
+    def seek(self, frame: int):
+        frame = min(max(int(frame), 0), self.lastFrame)
+        k = bisect.bisect_right(self.keyframeFrames, frame) - 1
+
+        if not (self.keyframeFrames[k] <= self.frame <= frame): self.__loadKeyframe(k)
+        while self.frame < frame and self.__readChunk(): pass
+
+    # Advances count frames, False once the replay is over
+    def step(self, count: int = 1) -> bool:
+        if self.frame >= self.lastFrame: return False
+        self.seek(self.frame + int(count))
+        return True
+
+    def draw(self, pantalla):
+        self.world.drawEntities(pantalla)
+
+    def close(self):
+        if self.__ownsFile and self.file is not None: self.file.close()
+        self.file = None
+
+    # The index of a closed replay, or the keyframes found going over the chunks of one that was not
+    def __readIndex(self) -> tuple[list[int], list[int], int]:
+        size = self.file.seek(0, os.SEEK_END)
+
+        if size >= fileHeader.size + trailer.size:
+            self.file.seek(size - trailer.size)
+            indexOffset, frames, trailerMagic = trailer.unpack(self.file.read(trailer.size))
+            if trailerMagic == MAGIC and indexOffset < size:
+                self.file.seek(indexOffset)
+                kind, _, length = chunkHeader.unpack(self.file.read(chunkHeader.size))
+                if kind == INDEX:
+                    payload = self.file.read(length)
+                    count = length // 12
+                    keyframeFrames = np.frombuffer(payload, dtype="<u4", count=count).tolist()
+                    offsets = np.frombuffer(payload, dtype="<u8", count=count, offset=count * 4).tolist()
+                    return keyframeFrames, offsets, frames
+
+        keyframeFrames, offsets, lastFrame = [], [], -1
+        offset = fileHeader.size
+        while offset + chunkHeader.size <= size:
+            self.file.seek(offset)
+            kind, frame, length = chunkHeader.unpack(self.file.read(chunkHeader.size))
+            if kind == INDEX or offset + chunkHeader.size + length > size: break # A chunk cut in half ends the replay
+
+            if kind == KEYFRAME:
+                keyframeFrames.append(frame)
+                offsets.append(offset)
+            lastFrame = frame
+            offset += chunkHeader.size + length
+
+        return keyframeFrames, offsets, lastFrame + 1
+
+    def __loadKeyframe(self, k: int):
+        self.__next = self.__keyframeOffsets[k]
+        self.__readChunk()
+
+    # Applies the next chunk to the world, False when there is none
+    def __readChunk(self) -> bool:
+        self.file.seek(self.__next)
+        header = self.file.read(chunkHeader.size)
+        if len(header) < chunkHeader.size: return False
+
+        kind, frame, length = chunkHeader.unpack(header)
+        if kind == INDEX: return False
+        payload = self.file.read(length)
+        if len(payload) < length: return False
+
+        if kind == KEYFRAME:
+            snapshot = WorldSnapshot.fromBytes(payload)
+            snapshot.restore(self.world)
+            self.__entities = snapshot.entities
+            self.__bodies = [e.body for e in self.world.entityList]
+        else:
+            self.__applyDelta(payload)
+
+        self.frame = frame
+        self.__next += chunkHeader.size + length
+        return True
+
+    def __applyDelta(self, payload: bytes):
+        world = self.world
+        flags, presentCount, movedCount = deltaHeader.unpack_from(payload)
+        offset = deltaHeader.size
+
+        if flags & ZONE_CHANGED:
+            world.completionZone = list(zoneFormat.unpack_from(payload, offset))
+            offset += zoneFormat.size
+
+        if flags & PRESENT_CHANGED:
+            indexes = np.frombuffer(payload, dtype="<i4", count=presentCount, offset=offset)
+            offset += indexes.nbytes
+            world.entityList[:] = [self.__entities[i] for i in indexes.tolist()]
+            self.__bodies = [e.body for e in world.entityList]
+
+        moved = np.frombuffer(payload, dtype="<u4", count=movedCount, offset=offset)
+        offset += moved.nbytes
+        pose = np.frombuffer(payload, dtype="<f4", count=movedCount * 3, offset=offset).reshape(-1, 3)
+
+        bodies = self.__bodies
+        for i, (x, y, rotation) in zip(moved.tolist(), pose.tolist()):
+            body = bodies[i]
+            body.position = (x, y)
+            body.rotation = rotation
+
+"""
+======================================================================================================
+COMMAND LINE
+======================================================================================================
+"""
+
+def parseArgs(argv: list[str]):
+    parser = argparse.ArgumentParser(description="Plays a replay recorded with ReplayRecorder or Headless.py --record")
+    parser.add_argument("file")
+    parser.add_argument("--fps", type=float, default=60, help="frames shown per second")
+    parser.add_argument("--frame", type=int, default=0, help="frame to start from")
+    return parser.parse_args(argv)
+
+# Space pauses, left and right step one frame, up and down jump a keyframe interval, home and end go to the ends
+def main(argv: list[str] = None):
+    import pygame
+
+    args = parseArgs(sys.argv[1:] if argv is None else argv)
+    player = ReplayPlayer(args.file)
+    player.seek(args.frame)
+
+    pygame.display.init()
+    pygame.font.init()
+    pantalla = pygame.display.set_mode((1000, 500))
+    pygame.display.set_caption('Replay ' + os.path.basename(args.file))
+    my_font = pygame.font.SysFont('Arial', 20, True)
+
+    clock = pygame.time.Clock()
+    paused = False
+    jumps = {pygame.K_LEFT: -1, pygame.K_RIGHT: 1, pygame.K_DOWN: -player.keyframeInterval, pygame.K_UP: player.keyframeInterval}
+
+    while True:
+        clock.tick(args.fps)
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                player.close()
+                pygame.quit()
+                return
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_SPACE: paused = not paused
+                elif event.key in jumps:
+                    paused = True
+                    player.seek(player.frame + jumps[event.key])
+                elif event.key == pygame.K_HOME: player.seek(0)
+                elif event.key == pygame.K_END: player.seek(player.lastFrame)
+
+        if not paused and not player.step(): paused = True
+
+        pantalla.fill((230, 230, 255))
+        player.draw(pantalla)
+        text = "frame " + str(player.frame) + " / " + str(player.lastFrame) + ("  paused" if paused else "")
+        pantalla.blit(my_font.render(text, True, (0, 0, 0)), (10, 10))
+        pygame.display.update()
+
+if __name__ == "__main__":
+    main()
@@ -27,19 +27,37 @@ AABB CLASS
 """
 
 class AABB:
+    # Four plain floats, the engine reads and writes them directly
+    __slots__ = ("minX", "minY", "maxX", "maxY")
+
     def __init__(self, min: vec2, max:vec2):
-        self.__min = vec2(min)
-        self.__max = vec2(max)
+        min, max = vec2(min), vec2(max)
+        self.minX, self.minY = min.x, min.y
+        self.maxX, self.maxY = max.x, max.y
 
+    # min and max are copies, changing them does not move the box
     @property
-    def min(self): return self.__min
+    def min(self): return vec2(self.minX, self.minY)
     @property
-    def max(self): return self.__max
+    def max(self): return vec2(self.maxX, self.maxY)
 
     @min.setter
-    def min(self, newVal): self.__min = vec2(newVal)
+    def min(self, newVal): 
+        newVal = vec2(newVal)
+        self.minX, self.minY = newVal.x, newVal.y
     @max.setter
-    def max(self, newVal): self.__max = vec2(newVal)
+    def max(self, newVal): 
+        newVal = vec2(newVal)
+        self.maxX, self.maxY = newVal.x, newVal.y
+
+    def setBounds(self, minX: float, minY: float, maxX: float, maxY: float):
+        self.minX, self.minY, self.maxX, self.maxY = minX, minY, maxX, maxY
+
+    @staticmethod
+    def fromBounds(minX: float, minY: float, maxX: float, maxY: float) -> AABB:
+        box = AABB.__new__(AABB)
+        box.minX, box.minY, box.maxX, box.maxY = minX, minY, maxX, maxY
+        return box
 
 """
 ======================================================================================================
@@ -48,11 +66,17 @@ SHAPE CLASS
 """
 
 class Shape:
+    __slots__ = ("__radius", "__width", "__height", "__shapeType", "__template", "__axisTemplate", "__frozen")
+    __interned: dict[Shape, Shape] = {}
+
     def __init__(self, shape: ShapeType | Shape):
         self.__radius = None
         self.__width = None
         self.__height = None
         self.__shapeType = None
+        self.__template = None
+        self.__axisTemplate = None
+        self.__frozen = False
 
         if isinstance(shape, ShapeType): 
             self.__shapeType = shape
@@ -65,12 +89,18 @@ class Shape:
 
     def __eq__(self, obj: object):
         if isinstance(obj, Shape):
+            if self.__shapeType != obj.shapeType: return False
+
             if self.__shapeType == ShapeType.CIRCLE:
                 return self.radius == obj.radius
             else:
                 return self.height == obj.height and self.width == obj.width
         
         return False
+
+    def __hash__(self):
+        if self.__shapeType == ShapeType.CIRCLE: return hash((self.__shapeType, self.__radius))
+        return hash((self.__shapeType, self.__width, self.__height))
     
     # GETTERS ===========================================================================
 
@@ -82,17 +112,103 @@ class Shape:
     def height(self): return self.__height
     @property
     def shapeType(self): return self.__shapeType
+    @property
+    def isInterned(self): return self.__frozen
+    # Vertices around the shape center before any rotation as (x, y) tuples, built once and never changed
+    @property
+    def vertexTemplate(self) -> tuple[tuple[float, float], ...]:
+        if self.__template is None: self.__template = tuple((v.x, v.y) for v in self.__buildVertices())
+        return self.__template
+    # Unit edge normals around the shape center, parallel edges give a single axis so a box only has 2
+    @property
+    def axisTemplate(self) -> tuple[tuple[float, float], ...]:
+        if self.__axisTemplate is None: self.__axisTemplate = self.__buildAxes()
+        return self.__axisTemplate
 
     # SETTERS ===========================================================================
 
     @radius.setter
-    def radius(self, newVal): self.__radius = int(newVal)
+    def radius(self, newVal): 
+        self.__checkMutable()
+        self.__radius = int(newVal)
     @width.setter
-    def width(self, newVal): self.__width = int(newVal)
+    def width(self, newVal): 
+        self.__checkMutable()
+        self.__width = int(newVal)
+        self.__template = None
+        self.__axisTemplate = None
     @height.setter
-    def height(self, newVal): self.__height = int(newVal)
+    def height(self, newVal): 
+        self.__checkMutable()
+        self.__height = int(newVal)
+        self.__template = None
+        self.__axisTemplate = None
     @shapeType.setter
-    def shapeType(self, newVal): self.__shapeType = ShapeType(newVal)
+    def shapeType(self, newVal): 
+        self.__checkMutable()
+        self.__shapeType = ShapeType(newVal)
+        self.__template = None
+        self.__axisTemplate = None
+
+    def __checkMutable(self):
+        if self.__frozen: raise TypeError("interned shapes are shared by many bodies and cannot be changed, use a new Shape")
+
+    # METHODS ===========================================================================
+
+    # The shared Shape equal to the given one, bodies with the same shape use the same template
+    @staticmethod
+    def intern(shape: Shape) -> Shape:
+        if not isinstance(shape, Shape): raise TypeError("shape argument must be a Shape type")
+        if shape.isInterned: return shape
+
+        interned = Shape.__interned.get(shape)
+        if interned is None:
+            interned = Shape(shape)
+            interned.vertexTemplate # Built while it can still be written
+            interned.axisTemplate
+            interned.__frozen = True
+            Shape.__interned[interned] = interned
+
+        return interned
+
+    def localVertices(self) -> list[vec2]:
+        return [vec2(x, y) for x, y in self.vertexTemplate]
+
+    def __buildAxes(self) -> tuple[tuple[float, float], ...]:
+        verts = self.vertexTemplate
+        axes = []
+
+        for i in range(len(verts)):
+            x1, y1 = verts[i]
+            x2, y2 = verts[(i + 1) % len(verts)]
+            axis = vec2(-(y2 - y1), x2 - x1).normalize()
+
+            # Opposite sides project the same, SAT only needs the axis once
+            if any(abs(axis.x * y - axis.y * x) < 1e-9 for x, y in axes): continue
+            axes.append((axis.x, axis.y))
+
+        return tuple(axes)
+
+    def __buildVertices(self) -> list[vec2]:
+        if self.__shapeType == ShapeType.BOX:
+            left = -self.__width / 2
+            right = left + self.__width
+            top = -self.__height / 2
+            bottom = top + self.__height
+
+            return [vec2(left, top), vec2(right, top), vec2(right, bottom), vec2(left, bottom)]
+        elif self.__shapeType == ShapeType.TRIANGLE:
+            left = -self.__width / 2
+            right = left + self.__width
+            top = -self.__height / 3 * 2
+            bottom = top + self.__height
+
+            return [vec2(0, top), vec2(right, bottom), vec2(left, bottom)]
+        elif self.__shapeType == ShapeType.PENTAGON:
+            top = -self.__height / 2
+
+            return [vec2(0, top).rotate(72 * x) for x in range(5)]
+        else: return []
 
     # CREATORS ===========================================================================
 
@@ -141,6 +257,11 @@ RIGIDBODY CLASS
 """
 
 class Rigidbody:
+    __slots__ = ("__position", "__velocity", "__rotation", "__angularVelocity", "__rotationalInertia", "__staticFriction",
+                 "__dynamicFriction", "__force", "__mass", "__restitution", "__isStatic", "__shape", "__vertices", "__AABB",
+                 "__verticesVersion", "__AABBVersion", "__sinCosRotation", "__sinCos", "__axes", "__axesRotation",
+                 "__store", "__row", "__transformVersion", "__awake")
+
     def __init__(self, vecPos: vec2, mass: float, restitution: float, shape: Shape, isStatic: bool):
         if float(mass) <= 0: raise ValueError("mass must be greater than zero")
         if float(restitution) < 0: raise ValueError("restitution must be greater or equal than zero")
@@ -161,23 +282,41 @@ class Rigidbody:
         self.__restitution = float(restitution)
         self.__isStatic = bool(isStatic)
 
-        self.__shape = Shape(shape)
+        self.__shape = Shape.intern(shape)
 
         self.__vertices = []
-        self.__AABB = []
-        self.__updatedVertices = False
-        self.__updatedAABB = False
+        self.__AABB = None
+        self.__verticesVersion = -1
+        self.__AABBVersion = -1
+        self.__sinCosRotation = 0.0
+        self.__sinCos = (0.0, 1.0)
+        self.__axes = []
+        self.__axesRotation = None # Axes only depend on the rotation, moving the body keeps them
+
+        # While the body belongs to a BodyStore its state lives in row self.__row of the store arrays
+        self.__store = None
+        self.__row = -1
+        self.__transformVersion = 0
+        self.__awake = True
 
     # GETTERS ===========================================================================  
 
     @property
-    def position(self): return self.__position
+    def position(self): 
+        if self.__store is None: return self.__position
+        return self.__readVec(self.__store.position)
     @property
-    def velocity(self): return self.__velocity
+    def velocity(self): 
+        if self.__store is None: return self.__velocity
+        return self.__readVec(self.__store.velocity)
     @property
-    def rotation(self): return self.__rotation
+    def rotation(self): 
+        if self.__store is None: return self.__rotation
+        return self.__store.rotation.item(self.__row)
     @property
-    def angularVelocity(self): return self.__angularVelocity
+    def angularVelocity(self): 
+        if self.__store is None: return self.__angularVelocity
+        return self.__store.angularVelocity.item(self.__row)
     @property
     def rotationalInertia(self): return self.__rotationalInertia
     @property
@@ -185,7 +324,9 @@ class Rigidbody:
     @property
     def dynamicFriction(self): return self.__dynamicFriction
     @property
-    def force(self): return self.__force
+    def force(self): 
+        if self.__store is None: return self.__force
+        return self.__readVec(self.__store.force)
     @property
     def isStatic(self): return self.__isStatic
     @property 
@@ -194,75 +335,85 @@ class Rigidbody:
     def mass(self): return self.__mass
     @property
     def restitution(self): return self.__restitution
+    @property
+    def invMass(self): return 0.0 if self.__isStatic else 1 / self.__mass
+    @property
+    def invInertia(self): return 0.0 if self.__isStatic else 1 / self.__rotationalInertia
+    @property
+    def isSleeping(self):
+        if self.__store is None: return not self.__awake
+        return not self.__store.awake.item(self.__row)
+    @property
+    def isInert(self): return self.__isStatic or self.isSleeping # Static or sleeping, never moves on its own
+    @property
+    def store(self): return self.__store
+    @property
+    def row(self): return self.__row
+    @property
+    def transformVersion(self):
+        if self.__store is None: return self.__transformVersion
+        return self.__store.transformVersion.item(self.__row)
+
+    # Sine and cosine of the rotation, only recomputed when the rotation itself changed
+    def __rotationSinCos(self) -> tuple[float, float]:
+        rotation = self.rotation
+        if rotation != self.__sinCosRotation:
+            radians = math.radians(rotation)
+            self.__sinCos = (math.sin(radians), math.cos(radians))
+            self.__sinCosRotation = rotation
+        return self.__sinCos
+
+    def __readVec(self, array) -> vec2:
+        return vec2(array.item(self.__row, 0), array.item(self.__row, 1))
 
     def getVertices(self) -> list[vec2]:
-        if self.__updatedVertices: return self.__vertices
-
-        if self.__shape.shapeType == ShapeType.BOX:
-            left = -self.__shape.width / 2
-            right = left + self.__shape.width
-            top = -self.__shape.height / 2
-            bottom = top + self.__shape.height
+        version = self.transformVersion
+        if self.__verticesVersion == version: return self.__vertices
 
-            vs = [vec2(left, top), vec2(right, top), vec2(right, bottom), vec2(left, bottom)]
+        if self.__shape.shapeType == ShapeType.CIRCLE: 
+            print("A circle has no vertices")
+            return
 
-            ret = [self.position + v.rotate(self.rotation) for v in vs]
+        px, py = self.position
+        sin, cos = self.__rotationSinCos()
+        ret = [vec2(x * cos - y * sin + px, x * sin + y * cos + py) for x, y in self.__shape.vertexTemplate]
 
-            self.__vertices = ret
-            self.__updatedVertices = True
+        self.__vertices = ret
+        self.__verticesVersion = version
 
-            return ret
-        elif self.__shape.shapeType == ShapeType.TRIANGLE:
-            left = -self.__shape.width / 2
-            right = left + self.__shape.width
-            top = -self.__shape.height / 3 * 2
-            bottom = top + self.__shape.height
-
-            vs = [vec2(0, top), vec2(right, bottom), vec2(left, bottom)]
-
-            ret = [self.position + v.rotate(self.rotation) for v in vs]
-
-            self.__vertices = ret
-            self.__updatedVertices = True
-
-            return ret
-        elif self.__shape.shapeType == ShapeType.PENTAGON:
-            top = -self.__shape.height / 2
-
-            vs = [vec2(0, top).rotate(72 * x) for x in range(5)]
+        return ret
 
-            ret = [self.position + v.rotate(self.rotation) for v in vs]
+    # Unit edge normals in world space, the SAT axes of the body
+    def getAxes(self) -> list[vec2]:
+        rotation = self.rotation
+        if self.__axesRotation == rotation: return self.__axes
 
-            self.__vertices = ret
-            self.__updatedVertices = True
+        sin, cos = self.__rotationSinCos()
+        self.__axes = [vec2(x * cos - y * sin, x * sin + y * cos) for x, y in self.__shape.axisTemplate]
+        self.__axesRotation = rotation
 
-            return ret
-        else: print("A circle has no vertices")
+        return self.__axes
 
     def getAABB(self) -> AABB:
-        if self.__updatedAABB: return self.__AABB
+        version = self.transformVersion
+        if self.__AABBVersion == version: return self.__AABB
 
         if self.__shape.shapeType == ShapeType.CIRCLE:
-            minX = self.position.x - self.shape.radius
-            minY = self.position.y - self.shape.radius
-            maxX = self.position.x + self.shape.radius
-            maxY = self.position.y + self.shape.radius
+            position, radius = self.position, self.__shape.radius
+            minX = position.x - radius
+            minY = position.y - radius
+            maxX = position.x + radius
+            maxY = position.y + radius
         else:
-            minX = float('inf')
-            minY = float('inf')
-            maxX = float('-inf')
-            maxY = float('-inf')
-
             verts = self.getVertices()
-            for v in verts:
-                if v.x < minX: minX = v.x
-                if v.x > maxX: maxX = v.x
-                if v.y < minY: minY = v.y
-                if v.y > maxY: maxY = v.y
+            xs = [v.x for v in verts]
+            ys = [v.y for v in verts]
+            minX, maxX = min(xs), max(xs)
+            minY, maxY = min(ys), max(ys)
 
-        ret = AABB(vec2(minX, minY), vec2(maxX, maxY))
+        ret = AABB.fromBounds(minX, minY, maxX, maxY)
         self.__AABB = ret
-        self.__updatedAABB = True
+        self.__AABBVersion = version
 
         return ret
 
@@ -270,42 +421,168 @@ class Rigidbody:
 
     @position.setter
     def position(self, newVal): 
-        self.__position = vec2(newVal)
-        self.__updatedVertices = False
-        self.__updatedAABB = False
+        newVal = vec2(newVal)
+        if self.__store is None: 
+            self.__position = newVal
+            self.__transformVersion += 1
+        else:
+            self.__writeVec(self.__store.position, newVal)
+            self.__store.transformVersion[self.__row] += 1
 
     @velocity.setter
-    def velocity(self, newVal): self.__velocity = vec2(newVal)
+    def velocity(self, newVal): 
+        newVal = vec2(newVal)
+        if newVal != vec2() and self.isSleeping: self.wakeUp()
+        if self.__store is None: self.__velocity = newVal
+        else: self.__writeVec(self.__store.velocity, newVal)
 
     @rotation.setter
     def rotation(self, newVal):
-        self.__rotation = float(newVal)
-        self.__updatedVertices = False
-        self.__updatedAABB = False
+        if self.__store is None: 
+            self.__rotation = float(newVal)
+            self.__transformVersion += 1
+        else:
+            self.__store.rotation[self.__row] = float(newVal)
+            self.__store.transformVersion[self.__row] += 1
 
     @angularVelocity.setter
-    def angularVelocity(self, newVal): self.__angularVelocity = float(newVal)
+    def angularVelocity(self, newVal): 
+        if float(newVal) != 0 and self.isSleeping: self.wakeUp()
+        if self.__store is None: self.__angularVelocity = float(newVal)
+        else: self.__store.angularVelocity[self.__row] = float(newVal)
+
     @force.setter
-    def force(self, newVal): self.__force = vec2(newVal)
+    def force(self, newVal): 
+        newVal = vec2(newVal)
+        if self.__store is None: self.__force = newVal
+        else: self.__writeVec(self.__store.force, newVal)
+
     @isStatic.setter
-    def isStatic(self, newVal): self.__isStatic = bool(newVal)
+    def isStatic(self, newVal): 
+        self.__isStatic = bool(newVal)
+        self.__writeBodyRow()
 
     @shape.setter
     def shape(self, newVal):
-        self.__shape = Shape(newVal)
+        self.__shape = Shape.intern(newVal)
         self.__rotationalInertia = getRotationalInertia(self.mass, self.shape)
+        self.__verticesVersion = -1
+        self.__AABBVersion = -1
+        self.__axesRotation = None
+        self.__writeBodyRow()
 
     @mass.setter
     def mass(self, newVal):
         if float(newVal) <= 0: raise ValueError("mass must be greater than zero")
         self.__mass = float(newVal)
         self.__rotationalInertia = getRotationalInertia(self.mass, self.shape)
+        self.__writeBodyRow()
 
     @restitution.setter
     def restitution(self, newVal):
         if float(newVal) < 0: raise ValueError("restitution must be greater or equal than zero")
         self.__restitution = float(newVal)
 
+    # ENGINE FAST PATHS, no vec2 is made and nothing is validated
+
+    def translate(self, dx: float, dy: float):
+        # A body outside a store gets a new vec2, someone may be holding the old one
+        if self.__store is None:
+            self.__position = vec2(self.__position.x + dx, self.__position.y + dy)
+            self.__transformVersion += 1
+        else:
+            store, row = self.__store, self.__row
+            store.position[row, 0] += dx
+            store.position[row, 1] += dy
+            store.transformVersion[row] += 1
+
+    def setMotion(self, vx: float, vy: float, angularVelocity: float):
+        if (vx or vy or angularVelocity) and self.isSleeping: self.wakeUp()
+        if self.__store is None:
+            self.__velocity = vec2(vx, vy)
+            self.__angularVelocity = angularVelocity
+        else:
+            store, row = self.__store, self.__row
+            store.velocity[row] = (vx, vy)
+            store.angularVelocity[row] = angularVelocity
+
+    # Hands the body the world space vertices, axes and AABB of its current pose, computed somewhere else
+    # (like a compiled level), so they are not computed again until the body moves
+    def primeTransform(self, vertices: list[vec2], axes: list[vec2], box: AABB):
+        version = self.transformVersion
+        self.__vertices = vertices
+        self.__verticesVersion = version
+        self.__axes = axes
+        self.__axesRotation = self.rotation
+        self.__AABB = box
+        self.__AABBVersion = version
+
+    def __writeVec(self, array, newVal: vec2):
+        array[self.__row, 0] = newVal.x
+        array[self.__row, 1] = newVal.y
+
+    def __writeBodyRow(self):
+        if self.__store is None: return
+        self.__store.mass[self.__row] = self.__mass
+        self.__store.invMass[self.__row] = self.invMass
+        self.__store.invInertia[self.__row] = self.invInertia
+        self.__store.shapeType[self.__row] = self.__shape.shapeType.value
+        self.__store.radius[self.__row] = self.__shape.radius if self.__shape.shapeType == ShapeType.CIRCLE else 0
+
+        # Padded with copies of the first vertex so batched projections are not affected
+        local = self.__shape.localVertices()
+        self.__store.vertexCount[self.__row] = len(local)
+        for i in range(self.__store.maxVertices):
+            v = local[i] if i < len(local) else (local[0] if local else vec2())
+            self.__store.localVertices[self.__row, i] = (v.x, v.y)
+
+        axes = self.__shape.axisTemplate
+        self.__store.axisCount[self.__row] = len(axes)
+        for i in range(self.__store.maxVertices):
+            self.__store.localAxes[self.__row, i] = axes[i] if i < len(axes) else (0, 0)
+
+    # BODY STORE ========================================================================
+
+    def bindStore(self, store, row: int):
+        # Moves the local state into the store row, from now on the properties read and write the row
+        self.__store = None
+        position, velocity, force = self.__position, self.__velocity, self.__force
+
+        store.position[row] = (position.x, position.y)
+        store.velocity[row] = (velocity.x, velocity.y)
+        store.force[row] = (force.x, force.y)
+        store.rotation[row] = self.__rotation
+        store.angularVelocity[row] = self.__angularVelocity
+        store.transformVersion[row] = self.__transformVersion
+        store.awake[row] = self.__awake
+        store.sleepTime[row] = 0
+        store.islandId[row] = -1
+
+        self.__store = store
+        self.__row = int(row)
+        self.__writeBodyRow()
+
+        # The row has them now, unbindStore makes them again
+        self.__position = self.__velocity = self.__force = None
+
+    def unbindStore(self):
+        if self.__store is None: return
+
+        # Copies the row back so the body keeps its state once out of the store
+        self.__position = self.position
+        self.__velocity = self.velocity
+        self.__force = self.force
+        self.__rotation = self.rotation
+        self.__angularVelocity = self.angularVelocity
+        self.__transformVersion = self.transformVersion
+        self.__awake = not self.isSleeping
+
+        self.__store = None
+        self.__row = -1
+
+    def moveRow(self, row: int):
+        self.__row = int(row)
+
     # METHODS ===========================================================================
 
     def update(self, deltaTime: float):
@@ -320,7 +597,29 @@ class Rigidbody:
         self.force = vec2() # Reset force
 
     def applyForce(self, vecForce: vec2):
-        self.force += vec2(vecForce)
+        vecForce = vec2(vecForce)
+        if vecForce != vec2() and self.isSleeping: self.wakeUp()
+        self.force += vecForce
+
+    # SLEEPING ==========================================================================
+
+    def wakeUp(self):
+        if self.__store is None: 
+            self.__awake = True
+            return
+
+        self.__store.awake[self.__row] = True
+        self.__store.sleepTime[self.__row] = 0
+
+    def sleep(self):
+        if self.__isStatic: return
+
+        self.velocity = vec2()
+        self.angularVelocity = 0
+        self.force = vec2()
+
+        if self.__store is None: self.__awake = False
+        else: self.__store.awake[self.__row] = False
 
 """
 ======================================================================================================
@@ -336,13 +635,18 @@ class Entity:
         self.body = body
         self.color = color
 
-    def draw(self, pantalla: Surface):
+    # position and rotation draw the body somewhere else than where it is, like between two fixed steps
+    def draw(self, pantalla: Surface, position: vec2 = None, rotation: float = None):
+        atBody = position is None and rotation is None
+        if position is None: position = self.body.position
+        if rotation is None: rotation = self.body.rotation
+
         if self.body.shape.shapeType == ShapeType.CIRCLE:
-            draw.circle(pantalla, self.color, self.body.position, self.body.shape.radius)
-            draw.circle(pantalla, (0, 0, 0), self.body.position, self.body.shape.radius, 3)
-            draw.line(pantalla, (0, 0, 0), self.body.position, self.body.position + vec2(self.body.shape.radius, 0).rotate(self.body.rotation), 2)
+            draw.circle(pantalla, self.color, position, self.body.shape.radius)
+            draw.circle(pantalla, (0, 0, 0), position, self.body.shape.radius, 3)
+            draw.line(pantalla, (0, 0, 0), position, position + vec2(self.body.shape.radius, 0).rotate(rotation), 2)
         else:
-            verts = self.body.getVertices()
+            verts = self.body.getVertices() if atBody else [position + v.rotate(rotation) for v in self.body.shape.localVertices()]
             draw.polygon(pantalla, self.color, verts)
             draw.polygon(pantalla, (0, 0, 0), verts, 3)
 
@@ -359,6 +663,9 @@ class Spring:
         self.stiffness = stiffness
     
     def applyTension(self):
+        # Both ends resting (sleeping or static), the rope is already in balance
+        if self.bodyA.isInert and self.bodyB.isInert: return
+
         vecRope = self.bodyB.position - self.bodyA.position
         dirTension = vecRope.normalize()
         diffSteadyLen =  self.steadyLen - vecRope.length()
@@ -377,7 +684,9 @@ class Spring:
         elif not self.bodyB.isStatic:
             self.bodyB.applyForce(vecTension)
 
-    def draw(self, pantalla: Surface):
-        draw.line(pantalla, (0, 0, 0), self.bodyA.position, self.bodyB.position, 2)
+    def draw(self, pantalla: Surface, positionA: vec2 = None, positionB: vec2 = None):
+        if positionA is None: positionA = self.bodyA.position
+        if positionB is None: positionB = self.bodyB.position
+        draw.line(pantalla, (0, 0, 0), positionA, positionB, 2)
 
         
\ No newline at end of file
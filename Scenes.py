@@ -0,0 +1,110 @@
+import random
+from pygame.math import Vector2 as vec2
+from Rigidbody import Rigidbody, Shape, Entity, Spring
+from World import World
+
+"""
+======================================================================================================
+PROCEDURAL SCENES
+======================================================================================================
+"""
+
+# Inside of the walls set by World.setWalls
+AREA_LEFT, AREA_RIGHT = 20, 980
+AREA_TOP, AREA_BOTTOM = 75, 480
+
+def circleRain(world: World, count: int, seed: int = 0):
+    world.initScene()
+    rng = random.Random(seed)
+
+    for _ in range(int(count)):
+        radius = rng.randint(4, 9)
+        pos = vec2(rng.uniform(AREA_LEFT + radius, AREA_RIGHT - radius), rng.uniform(AREA_TOP + radius, AREA_BOTTOM - 100))
+        body = Rigidbody(pos, 1, 0.25, Shape.newCircle(radius), False)
+        world.entityList.append(Entity(body, (rng.randint(0, 255), 0, 200)))
+
+def boxPyramid(world: World, count: int, seed: int = 0):
+    world.initScene()
+    size = 16
+
+    rows = 1
+    while rows * (rows + 1) // 2 < int(count): rows += 1
+
+    placed = 0
+    for row in range(rows):
+        boxesInRow = rows - row
+        startX = 500 - (boxesInRow - 1) * size / 2
+        y = AREA_BOTTOM - size / 2 - row * size
+
+        for i in range(boxesInRow):
+            if placed == int(count): return
+
+            body = Rigidbody(vec2(startX + i * size, y), 1, 0.1, Shape.newBox(size, size), False)
+            world.entityList.append(Entity(body, (200, 120, 0)))
+            placed += 1
+
+def mixedPile(world: World, count: int, seed: int = 0):
+    world.initScene()
+    rng = random.Random(seed)
+    cell = 28 # Every body starts alone in its cell so nothing overlaps on the first step
+
+    columns = int((AREA_RIGHT - AREA_LEFT) // cell)
+    for i in range(int(count)):
+        x = AREA_LEFT + cell / 2 + (i % columns) * cell
+        y = AREA_BOTTOM - cell / 2 - (i // columns) * cell
+        pos = vec2(x + rng.uniform(-2, 2), y)
+
+        kind = rng.randrange(4)
+        if kind == 0: shape = Shape.newCircle(rng.randint(6, 10))
+        elif kind == 1: shape = Shape.newBox(rng.randint(10, 18), rng.randint(10, 18))
+        elif kind == 2: shape = Shape.newTriangle(rng.randint(12, 18), rng.randint(12, 18))
+        else: shape = Shape.newPentagon(rng.randint(12, 18), rng.randint(12, 18))
+
+        body = Rigidbody(pos, 1, 0.2, shape, False)
+        body.rotation = rng.uniform(0, 360)
+        world.entityList.append(Entity(body, (rng.randint(50, 255), rng.randint(50, 255), 0)))
+
+def springChain(world: World, count: int, seed: int = 0):
+    world.initScene()
+    spacing = 12
+    linksPerChain = 35 # Sideways it has to fit between its anchor and a wall
+
+    chains = max(1, -(-int(count) // linksPerChain))
+    placed = 0
+    for c in range(chains):
+        anchorX = AREA_LEFT + (c + 0.5) * (AREA_RIGHT - AREA_LEFT) / chains
+        y = AREA_TOP + 5 + c * spacing # Every chain on its own row so they do not start on top of each other
+        previous = Rigidbody(vec2(anchorX, y), 1, 0, Shape.newCircle(2), True)
+        world.entityList.append(Entity(previous, (255, 255, 255)))
+
+        # The chain starts sideways, towards the farthest wall, so it swings down and hits its neighbours
+        direction = 1 if anchorX < (AREA_LEFT + AREA_RIGHT) / 2 else -1
+        for i in range(min(linksPerChain, int(count) - placed)):
+            body = Rigidbody(vec2(anchorX + direction * (i + 1) * spacing, y), 5, 0.1, Shape.newCircle(5), False)
+            world.entityList.append(Entity(body, (0, 200, 255)))
+            world.springList.append(Spring(previous, body))
+            previous = body
+            placed += 1
+
+generators = {
+    "circleRain": circleRain,
+    "boxPyramid": boxPyramid,
+    "mixedPile": mixedPile,
+    "springChain": springChain,
+}
+
+def buildScene(world: World, name: str, count: int = 200, seed: int = 0):
+    if name not in generators: raise ValueError("unknown scene " + str(name) + ", use one of " + ", ".join(generators))
+    generators[name](world, count, seed)
+
+# Loads a shipped level and drops its usable objects in the middle of the playable zone
+def loadLevel(world: World, level: int, dropObjects: bool = True):
+    if int(level) < 1 or int(level) > 7: raise ValueError("level must be between 1 and 7")
+    world.changeScene(int(level))
+
+    if not dropObjects: return
+
+    x, y, width, height = world.playableZone
+    while world.usableObjects:
+        offset = 45 * len(world.usableObjects)
+        world.addUsableObjectAtPos(0, vec2(x + width / 2, y + height / 2 + offset - 45))
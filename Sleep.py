@@ -0,0 +1,109 @@
+import numpy as np
+from BodyStore import BodyStore
+
+"""
+======================================================================================================
+UNION FIND
+======================================================================================================
+"""
+
+class UnionFind:
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, i: int) -> int:
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]] # Path halving
+            i = parent[i]
+        return i
+
+    def union(self, a: int, b: int):
+        rootA, rootB = self.find(a), self.find(b)
+        if rootA != rootB: self.parent[rootB] = rootA
+
+"""
+======================================================================================================
+SLEEP SYSTEM
+======================================================================================================
+"""
+
+class SleepSystem:
+    def __init__(self, linearThreshold: float = 4.0, angularThreshold: float = 0.5, timeToSleep: float = 0.5):
+        if float(linearThreshold) < 0: raise ValueError("linearThreshold must be greater or equal than zero")
+        if float(angularThreshold) < 0: raise ValueError("angularThreshold must be greater or equal than zero")
+        if float(timeToSleep) <= 0: raise ValueError("timeToSleep must be greater than zero")
+
+        self.enabled = True
+        self.linearThreshold = float(linearThreshold)   # pixels per second
+        self.angularThreshold = float(angularThreshold) # radians per second
+        self.timeToSleep = float(timeToSleep)           # seconds
+        self.__nextIslandId = 0
+
+    # Islands that go to sleep get ids from here on, restoring a saved world moves it past the saved ids
+    @property
+    def nextIslandId(self): return self.__nextIslandId
+
+    @nextIslandId.setter
+    def nextIslandId(self, newVal: int):
+        if int(newVal) < 0: raise ValueError("nextIslandId must be greater or equal than zero")
+        self.__nextIslandId = int(newVal)
+
+    # Wakes every body that went to sleep in the same island as a body that has been woken up
+    def wakeIslands(self, store: BodyStore):
+        n = store.count
+        islandId, awake = store.islandId[:n], store.awake[:n]
+
+        woken = islandId[awake & (islandId >= 0)]
+        if woken.size == 0: return
+
+        rows = np.flatnonzero(np.isin(islandId, woken))
+        awake[rows] = True
+        islandId[rows] = -1
+        store.sleepTime[rows] = 0
+
+    def wakeAll(self, store: BodyStore):
+        n = store.count
+        store.awake[:n] = True
+        store.islandId[:n] = -1
+        store.sleepTime[:n] = 0
+
+    # links are (rowA, rowB) pairs of bodies touching or joined this step, an island sleeps when
+    # all of its bodies have been resting for timeToSleep
+    def update(self, store: BodyStore, links: list[tuple[int, int]], deltaTime: float):
+        if not self.enabled: return
+
+        rows = store.activeRows()
+        if rows.size == 0: return
+
+        velocity = store.velocity[rows]
+        speedSq = velocity[:, 0] ** 2 + velocity[:, 1] ** 2
+        resting = (speedSq < self.linearThreshold ** 2) & (np.abs(store.angularVelocity[rows]) < self.angularThreshold)
+
+        sleepTime = store.sleepTime
+        sleepTime[rows] = np.where(resting, sleepTime[rows] + deltaTime, 0)
+
+        if not np.any(sleepTime[rows] >= self.timeToSleep): return
+
+        # ISLANDS, static bodies never join two islands
+        n = store.count
+        dynamic = store.invMass[:n] > 0
+        islands = UnionFind(n)
+        for a, b in links:
+            if dynamic[a] and dynamic[b]: islands.union(a, b)
+
+        roots = np.fromiter((islands.find(r) for r in rows.tolist()), dtype=np.intp, count=rows.size)
+
+        islandTime = np.full(n, np.inf)
+        np.minimum.at(islandTime, roots, sleepTime[rows])
+
+        asleep = islandTime[roots] >= self.timeToSleep
+        sleeping = rows[asleep]
+        if sleeping.size == 0: return
+
+        store.awake[sleeping] = False
+        store.velocity[sleeping] = 0
+        store.angularVelocity[sleeping] = 0
+        store.force[sleeping] = 0
+        store.islandId[sleeping] = self.__nextIslandId + roots[asleep]
+        self.__nextIslandId += n
@@ -0,0 +1,230 @@
+from __future__ import annotations
+import struct
+import numpy as np
+from pygame.math import Vector2 as vec2
+from Rigidbody import Rigidbody, Shape, ShapeType, Entity, Spring
+from World import World
+
+"""
+======================================================================================================
+WORLD SNAPSHOT
+======================================================================================================
+"""
+
+class WorldSnapshot:
+    magic = b"WSNP"
+    version = 1
+
+    # magic, version, entities, springs, entityList, usableObjects, completionEntityIndexes, cache entries,
+    # currentLevel, nextIslandId, completionZone, playableZone, gravity
+    header = struct.Struct("<4sHIIIIIIiq4d4d2d")
+
+    bodyType = np.dtype([("position", "<f8", 2), ("velocity", "<f8", 2), ("rotation", "<f8"), ("angularVelocity", "<f8"),
+                         ("mass", "<f8"), ("restitution", "<f8"), ("sleepTime", "<f8"), ("islandId", "<i8"),
+                         ("radius", "<i4"), ("width", "<i4"), ("height", "<i4"), ("shapeType", "i1"),
+                         ("isStatic", "?"), ("awake", "?"), ("color", "u1", 3)])
+    springType = np.dtype([("bodyA", "<i4"), ("bodyB", "<i4"), ("steadyLen", "<f8"), ("stiffness", "<f8")])
+    cacheType = np.dtype([("bodyA", "<i4"), ("bodyB", "<i4"), ("feature", "<i4"), ("normalImpulse", "<f8"), ("tangentImpulse", "<f8")])
+
+    def __init__(self, data: bytes, entities: list[Entity] = None, springs: list[Spring] = None):
+        self.data = bytes(data)
+        # The objects the snapshot was taken from, restoring into their world only rewrites their state.
+        # A snapshot read from bytes has none and builds new ones
+        self.entities = entities
+        self.springs = springs
+
+    @staticmethod
+    def fromBytes(data: bytes) -> WorldSnapshot:
+        WorldSnapshot.__readHeader(data)
+        return WorldSnapshot(data)
+
+    def toBytes(self) -> bytes: return self.data
+
+    # CAPTURE ===========================================================================
+
+    # Every entity of the scene gets an index: the ones in entityList first, then the usable objects not dropped yet
+    # and last the bodies only springs hold, like anchors, in an entity of their own
+    @staticmethod
+    def capture(world: World) -> WorldSnapshot:
+        entities = list(world.entityList)
+        inWorld = set(map(id, entities))
+        entities += [u for u in world.usableObjects if id(u) not in inWorld]
+        indexOf = {id(e.body): i for i, e in enumerate(entities)}
+
+        for body in (b for s in world.springList for b in (s.bodyA, s.bodyB)):
+            if id(body) not in indexOf:
+                indexOf[id(body)] = len(entities)
+                entities.append(Entity(body))
+
+        springs = world.springList[:]
+        bodies = [e.body for e in entities]
+        store = world.bodyStore
+
+        records = np.zeros(len(entities), dtype=WorldSnapshot.bodyType)
+
+        # Bodies in the store are copied with one gather per array, the rest one by one
+        bound = [i for i, b in enumerate(bodies) if b.store is store]
+        if bound:
+            rows = store.rowsOf([bodies[i] for i in bound])
+            records["position"][bound] = store.position[rows]
+            records["velocity"][bound] = store.velocity[rows]
+            records["rotation"][bound] = store.rotation[rows]
+            records["angularVelocity"][bound] = store.angularVelocity[rows]
+            records["awake"][bound] = store.awake[rows]
+            records["sleepTime"][bound] = store.sleepTime[rows]
+            records["islandId"][bound] = store.islandId[rows]
+
+        records["islandId"][[i for i, b in enumerate(bodies) if b.store is not store]] = -1
+        for i, body in enumerate(bodies):
+            records["mass"][i] = body.mass
+            records["restitution"][i] = body.restitution
+            records["shapeType"][i], records["radius"][i], records["width"][i], records["height"][i] = WorldSnapshot.__shapeRecord(body.shape)
+            records["isStatic"][i] = body.isStatic
+            records["color"][i] = entities[i].color
+
+            if body.store is not store:
+                records["position"][i] = tuple(body.position)
+                records["velocity"][i] = tuple(body.velocity)
+                records["rotation"][i] = body.rotation
+                records["angularVelocity"][i] = body.angularVelocity
+                records["awake"][i] = not body.isSleeping
+
+        springRecords = np.array([(indexOf[id(s.bodyA)], indexOf[id(s.bodyB)], s.steadyLen, s.stiffness) for s in springs],
+                                 dtype=WorldSnapshot.springType)
+        cacheRecords = np.array([(indexOf[id(a)], indexOf[id(b)], f, n, t) for a, b, f, n, t in world.contactCache.entries()
+                                 if id(a) in indexOf and id(b) in indexOf], dtype=WorldSnapshot.cacheType)
+
+        entityIndexes = np.arange(len(world.entityList), dtype="<i4")
+        usable = np.array([indexOf[id(u.body)] for u in world.usableObjects], dtype="<i4")
+        completion = np.array(world.completionEntityIndexes, dtype="<i4")
+
+        header = WorldSnapshot.header.pack(WorldSnapshot.magic, WorldSnapshot.version, len(entities), len(springs),
+                                           len(entityIndexes), len(usable), len(completion), len(cacheRecords),
+                                           world.currentLevel, world.sleepSystem.nextIslandId,
+                                           *world.completionZone, *world.playableZone, world.gravity.x, world.gravity.y)
+
+        data = b"".join((header, records.tobytes(), springRecords.tobytes(), entityIndexes.tobytes(), usable.tobytes(),
+                         completion.tobytes(), cacheRecords.tobytes()))
+        return WorldSnapshot(data, entities, springs)
+
+    # RESTORE ===========================================================================
+
+    @staticmethod
+    def __readHeader(data: bytes) -> tuple:
+        if len(data) < WorldSnapshot.header.size: raise ValueError("data is too short to be a world snapshot")
+
+        fields = WorldSnapshot.header.unpack_from(data)
+        if fields[0] != WorldSnapshot.magic: raise ValueError("data is not a world snapshot")
+        if fields[1] != WorldSnapshot.version: raise ValueError("unsupported world snapshot version " + str(fields[1]))
+        return fields
+
+    # (shapeType, radius, width, height) like the body records keep it, the sizes a shape type does not use are 0
+    @staticmethod
+    def __shapeRecord(shape: Shape) -> tuple[int, int, int, int]:
+        if shape.shapeType == ShapeType.CIRCLE: return (shape.shapeType.value, shape.radius, 0, 0)
+        return (shape.shapeType.value, 0, shape.width, shape.height)
+
+    @staticmethod
+    def __buildShape(shapeType: int, radius: int, width: int, height: int) -> Shape:
+        shape = Shape(ShapeType(shapeType))
+        if shape.shapeType == ShapeType.CIRCLE: shape.radius = radius
+        else:
+            shape.width = width
+            shape.height = height
+        return shape
+
+    def __readArrays(self) -> tuple:
+        fields = self.__readHeader(self.data)
+        counts = fields[2:8]
+        offset = WorldSnapshot.header.size
+
+        arrays = []
+        for count, dtype in zip(counts, (self.bodyType, self.springType, "<i4", "<i4", "<i4", self.cacheType)):
+            array = np.frombuffer(self.data, dtype=dtype, count=count, offset=offset)
+            offset += array.nbytes
+            arrays.append(array)
+
+        return fields, arrays
+
+    # Objects the snapshot can be restored onto in this world, new ones if its objects live in another world
+    def __objectsFor(self, world: World, records: np.ndarray, springRecords: np.ndarray):
+        if self.entities is not None:
+            store = world.bodyStore
+            if all(e.body.store is None or e.body.store is store for e in self.entities): return self.entities, self.springs
+
+        entities = []
+        for r in records:
+            shape = WorldSnapshot.__buildShape(int(r["shapeType"]), int(r["radius"]), int(r["width"]), int(r["height"]))
+            body = Rigidbody(vec2(*r["position"]), float(r["mass"]), float(r["restitution"]), shape, bool(r["isStatic"]))
+            entities.append(Entity(body, tuple(int(c) for c in r["color"])))
+
+        springs = [Spring(entities[a].body, entities[b].body, s) for a, b, _, s in springRecords.tolist()]
+        return entities, springs
+
+    # Puts the world back in the saved state, the bodies already in the store are rewritten in place
+    def restore(self, world: World):
+        fields, (records, springRecords, entityIndexes, usable, completion, cacheRecords) = self.__readArrays()
+        entities, springs = self.__objectsFor(world, records, springRecords)
+
+        # SCENE LISTS
+        world.entityList[:] = [entities[i] for i in entityIndexes.tolist()]
+        world.usableObjects[:] = [entities[i] for i in usable.tolist()]
+        world.completionEntityIndexes[:] = completion.tolist()
+        world.springList[:] = springs
+        for spring, steadyLen, stiffness in zip(springs, springRecords["steadyLen"].tolist(), springRecords["stiffness"].tolist()):
+            spring.steadyLen = steadyLen
+            spring.stiffness = stiffness
+
+        world.currentLevel = fields[8]
+        world.sleepSystem.nextIslandId = max(world.sleepSystem.nextIslandId, fields[9])
+        world.completionZone = list(fields[10:14])
+        world.playableZone = list(fields[14:18])
+        world.gravity = vec2(fields[18], fields[19])
+        world.restingGravity = vec2(world.gravity)
+
+        # BODY PARAMETERS, only the ones that changed since the snapshot need their setters
+        bodies = [e.body for e in entities]
+        shapes = zip(records["shapeType"].tolist(), records["radius"].tolist(), records["width"].tolist(), records["height"].tolist())
+        for body, mass, restitution, isStatic, shape in zip(bodies, records["mass"].tolist(), records["restitution"].tolist(), 
+                                                            records["isStatic"].tolist(), shapes):
+            if WorldSnapshot.__shapeRecord(body.shape) != shape: body.shape = WorldSnapshot.__buildShape(*shape)
+            if body.mass != mass: body.mass = mass
+            if body.restitution != restitution: body.restitution = restitution
+            if body.isStatic != isStatic: body.isStatic = isStatic
+
+        # BODY STATE, the bodies of entityList go into the store and are written with one scatter per array
+        store = world.bodyStore
+        worldBodies = [e.body for e in world.entityList]
+        store.sync(worldBodies)
+
+        n = len(worldBodies)
+        rows = store.rowsOf(worldBodies)
+        inWorld = records[:n] # entityList always has the first indexes
+        store.position[rows] = inWorld["position"]
+        store.velocity[rows] = inWorld["velocity"]
+        store.rotation[rows] = inWorld["rotation"]
+        store.angularVelocity[rows] = inWorld["angularVelocity"]
+        store.force[rows] = 0
+        store.awake[rows] = inWorld["awake"]
+        store.sleepTime[rows] = inWorld["sleepTime"]
+        store.islandId[rows] = inWorld["islandId"]
+        store.previousPosition[rows] = inWorld["position"]
+        store.previousRotation[rows] = inWorld["rotation"]
+        store.transformVersion[rows] += 1 # Cached vertices and AABBs are from before
+
+        for body, r in zip(bodies[n:], records[n:]):
+            body.position = vec2(*r["position"])
+            body.rotation = float(r["rotation"])
+            body.setMotion(*r["velocity"].tolist(), float(r["angularVelocity"]))
+            body.force = vec2()
+            if r["awake"]: body.wakeUp()
+            else: body.sleep()
+
+        # ENGINE STATE, the broadphase finds its pairs again and the warm starting impulses come back
+        world.broadphase.clear()
+        world.manifoldPool.releaseAll()
+        world.contactPairs = []
+        world.contactCache.load((bodies[a], bodies[b], f, nImp, tImp) for a, b, f, nImp, tImp in cacheRecords.tolist())
+
+        # A snapshot read from bytes keeps the objects it built, the next restores into this world are in place
+        if self.entities is None: self.entities, self.springs = entities, springs
@@ -0,0 +1,46 @@
+from Collisions import Collisions, CollisionManifold
+from Contacts import ContactCache
+from Profiler import EngineCounters
+
+"""
+======================================================================================================
+CONTACT SOLVER
+======================================================================================================
+"""
+
+class ContactSolver:
+    def __init__(self, velocityIterations: int = 4):
+        self.velocityIterations = velocityIterations
+
+    # GETTERS ===========================================================================
+
+    @property
+    def velocityIterations(self): return self.__velocityIterations
+
+    # SETTERS ===========================================================================
+
+    @velocityIterations.setter
+    def velocityIterations(self, newVal: int):
+        if int(newVal) < 1 or int(newVal) > 64: raise ValueError("velocityIterations must be between 1 and 64")
+        self.__velocityIterations = int(newVal)
+
+    # METHODS ===========================================================================
+
+    # Every manifold of the step is visited velocityIterations times, a contact deep in a stack gets to
+    # see what the contacts above it pushed on the last pass
+    def solve(self, manifolds: list[CollisionManifold], cache: ContactCache = None, counters: EngineCounters = None):
+        if not manifolds: return
+
+        for manifold in manifolds:
+            Collisions.prepareContacts(manifold)
+
+        if cache is not None:
+            for manifold in manifolds:
+                if cache.warmStart(manifold): Collisions.warmStartContacts(manifold)
+
+        for _ in range(self.__velocityIterations):
+            for manifold in manifolds:
+                Collisions.solveContacts(manifold, counters)
+
+        if cache is not None:
+            for manifold in manifolds: cache.store(manifold)
@@ -1,31 +1,80 @@
-import random
+import random, time
+import numpy as np
 from Rigidbody import *
-from Collisions import Collisions, CollisionManifold
+from Collisions import Collisions
+from Broadphase import Broadphase, DynamicAABBTree
+from BodyStore import BodyStore
+from ForceFields import ForceField
+from BatchCollisions import BatchCollisions
+from Sleep import SleepSystem
+from Contacts import ContactCache, ManifoldPool
+from Solver import ContactSolver
+from Profiler import PhaseProfiler, EngineCounters
+from Levels import LevelLibrary, CompiledLevel, buildEntity
 
 class World:
     airRes = 0.0005
+    minBatchPairs = 16 # Below this many pairs the numpy call overhead costs more than the pair by pair tests
+    penetrationSlop = 0.04 # pixels, under the closeEnough distance or stacked boxes get both contacts on one corner
+    stackNormal = 0.7 # Contacts with a normal closer to the gravity than this only move the upper body out
 
     def __init__(self):
         self.entityList: list[Entity] = []
         self.springList: list[Spring] = []
         self.contactPairs: list[tuple[int]] = []
+        self.contactCount = 0 # Colliding pairs found by the last narrow phase
+        self.__bodyRows = np.zeros(0, dtype=np.intp) # entityList index -> body store row
         # Because every pixel is like a meter, I will multiply gravity by 20 to make every 20 pixels a meter
         self.gravity = vec2(0, 9.81 * 20)
+        self.restingGravity = vec2(self.gravity) # Gravity sleeping bodies came to rest under, they wake when it changes
         self.completionZone = [0, 0, 0, 0]
         self.playableZone = [0, 0, 0, 0]
         self.usableObjects: list[Entity] = []
         self.completionEntityIndexes: list[int] = []
         self.currentLevel = 1
+        # Levels are mostly big static bodies, the tree keeps them apart from the moving ones
+        self.broadphase: Broadphase = DynamicAABBTree()
+        self.bodyStore = BodyStore()
+        self.forceFields: list[ForceField] = []
+        self.sleepSystem = SleepSystem()
+        self.contactCache = ContactCache()
+        self.solver = ContactSolver()
+        self.manifoldPool = ManifoldPool()
+        self.allocationCount = 0 # Manifolds and cache entries the last update had to create, zero once the pools are warm
+        self.__down: vec2 = None # Unit gravity of the current substep, None without gravity
+        self.__links: list[tuple[int, int]] = [] # Store rows of the bodies close or joined in the last substep
+        self.phaseTimes: dict[str, float] = None # Seconds spent in each phase of the last update, only timed while it is a dict
+        self.profiler: PhaseProfiler = None
+        self.showProfiler = False # Draws the profiler stats over the scene
+        self.counters: EngineCounters = None # What the last update did, only counted while it is set
+        self.__levelStatics: dict[int, tuple[CompiledLevel, dict[int, Entity]]] = {} # level -> its static entities
+        self.__walls: list[Entity] = None # Entities of the walls every scene has, see setWalls
+        self.recorder = None # ReplayRecorder that gets every frame, see Replay.py
 
     def update(self, deltaTime: float, subIterations: int = 1):
         if subIterations < 1 or subIterations > 64: raise ValueError("subIterations argument must be between 1 and 64")
         subTime = deltaTime / subIterations
+        allocations = self.manifoldPool.allocations + self.contactCache.allocations
+
+        if self.counters is not None: self.counters.reset()
+
+        timing = self.phaseTimes is not None
+        if timing: 
+            self.phaseTimes.clear()
+            updateStart = time.perf_counter()
         
         for _ in range(int(subIterations)):
             self.contactPairs = []
 
             self.__broadPhace(subTime)
             self.__narrowPhace()
+
+            if timing: start = time.perf_counter()
+            self.sleepSystem.update(self.bodyStore, self.__links, subTime)
+            if timing: self.__lap("sleep", start)
+
+        self.allocationCount = self.manifoldPool.allocations + self.contactCache.allocations - allocations
+        if timing and self.profiler is not None: self.profiler.record(self.phaseTimes, time.perf_counter() - updateStart)
         
         # COMPLETION ZONE MOVABLE
         if self.currentLevel == 1:
@@ -36,64 +85,269 @@ class World:
             if self.completionZone[1] > 500: self.completionZone[1] = -50
             self.completionZone[1] += 2
 
-    def drawEntities(self, pantalla: Surface):
+        if self.recorder is not None: self.recorder.record(self.__bodyRows)
+
+    # Phase timers cost a few perf_counter calls per substep, they are off until this is called
+    def enableProfiling(self, window: int = 120):
+        if self.profiler is None: self.profiler = PhaseProfiler(window)
+        self.phaseTimes = {}
+
+    def disableProfiling(self):
+        self.profiler = None
+        self.phaseTimes = None
+        self.showProfiler = False
+
+    def enableCounters(self):
+        if self.counters is None: self.counters = EngineCounters()
+
+    def disableCounters(self):
+        self.counters = None
+
+    # alpha below 1 draws the bodies between their pose before the last update and the current one
+    def drawEntities(self, pantalla: Surface, alpha: float = 1.0):
         draw.rect(pantalla, (0, 150, 0), self.completionZone)
         draw.rect(pantalla, (255, 255, 120), self.playableZone)
-        for e in self.entityList: e.draw(pantalla)
-        for s in self.springList: s.draw(pantalla)
+
+        if alpha >= 1:
+            for e in self.entityList: e.draw(pantalla)
+            for s in self.springList: s.draw(pantalla)
+        else:
+            self.__drawInterpolated(pantalla, alpha)
+
+        if self.showProfiler and self.profiler is not None: self.profiler.draw(pantalla)
+
+    def __drawInterpolated(self, pantalla: Surface, alpha: float):
+        store = self.bodyStore
+        position, rotation = store.interpolatedPose(alpha)
+        position, rotation = position.tolist(), rotation.tolist()
+
+        # Bodies added after the last update are not in the store yet, they are drawn where they are
+        def poseOf(body: Rigidbody):
+            if body.store is not store: return body.position, body.rotation
+            return vec2(position[body.row]), rotation[body.row]
+
+        for e in self.entityList: e.draw(pantalla, *poseOf(e.body))
+        for s in self.springList: s.draw(pantalla, poseOf(s.bodyA)[0], poseOf(s.bodyB)[0])
             
+    # Adds the time since start to the phase and returns the current time, for the next phase to start from
+    def __lap(self, phase: str, start: float) -> float:
+        now = time.perf_counter()
+        self.phaseTimes[phase] = self.phaseTimes.get(phase, 0.0) + now - start
+        return now
+
     def __narrowPhace(self):
-        for contact in self.contactPairs:
+        timing = self.phaseTimes is not None
+        if timing: start = time.perf_counter()
+        counters = self.counters
+
+        self.contactCount = 0
+        self.manifoldPool.releaseAll()
+        self.__down = self.gravity.normalize() if self.gravity != vec2() else None # Without gravity nothing is stacked
+        if not self.contactPairs: 
+            self.__links = self.__springLinks()
+            self.contactCache.endStep()
+            if timing: self.__lap("narrowphase", start)
+            return
+
+        store = self.bodyStore
+        pairs = np.array(self.contactPairs, dtype=np.intp)
+        rowsA, rowsB = self.__bodyRows[pairs[:, 0]], self.__bodyRows[pairs[:, 1]]
+
+        # Islands use the broadphase pairs, resting contacts flicker in and out of the narrow phase
+        self.__links = self.__springLinks() + list(zip(rowsA.tolist(), rowsB.tolist()))
+
+        circle = ShapeType.CIRCLE.value
+        buckets = BatchCollisions.shapePairBuckets(store.shapeType[rowsA] == circle, store.shapeType[rowsB] == circle)
+
+        # Circle-circle pairs are tested all at once, contacts are moved like __separateBodies will move bodyA
+        circles = np.flatnonzero(buckets == BatchCollisions.CIRCLE_CIRCLE)
+        circleResults = None
+        if circles.size >= self.minBatchPairs:
+            ra, rb = rowsA[circles], rowsB[circles]
+            coll, normals, depths, contacts = BatchCollisions.collideCircles(store.position[ra], store.radius[ra], 
+                                                                             store.position[rb], store.radius[rb])
+            staticA, staticB = store.invMass[ra] == 0, store.invMass[rb] == 0
+            shareA = np.where(staticA, 0, np.where(staticB, 1, 0.5))
+            if self.__down is not None:
+                down = np.array((self.__down.x, self.__down.y))
+                upperA = (store.position[ra] - store.position[rb]) @ down < 0
+                shareA = np.where(~staticA & ~staticB & (np.abs(normals @ down) > self.stackNormal), upperA, shareA)
+            contacts -= normals * (np.maximum(depths - self.penetrationSlop, 0) * shareA)[:, None]
+
+            hits = np.flatnonzero(coll)
+            circleResults = dict(zip(circles[hits].tolist(), zip(normals[hits].tolist(), depths[hits].tolist(), contacts[hits].tolist())))
+
+        # Same for polygon-polygon pairs with the batched SAT, contact points still need the separated vertices
+        polygons = np.flatnonzero(buckets == BatchCollisions.POLYGON_POLYGON)
+        polygonResults = None
+        if polygons.size >= self.minBatchPairs:
+            ra, rb = rowsA[polygons], rowsB[polygons]
+            coll, normals, depths = BatchCollisions.intersectPolygons(store.position[ra], store.worldVertices(ra), store.vertexCount[ra],
+                                                                      store.position[rb], store.worldVertices(rb), store.vertexCount[rb],
+                                                                      store.worldAxes(ra), store.worldAxes(rb), counters)
+
+            hits = np.flatnonzero(coll)
+            polygonResults = dict(zip(polygons[hits].tolist(), zip(normals[hits].tolist(), depths[hits].tolist())))
+
+        # Every pair is tested in the broadphase order, each bucket goes straight to its test
+        pool = self.manifoldPool
+        pointsTime = 0.0
+        for k, bucket in enumerate(buckets.tolist()):
+            contact = self.contactPairs[k]
             bodyA = self.entityList[contact[0]].body
             bodyB = self.entityList[contact[1]].body
 
-            coll, normal, depth = Collisions.collide(bodyA, bodyB)
-            if coll:                   
+            if bucket == BatchCollisions.CIRCLE_CIRCLE and circleResults is not None:
+                result = circleResults.get(k)
+                if result is None: continue
+
+                collManifold = pool.acquire(bodyA, bodyB, result[0], result[1], result[2], None, 1)
+                self.__separateBodies(bodyA, bodyB, collManifold.normal, collManifold.depth)
+            else:
+                if bucket == BatchCollisions.POLYGON_POLYGON and polygonResults is not None:
+                    result = polygonResults.get(k)
+                    coll = result is not None
+                    if coll: normal, depth = vec2(result[0]), result[1]
+                elif bucket == BatchCollisions.POLYGON_POLYGON:
+                    coll, normal, depth = Collisions.intersectTwoPolygons(bodyA.position, bodyA.getVertices(), bodyB.position, bodyB.getVertices(),
+                                                                          bodyA.getAxes(), bodyB.getAxes(), counters)
+                elif bucket == BatchCollisions.CIRCLE_CIRCLE:
+                    coll, normal, depth = Collisions.intersectTwoCircles(bodyA.position, bodyA.shape.radius, bodyB.position, bodyB.shape.radius)
+                elif bucket == BatchCollisions.CIRCLE_POLYGON:
+                    coll, normal, depth = Collisions.intersectCirclePolygon(bodyA.position, bodyA.shape.radius, bodyB.position, bodyB.getVertices(), 
+                                                                            bodyB.getAxes(), counters)
+                elif bucket == BatchCollisions.POLYGON_CIRCLE:
+                    coll, normal, depth = Collisions.intersectCirclePolygon(bodyB.position, bodyB.shape.radius, bodyA.position, bodyA.getVertices(), 
+                                                                            bodyA.getAxes(), counters)
+                    if coll: normal *= -1
+
+                if not coll: continue
+
                 self.__separateBodies(bodyA, bodyB, normal, depth)
 
-                cp1, cp2, contactCount = Collisions.findContactPoints(bodyA, bodyB)
-                collManifold = CollisionManifold(bodyA, bodyB, normal, depth, cp1, cp2, contactCount)
+                if timing: pointsStart = time.perf_counter()
+                cp1, cp2, contactCount, feature1, feature2 = Collisions.findContactPointsWithFeatures(bodyA, bodyB)
+                if timing: pointsTime += time.perf_counter() - pointsStart
+                pool.acquire(bodyA, bodyB, normal, depth, cp1, cp2, contactCount, feature1, feature2)
+
+            # A new contact wakes a sleeping body, the rest of its island wakes up next substep
+            if bodyA.isSleeping: bodyA.wakeUp()
+            if bodyB.isSleeping: bodyB.wakeUp()
+
+            self.contactCount += 1
+            if counters is not None:
+                if pool.active[-1].contactCount == 2: counters.twoContacts += 1
+                else: counters.oneContact += 1
 
-                Collisions.resolveCollisionWithRotationAndFriction(collManifold)
+        if counters is not None:
+            counters.narrowTests += len(self.contactPairs)
+            counters.narrowHits += self.contactCount
+
+        if timing: 
+            start = self.__lap("narrowphase", start)
+            self.phaseTimes["narrowphase"] -= pointsTime
+            self.phaseTimes["contactPoints"] = self.phaseTimes.get("contactPoints", 0.0) + pointsTime
+
+        # Sequential impulses over all the contacts at once, seeded with what they needed the last substep
+        self.solver.solve(pool.active, self.contactCache, counters)
+        self.contactCache.endStep()
+        if timing: self.__lap("solver", start)
+
+    def __springLinks(self) -> list[tuple[int, int]]:
+        store = self.bodyStore
+        return [(s.bodyA.row, s.bodyB.row) for s in self.springList if s.bodyA.store is store and s.bodyB.store is store]
 
     def __broadPhace(self, deltaTime: float):
-        for e in self.entityList:
-            # GRAVITY
-            if not e.body.isStatic: 
-                e.body.applyForce(self.gravity * e.body.mass)
-
-            # AIR RESISTANCE
-            if not e.body.isStatic and e.body.velocity != vec2(0,0): 
-                e.body.applyForce(self.airRes * -e.body.velocity.normalize() * e.body.velocity.length_squared())
-            
-            e.body.angularVelocity *= (1 - self.airRes * e.body.angularVelocity ** 2 * deltaTime) 
+        timing = self.phaseTimes is not None
+        if timing: start = time.perf_counter()
+
+        bodies = [e.body for e in self.entityList]
+        self.bodyStore.sync(bodies)
+        self.__bodyRows = self.bodyStore.rowsOf(bodies)
+        self.sleepSystem.wakeIslands(self.bodyStore)
+
+        self.__applyForces(deltaTime)
 
         for s in self.springList:
             s.applyTension()
 
-        for i in range(len(self.entityList)):
-            thisBody = self.entityList[i].body
-            # UPDATE BODIES
-            thisBody.update(deltaTime)
+        if timing: start = self.__lap("forces", start)
+
+        # UPDATE BODIES, sleeping bodies are left out
+        self.bodyStore.integrate(deltaTime, self.bodyStore.activeRows())
+        if timing: start = self.__lap("integrate", start)
+
+        # Every body is moved before looking for pairs, the broadphase returns the same (i, j) pairs, i < j
+        self.contactPairs = self.broadphase.findPairs(bodies)
+        if timing: self.__lap("broadphase", start)
+
+        counters = self.counters
+        if counters is not None:
+            counters.candidatePairs += len(self.contactPairs)
+            counters.aabbTests += self.broadphase.aabbTests
 
-            for j in range(i + 1, len(self.entityList)):
-                otherBody = self.entityList[j].body
-                
-                if thisBody.isStatic and otherBody.isStatic: continue
+    def __applyForces(self, deltaTime: float):
+        store = self.bodyStore
+        n = store.count
 
-                thisAABB, otherAABB = thisBody.getAABB(), otherBody.getAABB()
-                if not Collisions.intersectTwoAABBs(thisAABB, otherAABB): continue
+        # A new gravity is a new force on every body, sleeping ones included
+        if self.gravity != self.restingGravity:
+            self.restingGravity = vec2(self.gravity)
+            self.sleepSystem.wakeAll(store)
+
+        # FORCE FIELDS go over every dynamic body into their own buffer, like applyForce a sleeping body a
+        # field pushes wakes up, its island follows on the next sleep update
+        if self.forceFields:
+            dynamic = store.dynamicRows()
+            held = store.force[dynamic]
+            store.force[dynamic] = 0
+            for field in self.forceFields: field.apply(store, dynamic, deltaTime)
+            fieldForce = store.force[dynamic]
+            store.force[dynamic] = held
+
+            woken = dynamic[~store.awake[dynamic] & fieldForce.any(axis=1)]
+            store.awake[woken] = True
+            store.sleepTime[woken] = 0
+
+        rows = store.activeRows()
+        velocity = store.velocity[rows]
+        speed = np.hypot(velocity[:, 0], velocity[:, 1])
+
+        # GRAVITY and AIR RESISTANCE (-v.normalize() * |v|^2 == -v * |v|)
+        store.force[rows] += np.outer(store.mass[rows], (self.gravity.x, self.gravity.y)) - self.airRes * velocity * speed[:, None]
+
+        angularVelocity = store.angularVelocity[:n]
+        angularVelocity *= 1 - self.airRes * angularVelocity ** 2 * deltaTime
+
+        if self.forceFields:
+            active = store.awake[dynamic]
+            store.force[dynamic[active]] += fieldForce[active]
+
+    def addForceField(self, field: ForceField):
+        if not isinstance(field, ForceField): raise TypeError("field argument must be a ForceField type")
+        self.forceFields.append(field)
+
+    def removeForceField(self, field: ForceField):
+        if field in self.forceFields: self.forceFields.remove(field)
 
-                self.contactPairs.append((i, j))
-                
     def __separateBodies(self, thisBody: Rigidbody, otherBody: Rigidbody, normal: vec2, depth: float):
+        # Resting contacts keep a little overlap so they are still found the next substep
+        depth = max(depth - self.penetrationSlop, 0)
+        if depth == 0: return
+
+        dx, dy = normal.x * depth, normal.y * depth
         if thisBody.isStatic:
-            otherBody.position += normal * depth
+            otherBody.translate(dx, dy)
         elif otherBody.isStatic:
-            thisBody.position -= normal * depth
+            thisBody.translate(-dx, -dy)
+        # A body resting on another one is pushed up against the gravity, pushing half of it down sinks the
+        # bottom rows of a stack a bit every substep until they tip over
+        elif self.__down is not None and abs(normal.dot(self.__down)) > self.stackNormal:
+            if (thisBody.position - otherBody.position).dot(self.__down) < 0: thisBody.translate(-dx, -dy)
+            else: otherBody.translate(dx, dy)
         else:
-            thisBody.position -= normal * depth/2
-            otherBody.position += normal * depth/2
+            thisBody.translate(-dx / 2, -dy / 2)
+            otherBody.translate(dx / 2, dy / 2)
    
     """
     ======================================================================================================
@@ -112,24 +366,35 @@ class World:
 
         for index in listToRemove: del self.entityList[index]
 
+    # The walls are the same in every scene, they are built once and every scene gets the same entities
+    # with their vertices and AABBs already there, like the static bodies of the levels
     def setWalls(self):
-        left = Rigidbody(vec2(0, 250), 1, 0.5, Shape.newBox(40, 500), True)
-        right = Rigidbody(vec2(1000, 250), 1, 0.5, Shape.newBox(40, 500), True)
-        top = Rigidbody(vec2(500, 0), 1, 0.5, Shape.newBox(1000, 150), True)
-        bottom = Rigidbody(vec2(500, 500), 1, 0.5, Shape.newBox(1000, 40), True)
+        if self.__walls is None:
+            left = Rigidbody(vec2(0, 250), 1, 0.5, Shape.newBox(40, 500), True)
+            right = Rigidbody(vec2(1000, 250), 1, 0.5, Shape.newBox(40, 500), True)
+            top = Rigidbody(vec2(500, 0), 1, 0.5, Shape.newBox(1000, 150), True)
+            bottom = Rigidbody(vec2(500, 500), 1, 0.5, Shape.newBox(1000, 40), True)
 
-        colorWall = (0, 0, 0)
+            colorWall = (0, 0, 0)
 
-        self.entityList.append(Entity(left, colorWall))
-        self.entityList.append(Entity(right, colorWall))
-        self.entityList.append(Entity(top, colorWall))
-        self.entityList.append(Entity(bottom, colorWall))
+            self.__walls = [Entity(left, colorWall), Entity(right, colorWall), Entity(top, colorWall), Entity(bottom, colorWall)]
+            for wall in self.__walls:
+                wall.body.getVertices()
+                wall.body.getAABB()
+                wall.body.getAxes()
+
+        self.entityList.extend(self.__walls)
 
     def initScene(self):
         self.entityList.clear()
         self.springList.clear()
+        self.forceFields.clear()
         self.usableObjects.clear()
         self.completionEntityIndexes.clear()
+        self.broadphase.clear()
+        self.bodyStore.clear()
+        self.contactCache.clear()
+        self.manifoldPool.clear()
         self.setWalls()
 
     def setPlayableZone(self, pos: vec2, width, height):
@@ -140,9 +405,11 @@ class World:
             self.usableObjects[index].body.position = pos
             self.usableObjects[index].body.velocity = vel
             self.usableObjects[index].body.angularVelocity = 0
+            self.usableObjects[index].body.wakeUp() # wakeAll only reaches the bodies already in the store
 
             self.completionEntityIndexes.append(len(self.entityList))
             self.entityList.append(self.usableObjects[index])
+            self.sleepSystem.wakeAll(self.bodyStore)
   
             self.usableObjects.pop(index)
 
@@ -152,173 +419,32 @@ class World:
     ======================================================================================================
     """
 
-    def setScene_1(self):
-        self.initScene()
-        baseRest = 0.25
-
-        #ground = Rigidbody(vec2(500, 400), 1, baseRest, Shape.newBox(600, 170), True)
-        triangle = Rigidbody(vec2(500, 250), 1, baseRest, Shape.newTriangle(400, 150), True)
-
-        #self.entityList.append(Entity(ground, (0, 0, 0)))
-        self.entityList.append(Entity(triangle, (0, 0, 0)))
-
-        self.completionZone = [0, 350, 200, 50]
-        self.setPlayableZone(vec2(400, 0), 200, 300)
-
-        newBody1 = Rigidbody(vec2(), 1, 0.25, Shape.newCircle(20), False)
-        self.usableObjects.append(Entity(newBody1, (250,0,0)))
-
-    def setScene_2(self):
-        self.initScene()
-        baseRest = 0.25
-
-        ground = Rigidbody(vec2(250, 500), 1, baseRest, Shape.newBox(500, 200), True)
-        ground2 = Rigidbody(vec2(900, 470), 1, baseRest, Shape.newBox(1000, 40), True)
-        wallL = Rigidbody(vec2(150, 250), 1, baseRest, Shape.newBox(300, 500), True)
-        rampL1 = Rigidbody(vec2(300, 350), 1, baseRest, Shape.newTriangle(100, 200), True)
-        rampL2 = Rigidbody(vec2(330, 400), 1, baseRest, Shape.newTriangle(100, 100), True)
-        rampL3 = Rigidbody(vec2(345, 400), 1, baseRest, Shape.newTriangle(100, 50), True)
-        rampL4 = Rigidbody(vec2(345, 410), 1, baseRest, Shape.newTriangle(200, 50), True)
-        
-        rampR1 = Rigidbody(vec2(470, 405), 1, baseRest, Shape.newTriangle(50, 60), True)
-        rampR2 = Rigidbody(vec2(485, 400), 1, baseRest, Shape.newTriangle(50, 50), True)
-        
-        ground2.rotation -= 2
-        rampR1.rotation += 45
-        rampR2.rotation += 28
-
-        self.entityList.append(Entity(ground, (0, 0, 0)))
-        self.entityList.append(Entity(ground2, (0, 0, 0)))
-        self.entityList.append(Entity(wallL, (0, 0, 0)))
-        self.entityList.append(Entity(rampL1, (0, 0, 0)))
-        self.entityList.append(Entity(rampL2, (0, 0, 0)))
-        self.entityList.append(Entity(rampL3, (0, 0, 0)))
-        self.entityList.append(Entity(rampL4, (0, 0, 0)))
-        self.entityList.append(Entity(rampR1, (0, 0, 0)))
-        self.entityList.append(Entity(rampR2, (0, 0, 0)))
-
-        self.completionZone = [960, 0, 20, 100]
-        self.playableZone = [300, 0, 50, 400]
-
-        newBody1 = Rigidbody(vec2(), 1, 0.25, Shape.newCircle(20), False)
-        self.usableObjects.append(Entity(newBody1, (250,0,0)))
-
-    def setScene_3(self):
+    # Static bodies are built once per level and world, loading the level again reuses them as they are
+    def loadLevel(self, level: CompiledLevel):
         self.initScene()
-        baseRest = 0.25
-
-        pillar1 = Rigidbody(vec2(500 - 35, 400), 1, baseRest, Shape.newBox(10, 200), True)
-        pillar2 = Rigidbody(vec2(500 + 35, 400), 1, baseRest, Shape.newBox(10, 200), True)
-        
-        roof = Rigidbody(vec2(500, 200), 1, baseRest, Shape.newTriangle(120, 100), False)
-
-        self.entityList.append(Entity(pillar1, (0, 0, 0)))
-        self.entityList.append(Entity(pillar2, (0, 0, 0)))
-        self.entityList.append(Entity(roof, (180, 0, 0)))
-
-        self.completionZone = [470, 400, 60, 100]
-        self.setPlayableZone(vec2(400, 0), 200, 200)
-
-        newBody1 = Rigidbody(vec2(), 5, 0.25, Shape.newCircle(20), False)
-        newBody2 = Rigidbody(vec2(), 1, 0.25, Shape.newCircle(20), False)
-        self.usableObjects.append(Entity(newBody1, (250,0,0)))
-        self.usableObjects.append(Entity(newBody2, (250,0,0)))
-
-    def setScene_4(self):
-        self.initScene()
-        baseRest = 0.25
-
-        ground = Rigidbody(vec2(500 + 150, 500 - 75), 1, baseRest, Shape.newBox(700, 150), True)
-    
-        base = Rigidbody(vec2(500, 150), 1, baseRest, Shape.newCircle(2), True)
-        ball1 = Rigidbody(vec2(650, 150), 10, baseRest, Shape.newCircle(20), False)
-        spring1 = Spring(base, ball1)
-
-        self.entityList.append(Entity(ground, (0, 0, 0)))
-        self.entityList.append(Entity(ball1, (0, 0, 160)))
-        self.springList.append(spring1)
-
-        self.completionZone = [0, 400, 400, 200]
-        self.setPlayableZone(vec2(300, 0), 400, 200)
-
-        newBody1 = Rigidbody(vec2(), 1, 0.25, Shape.newCircle(20), False)
-        self.usableObjects.append(Entity(newBody1, (250,0,0)))
-
-    def setScene_5(self):
-        self.initScene()
-        baseRest = 0.25
-
-        ground = Rigidbody(vec2(650, 500 - 90), 1,baseRest, Shape.newBox(800, 150), True)
-        triangle = Rigidbody(vec2(325, 500 - 190), 1, baseRest, Shape.newTriangle(150, 70), True)
-        topRight = Rigidbody(vec2(675, 80), 1, baseRest, Shape.newBox(700, 150), True)
-        bouncyPanel = Rigidbody(vec2(20, 280), 1, 2, Shape.newCircle(50), True)
-
-        self.entityList.append(Entity(ground, (0, 0, 0)))
-        self.entityList.append(Entity(triangle, (0, 0, 0)))
-        self.entityList.append(Entity(topRight, (0, 0, 0)))
-        self.entityList.append(Entity(bouncyPanel, (200, 0, 0)))
-
-        self.completionZone = [600, 250, 400, 200]
-        self.setPlayableZone(vec2(0, 0), 325, 300)
-
-        newBody1 = Rigidbody(vec2(), 3, 0.25, Shape.newCircle(20), False)
-        self.usableObjects.append(Entity(newBody1, (250,0,0)))
-
-    def setScene_6(self):
-        self.initScene()
-        baseRest = 0.25
-
-        ground = Rigidbody(vec2(600, 520), 1, baseRest, Shape.newBox(300, 200), True)
-        ramp = Rigidbody(vec2(280, 240), 1, baseRest, Shape.newBox(620, 30), True)
-
-        ground.rotation -= 30
-        ramp.rotation += 20
-
-        self.entityList.append(Entity(ground, (0, 0, 0)))
-        self.entityList.append(Entity(ramp, (0, 0, 0)))
-
-        self.completionZone = [0, 420, 600, 100]
-        self.setPlayableZone(vec2(0, 0), 300, 150)
-
-        newBody1 = Rigidbody(vec2(), 1, 0.25, Shape.newCircle(20), False)
-        newBody2 = Rigidbody(vec2(), 1, 0.25, Shape.newBox(40, 40), False)
-        self.usableObjects.append(Entity(newBody1, (250,0,0)))
-        self.usableObjects.append(Entity(newBody2, (250,0,0)))
-
-    def setScene_7(self):
-        self.initScene()
-        baseRest = 0.25
-
-        ground = Rigidbody(vec2(150, 450), 1, baseRest, Shape.newBox(620, 500), True)
-        barrier = Rigidbody(vec2(500, 500 - 100), 1, baseRest, Shape.newBox(230, 15), True)
 
-        ground.rotation += 30
-        barrier.rotation -= 60
+        cached = self.__levelStatics.get(level.level)
+        if cached is None or cached[0] is not level:
+            cached = self.__levelStatics[level.level] = (level, level.staticEntities())
+        statics = cached[1]
 
-        self.entityList.append(Entity(ground, (0, 0, 0)))
-        self.entityList.append(Entity(barrier, (0, 0, 0)))
+        entities = [statics.get(i) or buildEntity(spec) for i, spec in enumerate(level.bodies)]
+        for entity, spec in zip(entities, level.bodies):
+            if not spec["anchor"]: self.entityList.append(entity) # Anchors only hold springs, they are never drawn or hit
 
-        self.completionZone= [400, 400, 600, 150]
-        self.setPlayableZone(vec2(0, 0), 300, 150)
+        for a, b in level.springs:
+            self.springList.append(Spring(entities[a].body, entities[b].body))
 
-        newBody1 = Rigidbody(vec2(), 1, 0.25, Shape.newCircle(20), False)
-        newBody2 = Rigidbody(vec2(400, 200), 1, 0.25, Shape.newTriangle(120, 60), False)
-        newBody2.rotation += 140
-        self.usableObjects.append(Entity(newBody1, (250,0,0)))
-        self.usableObjects.append(Entity(newBody2, (250,0,0)))
+        self.completionZone = list(level.completionZone)
+        self.playableZone = list(level.playableZone)
+        self.usableObjects.extend(buildEntity(spec) for spec in level.usableObjects)
 
     def changeScene(self, sceneNum: int):
         if sceneNum <= 8 and sceneNum >= 1:
             self.currentLevel = sceneNum
         else: return
 
-        if sceneNum == 1: self.setScene_1()   
-        elif sceneNum == 2: self.setScene_2()
-        elif sceneNum == 3: self.setScene_3()
-        elif sceneNum == 4: self.setScene_4()
-        elif sceneNum == 5: self.setScene_5()
-        elif sceneNum == 6: self.setScene_6()
-        elif sceneNum == 7: self.setScene_7()
-        #elif sceneNum == 8: self.setScene_8()
+        level = LevelLibrary.default().level(sceneNum)
+        if level is not None: self.loadLevel(level)
         
         
@@ -1,8 +1,12 @@
-import pygame, sys, time, random
+import pygame, sys, random
 from pygame.locals import *
 from Rigidbody import *
 from World import World
 from Collisions import Collisions
+from Clock import SimulationClock
+from Snapshot import WorldSnapshot
+from Renderer import SceneRenderer
+from Hud import Hud, Button, Label
 
 # CONFIG ================================================================================
 
@@ -28,43 +32,63 @@ def tuple4toAABB(tupla4: tuple):
     endAABB = vec2(tupla4[0], tupla4[1]) + vec2(tupla4[2], tupla4[3])
     return AABB(initAABB, endAABB)
 
+# Shows the widgets the current level has, they are only drawn again when they change
+def layoutHud():
+    prevSceneButton.visible = currentLevel > 1
+    nextSceneButton.visible = currentLevel < 7
+    nextSceneButton.enabled = unlockedLevel > currentLevel
+    completedLabel.visible = unlockedLevel > currentLevel
+
+    speedUPButton.visible = speedDOWNButton.visible = speedLabel.visible = currentLevel == 2
+    speedLabel.text = "Vel: " + str(speedObject)
+
+    changeObjectButton.visible = (currentLevel == 6 and len(world.usableObjects) > 1) or (currentLevel == 7 and len(world.usableObjects) > 0)
+    changeObjectButton.enabled = len(world.usableObjects) > 1
+    changeObjectButton.text = "Circulo" if selectedCircle else ("Cuadrado" if currentLevel == 6 else "Triangulo")
+
+# GUI ===================================================================================
+
+hud = Hud(my_font)
+prevSceneButton = hud.add(Button(pygame.Rect(25, 20, 160, 40), 'Nivel Anterior', (35, 30)))
+nextSceneButton = hud.add(Button(pygame.Rect(210, 20, 160, 40), 'Siguiente Nivel', (220, 30)))
+restartSceneButton = hud.add(Button(pygame.Rect(400, 20, 90, 40), 'Restart', (410, 30)))
+completedLabel = hud.add(Label('¡Enhorabuena! Nivel Completado', (520, 30), (255, 150, 0)))
+speedUPButton = hud.add(Button(pygame.Rect(940, 15, 35, 20), "+", (950, 15), (0, 255, 255), (0, 190, 190)))
+speedDOWNButton = hud.add(Button(pygame.Rect(940, 42, 35, 20), "-", (952, 40), (0, 255, 255), (0, 190, 190)))
+speedLabel = hud.add(Label("Vel: 5", (860, 30), (0, 255, 255)))
+changeObjectButton = hud.add(Button(pygame.Rect(850, 20, 120, 40), "Circulo", (860, 30), (0, 255, 255), (0, 190, 190)))
+
 # GAME PROGRESS ===================================================================================
 
 currentLevel = 1
 unlockedLevel = 1
 selectedCircle = True
 speedObject = 5
+leftClick = False
 
 world = World()
-world.setScene_1()
+world.changeScene(1)
+levelSnapshot = WorldSnapshot.capture(world) # The level as it starts, restart goes back to it without building it again
 
 # MAIN LOOP ====================================================================================
 
-lastTime = time.time() # seconds
+clock = pygame.time.Clock()
+simulationClock = SimulationClock(1 / 60) # The world always advances in steps of the same length
+renderer = SceneRenderer(pantalla, hud) # Static bodies and the HUD are drawn once, the screen only gets what changed
 
 while True:
-    pygame.time.Clock().tick(120)
-    pygame.display.update()
-
-    # Time Management
-
-    currentTime = time.time()
-    dt = currentTime - lastTime
-    lastTime = currentTime
-
-    # Background
-
-    pantalla.fill((230, 230, 255))
+    dt = clock.tick(120) / 1000 # seconds
 
     # World Update
 
     if world.currentLevel != currentLevel:
         world.changeScene(currentLevel)
+        levelSnapshot = WorldSnapshot.capture(world)
 
     world.removeEntitiesOutOfScreen()
 
-    world.update(dt, 10)
-    world.drawEntities(pantalla)
+    # Solver iterations keep stacks stable, so fewer substeps are needed
+    simulationClock.advance(world, dt, 4)
 
     if unlockedLevel == currentLevel and world.completionEntityIndexes:
         for i in world.completionEntityIndexes:
@@ -73,111 +97,41 @@ while True:
 
     # GUI
 
-    prevSceneButton = pygame.Rect(25, 20, 160, 40)
-    nextSceneButton = pygame.Rect(210, 20, 160, 40)
-    restartSceneButton = pygame.Rect(400, 20, 90, 40)
-    pSBColor = (255, 255, 0)
-    nSBColor = (255, 255, 0)
-    rSBColor = (255, 255, 0)
-
-    mX, mY = pygame.mouse.get_pos()
-
-    if prevSceneButton.collidepoint((mX, mY)):
-        pSBColor = (255, 150, 0)
-        if leftClick and currentLevel > 1:
-            currentLevel -= 1
-            selectedCircle = True
-
-    if unlockedLevel > currentLevel and nextSceneButton.collidepoint((mX, mY)):
-        nSBColor = (255, 150, 0)
-        if leftClick and currentLevel < 8:
-            currentLevel += 1
-            selectedCircle = True
-    
-    # RESET BUTTON
-    if restartSceneButton.collidepoint((mX, mY)):
-        rSBColor = (255, 150, 0)
-        if leftClick:
-            world.changeScene(currentLevel)
-            selectedCircle = True
-            speedObject = 5
-    
-    if currentLevel > 1:
-        pygame.draw.rect(pantalla, pSBColor, prevSceneButton)
-        pantalla.blit(my_font.render('Nivel Anterior', False, (0, 0, 0)), (35, 30))
-    
-    if currentLevel < 7:
-        pygame.draw.rect(pantalla, nSBColor, nextSceneButton)
-        pantalla.blit(my_font.render('Siguiente Nivel', False, (0, 0, 0)), (220, 30))
+    layoutHud()
+    hud.update(pygame.mouse.get_pos(), pygame.mouse.get_pressed()[0])
+
+    if leftClick and prevSceneButton.hovered and currentLevel > 1:
+        currentLevel -= 1
+        selectedCircle = True
 
-    pygame.draw.rect(pantalla, rSBColor, restartSceneButton)
-    pantalla.blit(my_font.render('Restart', False, (0, 0, 0)), (410, 30))
+    if leftClick and nextSceneButton.hovered and currentLevel < 8:
+        currentLevel += 1
+        selectedCircle = True
     
-    if unlockedLevel > currentLevel:
-        pantalla.blit(my_font.render('¡Enhorabuena! Nivel Completado', False, (255, 150, 0)), (520, 30))
+    # RESET BUTTON
+    if leftClick and restartSceneButton.hovered:
+        levelSnapshot.restore(world)
+        selectedCircle = True
+        speedObject = 5
 
     # Special Level 2
-    if currentLevel == 2:
-        speedUPButton = pygame.Rect(940, 15, 35, 20)
-        speedDOWNButton = pygame.Rect(940, 42, 35, 20)
-        sUPColor = (0, 255, 255)
-        sDOWNColor = (0, 255, 255)
-
-        if speedUPButton.collidepoint((mX, mY)):
-            sUPColor = (0, 190, 190)
-            if leftClick and speedObject < 10:
-                speedObject += 1
-
-        if speedDOWNButton.collidepoint((mX, mY)):
-            sDOWNColor = (0, 190, 190)
-            if leftClick and speedObject > 0:
-                speedObject -= 1
-
-        string = "Vel: "+str(speedObject)
-
-        pygame.draw.rect(pantalla, sUPColor, speedUPButton)
-        pantalla.blit(my_font.render("+", False, (0, 0, 0)), (950, 15))
-        pygame.draw.rect(pantalla, sDOWNColor, speedDOWNButton)
-        pantalla.blit(my_font.render("-", False, (0, 0, 0)), (952, 40))
-        pantalla.blit(my_font.render(string, False, (0, 255, 255)), (860, 30))
-
-    # Special Level 6
-    if currentLevel == 6 and len(world.usableObjects) > 1:
-        changeObjectButton = pygame.Rect(850, 20, 120, 40)
-        cOBColor = (0, 255, 255)
-
-        if changeObjectButton.collidepoint((mX, mY)):
-            cOBColor = (0, 190, 190)
-            if leftClick:
-                save = world.usableObjects.pop(0)
-                world.usableObjects.append(save)
-                selectedCircle = not selectedCircle
+    if leftClick and speedUPButton.hovered and speedObject < 10:
+        speedObject += 1
 
-        string = "Circulo"
-        if not selectedCircle: string = "Cuadrado"
+    if leftClick and speedDOWNButton.hovered and speedObject > 0:
+        speedObject -= 1
 
-        pygame.draw.rect(pantalla, cOBColor, changeObjectButton)
-        pantalla.blit(my_font.render(string, False, (0, 0, 0)), (860, 30))
+    # Special Levels 6 and 7
+    if leftClick and changeObjectButton.hovered:
+        save = world.usableObjects.pop(0)
+        world.usableObjects.append(save)
+        selectedCircle = not selectedCircle
 
-    # Special Level 7
-    if currentLevel == 7 and world.usableObjects:
-        changeObjectButton = pygame.Rect(850, 20, 120, 40)
-        cOBColor = (0, 255, 255)
+    # Drawing
 
-        if changeObjectButton.collidepoint((mX, mY)) and len(world.usableObjects) > 1:
-            cOBColor = (0, 190, 190)
-            if leftClick:
-                save = world.usableObjects.pop(0)
-                world.usableObjects.append(save)
-                selectedCircle = not selectedCircle
-
-        string = "Circulo"
-        if not selectedCircle: string = "Triangulo"
-
-        pygame.draw.rect(pantalla, cOBColor, changeObjectButton)
-        pantalla.blit(my_font.render(string, False, (0, 0, 0)), (860, 30))
+    layoutHud()
+    pygame.display.update(renderer.draw(world, simulationClock.alpha))
 
-    
     # Inputs Processing
 
     leftClick = False
@@ -200,6 +154,13 @@ while True:
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
             leftClick = True
 
+        # F3 shows how long each phase of the physics takes
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+            if world.showProfiler: world.disableProfiling()
+            else:
+                world.enableProfiling()
+                world.showProfiler = True
+
         if event.type == QUIT:
             pygame.quit()
             sys.exit()
@@ -0,0 +1,107 @@
+import random
+import numpy as np
+import pytest
+from pygame.math import Vector2 as vec2
+from Rigidbody import Rigidbody, Shape, Entity
+from World import World
+from Collisions import Collisions
+from BatchCollisions import BatchCollisions
+from BodyStore import BodyStore
+
+def randomPolygon(rng: random.Random) -> Rigidbody:
+    kind = rng.randrange(3)
+    if kind == 0: shape = Shape.newBox(rng.randint(10, 30), rng.randint(10, 30))
+    elif kind == 1: shape = Shape.newTriangle(rng.randint(12, 30), rng.randint(12, 30))
+    else: shape = Shape.newPentagon(rng.randint(12, 30), rng.randint(12, 30))
+
+    body = Rigidbody(vec2(rng.uniform(0, 60), rng.uniform(0, 60)), 1, 0.2, shape, False)
+    body.rotation = rng.uniform(0, 6.28)
+    return body
+
+# Vertices padded to maxVertices with copies of the first one, like BodyStore.worldVertices
+def padded(bodies: list[Rigidbody]) -> tuple[np.ndarray, np.ndarray]:
+    vertices = np.zeros((len(bodies), BodyStore.maxVertices, 2))
+    counts = np.zeros(len(bodies), dtype=np.int8)
+    for i, body in enumerate(bodies):
+        verts = [(v.x, v.y) for v in body.getVertices()]
+        vertices[i] = verts + [verts[0]] * (BodyStore.maxVertices - len(verts))
+        counts[i] = len(verts)
+    return vertices, counts
+
+def test_polygons_match_the_loop_version():
+    rng = random.Random(3)
+    bodiesA = [randomPolygon(rng) for _ in range(300)]
+    bodiesB = [randomPolygon(rng) for _ in range(300)]
+    verticesA, countsA = padded(bodiesA)
+    verticesB, countsB = padded(bodiesB)
+    centersA = np.array([(b.position.x, b.position.y) for b in bodiesA])
+    centersB = np.array([(b.position.x, b.position.y) for b in bodiesB])
+
+    coll, normals, depths = BatchCollisions.intersectPolygons(centersA, verticesA, countsA, centersB, verticesB, countsB)
+    assert 0 < coll.sum() < len(coll)
+
+    for i, (a, b) in enumerate(zip(bodiesA, bodiesB)):
+        expected, normal, depth = Collisions.intersectTwoPolygons(a.position, a.getVertices(), b.position, b.getVertices())
+        assert coll[i] == expected
+        if expected:
+            assert depths[i] == pytest.approx(depth)
+            assert tuple(normals[i]) == pytest.approx((normal.x, normal.y))
+
+# The narrow phase passes the deduplicated axes of the store, a box only has 2 of its 4 edge normals
+def test_polygons_with_store_axes_match_the_loop_version():
+    rng = random.Random(4)
+    bodiesA = [randomPolygon(rng) for _ in range(300)]
+    bodiesB = [randomPolygon(rng) for _ in range(300)]
+    store = BodyStore()
+    store.sync(bodiesA + bodiesB)
+    ra, rb = store.rowsOf(bodiesA), store.rowsOf(bodiesB)
+
+    coll, normals, depths = BatchCollisions.intersectPolygons(store.position[ra], store.worldVertices(ra), store.vertexCount[ra],
+                                                              store.position[rb], store.worldVertices(rb), store.vertexCount[rb],
+                                                              store.worldAxes(ra), store.worldAxes(rb))
+    assert 0 < coll.sum() < len(coll)
+
+    for i, (a, b) in enumerate(zip(bodiesA, bodiesB)):
+        expected, normal, depth = Collisions.intersectTwoPolygons(a.position, a.getVertices(), b.position, b.getVertices(),
+                                                                  a.getAxes(), b.getAxes())
+        assert coll[i] == expected
+        if expected:
+            assert depths[i] == pytest.approx(depth)
+            assert tuple(normals[i]) == pytest.approx((normal.x, normal.y))
+
+def test_circles_match_the_loop_version():
+    rng = np.random.default_rng(5)
+    centersA, centersB = rng.uniform(0, 40, (300, 2)), rng.uniform(0, 40, (300, 2))
+    radiiA, radiiB = rng.uniform(2, 12, 300), rng.uniform(2, 12, 300)
+
+    coll, normals, depths, _ = BatchCollisions.collideCircles(centersA, radiiA, centersB, radiiB)
+    assert 0 < coll.sum() < len(coll)
+
+    for i in range(300):
+        expected, normal, depth = Collisions.intersectTwoCircles(vec2(*centersA[i]), radiiA[i], vec2(*centersB[i]), radiiB[i])
+        assert coll[i] == expected
+        assert depths[i] == pytest.approx(depth)
+        assert tuple(normals[i]) == pytest.approx((normal.x, normal.y))
+
+# Below minBatchPairs the narrow phase uses the loop version, both have to agree on circles at the same center
+def test_circles_at_the_same_center_match_the_loop_version():
+    center = np.array([[100.0, 100.0]])
+    radius = np.array([10.0])
+    coll, normals, depths, _ = BatchCollisions.collideCircles(center, radius, center, radius)
+
+    expected, normal, depth = Collisions.intersectTwoCircles(vec2(100, 100), 10, vec2(100, 100), 10)
+    assert coll[0] == expected
+    assert depths[0] == depth
+    assert tuple(normals[0]) == (normal.x, normal.y)
+
+@pytest.mark.parametrize("count", [2, 20])
+def test_world_separates_circles_at_the_same_center(count):
+    world = World()
+    world.initScene()
+    world.gravity = vec2(0, 0)
+    for i in range(count):
+        for _ in range(2): world.entityList.append(Entity(Rigidbody(vec2(100 + 40 * i, 200), 1, 0.5, Shape.newCircle(10), False)))
+
+    world.update(1 / 60, 4)
+    bodies = [e.body for e in world.entityList if not e.body.isStatic]
+    assert all(a.position.distance_to(b.position) > 19 for a, b in zip(bodies[::2], bodies[1::2]))
@@ -0,0 +1,31 @@
+import pytest
+from World import World
+from Broadphase import Broadphase, BruteForce, SpatialHashGrid, SweepAndPrune, DynamicAABBTree
+import Scenes
+
+@pytest.mark.parametrize("broadphase", [SpatialHashGrid, SweepAndPrune, DynamicAABBTree])
+def test_pairs_match_brute_force(broadphase):
+    for name in ("circleRain", "boxPyramid", "mixedPile"):
+        tested = broadphase()
+        # Every frame of a moving scene, persistent broadphases have to follow the bodies
+        world = World()
+        Scenes.buildScene(world, name, 80, seed=3)
+        for frame in range(40):
+            world.update(1 / 60, 2)
+            bodies = [e.body for e in world.entityList]
+            static = [b for b in bodies if b.isStatic]
+            dynamic = [b for b in bodies if not b.isStatic]
+
+            # Static and sleeping bodies moved through their setters onto other bodies
+            if frame == 3: static[0].position = dynamic[0].position
+            if frame == 10: static[1].rotation = 0.5
+            if frame == 15: dynamic[1].sleep()
+            if frame == 18: dynamic[1].position = dynamic[2].position
+            assert tested.findPairs(bodies) == BruteForce().findPairs(bodies)
+
+def test_broadphase_without_findPairs_cannot_be_created():
+    class Incomplete(Broadphase):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
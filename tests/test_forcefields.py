@@ -0,0 +1,29 @@
+import pytest
+from pygame.math import Vector2 as vec2
+from World import World
+from Rigidbody import Rigidbody, Shape, Entity
+from ForceFields import ForceField, Wind, RegionGravity
+
+def freeFall(fields: list, frames: int = 30) -> list:
+    world = World()
+    world.gravity = vec2(0, 0)
+    for x in (200, 500, 800):
+        world.entityList.append(Entity(Rigidbody(vec2(x, 250), 2, 0.5, Shape.newCircle(10), False)))
+    for field in fields: world.addForceField(field)
+    for _ in range(frames): world.update(1 / 60, 1)
+    return [e.body for e in world.entityList]
+
+def test_fields_push_every_body_at_once():
+    bodies = freeFall([Wind(vec2(100, 0))])
+    assert all(b.velocity.x > 0 and abs(b.velocity.y) < 1e-9 for b in bodies)
+
+    bodies = freeFall([RegionGravity([0, 0, 350, 500], vec2(0, 100))])
+    assert bodies[0].velocity.y > 0
+    assert bodies[1].velocity.y == 0 and bodies[2].velocity.y == 0
+
+def test_field_without_apply_cannot_be_created():
+    class Incomplete(ForceField):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
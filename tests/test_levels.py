@@ -0,0 +1,71 @@
+import json, shutil
+import numpy as np
+import pytest
+from pygame import Surface
+from World import World
+from Renderer import SceneRenderer
+from Levels import LevelLibrary, CompiledLevel, LEVELS_FILE, buildBody
+
+def assertSameLevels(levels: dict, expected: dict):
+    assert levels.keys() == expected.keys()
+    for number, level in levels.items():
+        other = expected[number]
+        assert isinstance(level, CompiledLevel)
+        for name in ("completionZone", "playableZone", "bodies", "usableObjects", "springs", "staticIndexes"):
+            assert getattr(level, name) == getattr(other, name), (number, name)
+        for name in ("vertices", "vertexCount", "axes", "axisCount", "aabbs"):
+            assert np.array_equal(getattr(level, name), getattr(other, name)), (number, name)
+
+@pytest.fixture
+def fresh():
+    with open(LEVELS_FILE) as f: return LevelLibrary.compile(json.load(f))
+
+def test_cached_library_matches_a_fresh_compile(tmp_path, fresh, monkeypatch):
+    assertSameLevels(LevelLibrary(LEVELS_FILE, tmp_path).levels, fresh)
+    assert len(list(tmp_path.glob("*.pickle"))) == 1
+
+    # The second library has to come from the cache
+    def compile(definition): raise AssertionError("compiled again")
+    monkeypatch.setattr(LevelLibrary, "compile", staticmethod(compile))
+    assertSameLevels(LevelLibrary(LEVELS_FILE, tmp_path).levels, fresh)
+
+def test_edited_file_is_compiled_again(tmp_path):
+    path = tmp_path / "levels.json"
+    shutil.copy(LEVELS_FILE, path)
+    LevelLibrary(path, tmp_path / "cache")
+
+    definition = json.loads(path.read_text())
+    definition["levels"][0]["completionZone"] = [1, 2, 3, 4]
+    path.write_text(json.dumps(definition))
+
+    number = definition["levels"][0]["level"]
+    assert LevelLibrary(path, tmp_path / "cache").level(number).completionZone == [1, 2, 3, 4]
+
+def test_broken_cache_is_compiled_again(tmp_path, fresh):
+    LevelLibrary(LEVELS_FILE, tmp_path)
+    for cacheFile in tmp_path.glob("*.pickle"): cacheFile.write_bytes(b"broken")
+    assertSameLevels(LevelLibrary(LEVELS_FILE, tmp_path).levels, fresh)
+
+def test_static_entities_match_the_built_bodies(fresh):
+    for level in fresh.values():
+        for i, entity in level.staticEntities().items():
+            body = buildBody(level.bodies[i])
+            assert entity.body.getVertices() == body.getVertices()
+            assert entity.body.getAxes() == body.getAxes()
+            box, other = entity.body.getAABB(), body.getAABB()
+            assert (box.minX, box.minY, box.maxX, box.maxY) == (other.minX, other.minY, other.maxX, other.maxY)
+
+def test_scene_switch_keeps_the_static_entities():
+    world = World()
+    world.changeScene(3)
+    statics = [e for e in world.entityList if e.body.isStatic]
+    renderer = SceneRenderer(Surface((1000, 500)))
+    renderer.draw(world)
+
+    world.changeScene(5)
+    world.changeScene(3)
+    again = [e for e in world.entityList if e.body.isStatic]
+    assert len(again) == len(statics) and all(a is b for a, b in zip(again, statics))
+
+    renderer.draw(world)
+    assert renderer.rebuilds == 1
@@ -0,0 +1,73 @@
+import io, random
+import pytest
+from pygame.math import Vector2 as vec2
+from World import World
+from Replay import ReplayRecorder, ReplayPlayer
+import Scenes
+
+FRAMES = 300
+
+def worldState(world: World):
+    poses = [(e.body.position.x, e.body.position.y, e.body.rotation) for e in world.entityList]
+    return poses, list(world.completionZone)
+
+# Records a run with drops and level changes, returns the file and the state of every frame
+@pytest.fixture(scope="module")
+def recording(tmp_path_factory):
+    path = tmp_path_factory.mktemp("replay") / "run.replay"
+    world = World()
+    Scenes.loadLevel(world, 1, dropObjects=False)
+    recorder = ReplayRecorder(world, path, keyframeInterval=50)
+
+    states = [worldState(world)]
+    for frame in range(1, FRAMES):
+        if frame == 20: world.addUsableObjectAtPos(0, vec2(500, 100))
+        if frame == 110: Scenes.loadLevel(world, 4)
+        if frame == 200: Scenes.loadLevel(world, 3, dropObjects=False)
+        if frame == 210: world.addUsableObjectAtPos(1, vec2(480, 100))
+        world.update(1 / 60, 4)
+        states.append(worldState(world))
+    recorder.close()
+    return path, states
+
+# Positions are stored as float32
+def assertFrame(player: ReplayPlayer, states: list, frame: int):
+    poses, zone = worldState(player.world)
+    expected, expectedZone = states[frame]
+    assert len(poses) == len(expected)
+    for pose, other in zip(poses, expected): assert pose == pytest.approx(other, abs=1e-2)
+    assert zone == expectedZone
+
+def test_step_matches_the_simulation(recording):
+    path, states = recording
+    player = ReplayPlayer(path)
+    assert player.frameCount == FRAMES
+
+    assertFrame(player, states, 0)
+    while player.step(): assertFrame(player, states, player.frame)
+    assert player.frame == player.lastFrame
+    player.close()
+
+def test_seek_matches_the_simulation(recording):
+    path, states = recording
+    player = ReplayPlayer(path)
+
+    rng = random.Random(1)
+    for frame in [rng.randrange(FRAMES) for _ in range(100)] + [FRAMES - 1, 0]:
+        player.seek(frame)
+        assert player.frame == frame
+        assertFrame(player, states, frame)
+    player.close()
+
+def test_truncated_replay_plays_what_was_written(recording):
+    path, states = recording
+    data = path.read_bytes()
+    player = ReplayPlayer(io.BytesIO(data[:len(data) * 2 // 3]))
+    assert 0 < player.frameCount < FRAMES
+
+    for frame in range(player.frameCount):
+        player.seek(frame)
+        assertFrame(player, states, frame)
+
+def test_not_a_replay():
+    with pytest.raises(ValueError): ReplayPlayer(io.BytesIO(b"not a replay at all"))
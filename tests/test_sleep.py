@@ -0,0 +1,55 @@
+from pygame.math import Vector2 as vec2
+from World import World
+from Rigidbody import Rigidbody, Shape, Entity
+from ForceFields import Wind
+import Scenes
+
+def test_pile_falls_asleep_and_wakes_on_drop():
+    world = World()
+    Scenes.loadLevel(world, 3, dropObjects=False)
+    for _ in range(600): world.update(1 / 60, 4)
+
+    dynamic = [e.body for e in world.entityList if not e.body.isStatic]
+    assert dynamic and all(b.isSleeping for b in dynamic)
+
+    world.addUsableObjectAtPos(0, vec2(500, 100))
+    assert not any(b.isSleeping for b in dynamic)
+
+def test_added_object_is_awake_even_if_it_was_sleeping():
+    world = World()
+    world.changeScene(3)
+    body = world.usableObjects[0].body
+    body.sleep()
+    assert body.isSleeping
+
+    pos = vec2(500, 100)
+    world.addUsableObjectAtPos(0, pos)
+    assert not body.isSleeping
+
+    for _ in range(10): world.update(1 / 60, 4)
+    assert (body.position - pos).length() > 1
+
+def sleepingBall() -> tuple[World, object]:
+    world = World()
+    world.initScene()
+    world.entityList.append(Entity(Rigidbody(vec2(500, 470), 1, 0.2, Shape.newCircle(10), False)))
+    body = world.entityList[-1].body
+    for _ in range(120): world.update(1 / 60, 4)
+    assert body.isSleeping
+    return world, body
+
+def test_force_field_wakes_a_sleeping_body():
+    world, body = sleepingBall()
+    world.addForceField(Wind(vec2(3000, 0), 1.0))
+    for _ in range(30): world.update(1 / 60, 4)
+
+    assert not body.isSleeping
+    assert body.position.x > 510
+
+def test_new_gravity_wakes_a_sleeping_body():
+    world, body = sleepingBall()
+    world.gravity = -world.gravity
+    for _ in range(30): world.update(1 / 60, 4)
+
+    assert not body.isSleeping
+    assert body.position.y < 460
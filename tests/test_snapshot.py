@@ -0,0 +1,81 @@
+from pygame.math import Vector2 as vec2
+from World import World
+from Rigidbody import Shape
+from Snapshot import WorldSnapshot
+import Scenes
+
+def worldState(world: World) -> list:
+    return [(tuple(e.body.position), e.body.rotation, tuple(e.body.velocity), e.body.angularVelocity, e.body.isSleeping)
+            for e in world.entityList]
+
+def dropPosition(world: World) -> vec2:
+    x, y, width, height = world.playableZone
+    return vec2(x + width / 2, y + height / 2)
+
+def test_restore_gives_the_same_run():
+    world = World()
+    Scenes.buildScene(world, "mixedPile", 40)
+    for _ in range(20): world.update(1 / 60, 4)
+
+    snapshot = WorldSnapshot.capture(world)
+    for _ in range(30): world.update(1 / 60, 4)
+    expected = worldState(world)
+
+    snapshot.restore(world)
+    for _ in range(30): world.update(1 / 60, 4)
+    assert worldState(world) == expected
+
+    other = World()
+    WorldSnapshot.fromBytes(snapshot.toBytes()).restore(other)
+    for _ in range(30): other.update(1 / 60, 4)
+    assert worldState(other) == expected
+
+def test_restore_keeps_springs_of_anchors():
+    world = World()
+    world.changeScene(4)
+    snapshot = WorldSnapshot.capture(world)
+
+    other = World()
+    WorldSnapshot.fromBytes(snapshot.toBytes()).restore(other)
+    assert len(other.springList) == 1
+    assert tuple(other.springList[0].bodyA.position) == (500, 150)
+
+def test_restart_after_sleeping_drops_again():
+    for level in (3, 5, 7):
+        world = World()
+        world.changeScene(level)
+        snapshot = WorldSnapshot.capture(world)
+        body = world.usableObjects[0].body
+        pos = dropPosition(world)
+
+        world.addUsableObjectAtPos(0, pos)
+        for _ in range(1200):
+            world.update(1 / 60, 4)
+            if body.isSleeping: break
+        assert body.isSleeping
+
+        snapshot.restore(world)
+        assert not body.isSleeping
+
+        world.addUsableObjectAtPos(0, pos)
+        for _ in range(30): world.update(1 / 60, 4)
+        assert (body.position - pos).length() > 1
+
+def test_restore_in_place_matches_restore_from_bytes():
+    world = World()
+    world.changeScene(4)
+    snapshot = WorldSnapshot.capture(world)
+    spring = world.springList[0]
+    ball = spring.bodyB
+    stiffness, radius = spring.stiffness, ball.shape.radius
+
+    spring.stiffness = 10
+    ball.shape = Shape.newCircle(radius * 2)
+    snapshot.restore(world)
+    assert spring.stiffness == stiffness
+    assert ball.shape.radius == radius
+
+    other = World()
+    WorldSnapshot.fromBytes(snapshot.toBytes()).restore(other)
+    assert [(s.stiffness, s.steadyLen) for s in other.springList] == [(s.stiffness, s.steadyLen) for s in world.springList]
+    assert [e.body.shape for e in other.entityList] == [e.body.shape for e in world.entityList]
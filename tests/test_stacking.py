@@ -0,0 +1,45 @@
+import pytest
+from pygame.math import Vector2 as vec2
+from World import World
+from Rigidbody import Rigidbody, Shape, Entity
+import Scenes
+
+# Pyramids of 16 px boxes at the default 4 substeps, 55 boxes are 10 rows and 105 are 14
+def pyramid(count: int, sleep: bool):
+    world = World()
+    Scenes.buildScene(world, "boxPyramid", count)
+    world.sleepSystem.enabled = sleep
+    boxes = [e.body for e in world.entityList if not e.body.isStatic]
+    return world, boxes, [b.position.copy() for b in boxes]
+
+@pytest.mark.parametrize("count", [28, 55])
+def test_pyramid_stays_at_rest(count):
+    world, boxes, start = pyramid(count, sleep=False) # Sleeping would hide a stack that slowly sinks
+    for _ in range(240): world.update(1 / 60, 4)
+
+    assert max((b.position - p).length() for b, p in zip(boxes, start)) < 1
+    assert max(abs(b.rotation) for b in boxes) < 0.15 # The top boxes rock a little on the corners below them
+
+def test_deep_pyramid_falls_asleep():
+    world, boxes, start = pyramid(105, sleep=True)
+    for _ in range(240): world.update(1 / 60, 4)
+
+    assert all(b.isSleeping for b in boxes)
+    assert max((b.position - p).length() for b, p in zip(boxes, start)) < 1
+
+# A tower of 16 px boxes on the floor, hanging from the ceiling or lying against the left wall
+@pytest.mark.parametrize("gravity, base, step", [((0, 1), (500, 472), (0, -16)), ((0, -1), (500, 83), (0, 16)),
+                                                 ((-1, 0), (28, 400), (16, 0))])
+def test_tower_stays_at_rest_whatever_the_gravity(gravity, base, step):
+    world = World()
+    world.initScene()
+    world.gravity = vec2(gravity) * 9.81 * 20
+    world.sleepSystem.enabled = False
+    for i in range(8):
+        position = vec2(base) + vec2(step) * i
+        world.entityList.append(Entity(Rigidbody(position, 1, 0.1, Shape.newBox(16, 16), False)))
+    boxes = [e.body for e in world.entityList if not e.body.isStatic]
+    start = [b.position.copy() for b in boxes]
+
+    for _ in range(240): world.update(1 / 60, 4)
+    assert max((b.position - p).length() for b, p in zip(boxes, start)) < 1